@@ -36,6 +36,7 @@ import pprint as pp
 from collections import OrderedDict
 
 from . import TimeFrame
+from .utils.dateintern import date2num
 from .utils.py3 import MAXINT, with_metaclass
 from .metabase import MetaParams, findowner
 from .strategy import Strategy
@@ -162,6 +163,10 @@ class Analyzer(with_metaclass(MetaAnalyzer, object)):
 
     csv = True
 
+    # Dotted keys (e.g.: ``max.drawdown``) of the scalar values of the
+    # analysis kept in the compact records of optimizations (``optcompact``)
+    optmetrics = None
+
     def __init__(self, *args, **kwargs):
         self.p = None  # Garante que self.p exista antes de qualquer acesso
         self._children = []
@@ -464,6 +469,7 @@ class TimeFrameAnalyzerBase(with_metaclass(MetaTimeFrameAnalyzerBase, Analyzer))
         )
 
         self.dtcmp, self.dtkey = self._get_dt_cmpkey(datetime.datetime.min)
+        self._dtnext = float("-inf")  # 1st bar must check the period
         super(TimeFrameAnalyzerBase, self)._start()
 
     def _prenext(self):
@@ -508,16 +514,63 @@ class TimeFrameAnalyzerBase(with_metaclass(MetaTimeFrameAnalyzerBase, Analyzer))
             dtcmp, dtkey = MAXINT, datetime.datetime.max
         else:
             # With >= 1.9.x the system datetime is in the strategy
+            if self.strategy.datetime[0] < self._dtnext:
+                return False  # raw datetime still below next period start
+
             dt = self.strategy.datetime.datetime()
             dtcmp, dtkey = self._get_dt_cmpkey(dt)
 
         if getattr(self, "dtcmp", None) is None or dtcmp > self.dtcmp:
             self.dtkey, self.dtkey1 = dtkey, getattr(self, "dtkey", None)
             self.dtcmp, self.dtcmp1 = dtcmp, getattr(self, "dtcmp", None)
+            if self.timeframe != TimeFrame.NoTimeFrame:
+                self._dtnext = self._get_dt_next(dtkey)
             return True
 
         return False
 
+    # Safety margin (in days, ~1ms) under the start of the next period to
+    # cope with the rounding done when converting float datetimes
+    _DTNEXT_MARGIN = 1e-8
+
+    def _get_dt_next(self, dtkey):
+        """Returns the raw (float) datetime under which a bar cannot start a
+        new period, given the key of the current one. The value is slightly
+        under the actual start of the next period and bars over it go through
+        the full ``_get_dt_cmpkey`` check
+
+        ``-inf`` is returned (always check) if the timeframe has no fixed
+        boundaries or if the strategy datetime carries a timezone
+
+        :param dtkey:
+
+        """
+        if self.strategy.datetime._tz is not None:
+            return float("-inf")
+
+        tf = self.timeframe
+        if tf in (TimeFrame.Days, TimeFrame.Weeks, TimeFrame.Months, TimeFrame.Years):
+            # the key is the last day of the period
+            nextday = dtkey + datetime.timedelta(days=1)
+            dtnext = datetime.datetime(nextday.year, nextday.month, nextday.day)
+        elif tf in (TimeFrame.Minutes, TimeFrame.Seconds, TimeFrame.MicroSeconds):
+            # the key is the last unit of the period
+            unit = datetime.timedelta(
+                minutes=tf == TimeFrame.Minutes,
+                seconds=tf == TimeFrame.Seconds,
+                microseconds=tf == TimeFrame.MicroSeconds,
+            )
+            dtnext = dtkey + unit
+            # if the compression does not divide the day, the last period of the
+            # day goes over midnight, where a new one starts
+            start = dtnext - unit * self.compression
+            midnight = datetime.datetime(start.year, start.month, start.day)
+            dtnext = min(dtnext, midnight + datetime.timedelta(days=1))
+        else:
+            return float("-inf")
+
+        return date2num(dtnext) - self._DTNEXT_MARGIN
+
     def _get_dt_cmpkey(self, dt):
         """
 
@@ -25,9 +25,11 @@ from __future__ import (
     unicode_literals,
 )
 
+import datetime
 from collections import OrderedDict
 
 from backtrader import Analyzer
+from backtrader.utils.dateintern import date2num
 from backtrader.utils.py3 import range
 
 
@@ -50,8 +52,18 @@ class AnnualReturn(Analyzer):
         self.rets = list()
         self.ret = OrderedDict()
 
+        # The date is only rebuilt from the float datetime if the bar may
+        # belong to a new year. Not possible to tell if a timezone is in use
+        dtline = self.data.datetime
+        checkall = dtline._tz is not None
+        nextyear = float("-inf")
+
         for i in range(len(self.data) - 1, -1, -1):
-            dt = self.data.datetime.date(-i)
+            if checkall or dtline[-i] >= nextyear:
+                dt = dtline.date(-i)
+                if not checkall:
+                    nextyear = date2num(datetime.datetime(dt.year + 1, 1, 1)) - 1e-8
+
             value_cur = self.strategy.stats.broker.value[-i]
 
             if dt.year > cur_year:
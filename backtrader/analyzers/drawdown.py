@@ -49,6 +49,8 @@ class DrawDown(bt.Analyzer):
 
     """
 
+    optmetrics = ("max.drawdown", "max.moneydown", "max.len")
+
     params = (("fund", None),)
 
     def start(self):
@@ -127,6 +129,8 @@ class TimeDrawDown(bt.TimeFrameAnalyzerBase):
 
     """
 
+    optmetrics = ("maxdrawdown", "maxdrawdownperiod")
+
     params = (("fund", None),)
 
     def start(self):
@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import datetime
+
+from backtrader import Analyzer, TimeFrame, TimeFrameAnalyzerBase
+from backtrader.utils.dateintern import num2date
+
+from .drawdown import DrawDown, TimeDrawDown
+from .periodstats import PeriodStats
+from .returns import Returns
+from .sharpe import SharpeRatio
+from .timereturn import TimeReturn
+from .vwr import VWR
+
+__all__ = [
+    "CurveAnalyzer",
+    "CurveTimeFrameAnalyzer",
+    "CurveDrawDown",
+    "CurveTimeDrawDown",
+    "CurveTimeReturn",
+    "CurveReturns",
+    "CurveSharpeRatio",
+    "CurveSharpeRatio_A",
+    "CurveVWR",
+    "CurvePeriodStats",
+]
+
+
+class CurveAnalyzer(Analyzer):
+    """Base class for analyzers which produce their analysis in ``stop`` from
+    the ``EquityCurve`` recorded by the strategy (datetime, cash, value and
+    fundvalue for each bar)
+
+    The per-bar entry points (``prenext``/``nextstart``/``next`` and the
+    ``notify_cashvalue``/``notify_fund`` notifications) are not delivered,
+    neither to the analyzer nor to its children. The strategy records the
+    curve once, regardless of how many of these analyzers are present
+
+    The recorded curve is available as ``self._curve`` once ``start`` has been
+    called
+    """
+
+    def _start(self):
+        """ """
+        self._curve = self.strategy._getequitycurve()
+        super(CurveAnalyzer, self)._start()
+
+    def _prenext(self):
+        """ """
+
+    def _nextstart(self):
+        """ """
+
+    def _next(self):
+        """ """
+
+    def _notify_cashvalue(self, cash, value):
+        """
+
+        :param cash:
+        :param value:
+
+        """
+
+    def _notify_fund(self, cash, value, fundvalue, shares):
+        """
+
+        :param cash:
+        :param value:
+        :param fundvalue:
+        :param shares:
+
+        """
+
+
+class CurveTimeFrameAnalyzer(CurveAnalyzer, TimeFrameAnalyzerBase):
+    """Base class for ``CurveAnalyzer`` subclasses working on timeframe
+    periods, which are found after the run by scanning the recorded datetimes
+    """
+
+    def _curve_periods(self):
+        """Returns a list of ``(idx, dtkey)`` tuples, with the index of the bar
+        in the curve at which a new period starts (i.e.: where ``_dt_over``
+        would have returned ``True`` during the run) and the key of the period
+
+
+        """
+        periods = list()
+        if self.timeframe == TimeFrame.NoTimeFrame:
+            if len(self._curve):
+                periods.append((0, datetime.datetime.max))  # single period
+
+            return periods
+
+        tz = self.strategy.datetime._tz
+        getcmpkey = self._get_dt_cmpkey
+        dtcmp = self.dtcmp
+        dtnext = self._dtnext
+        lastdt = None
+        for i, dt in enumerate(self._curve.datetime):
+            if dt < dtnext or dt == lastdt:
+                continue  # cannot start a period
+
+            lastdt = dt
+            cmp_, dtkey = getcmpkey(num2date(dt, tz=tz))
+            if dtcmp is None or cmp_ > dtcmp:
+                dtcmp = cmp_
+                dtnext = self._get_dt_next(dtkey)
+                periods.append((i, dtkey))
+
+        return periods
+
+
+class CurveDrawDown(CurveAnalyzer, DrawDown):
+    """``DrawDown`` calculated after the run from the recorded equity curve.
+
+    The analysis is identical to the one of ``DrawDown``, but the values are
+    only available once the run is over
+
+    Params and output: see ``DrawDown``
+    """
+
+    def stop(self):
+        """ """
+        r = self.rets
+        maxvalue = self._maxvalue
+        moneydown, drawdown, ddlen = r.moneydown, r.drawdown, r.len
+        maxmoneydown, maxdrawdown, maxlen = r.max.moneydown, r.max.drawdown, r.max.len
+
+        for value in self._curve.values(self._fundmode):
+            if value > maxvalue:
+                maxvalue = value  # update peak value
+
+            moneydown = round(maxvalue - value, 2)
+            drawdown = round(100.0 * moneydown / maxvalue, 2)
+
+            if moneydown > maxmoneydown:
+                maxmoneydown = moneydown
+            if drawdown > maxdrawdown:
+                maxdrawdown = drawdown
+
+            ddlen = ddlen + 1 if drawdown else 0
+            if ddlen > maxlen:
+                maxlen = ddlen
+
+        self._maxvalue = maxvalue
+        r.moneydown, r.drawdown, r.len = moneydown, drawdown, ddlen
+        r.max.moneydown, r.max.drawdown, r.max.len = maxmoneydown, maxdrawdown, maxlen
+
+        super(CurveDrawDown, self).stop()
+
+
+class CurveTimeDrawDown(CurveTimeFrameAnalyzer, TimeDrawDown):
+    """``TimeDrawDown`` calculated after the run from the recorded equity
+    curve
+
+    Params and output: see ``TimeDrawDown``
+    """
+
+    def stop(self):
+        """ """
+        values = self._curve.values(self._fundmode)
+        peak, ddlen = self.peak, self.ddlen
+        dd, maxdd, maxddlen = self.dd, self.maxdd, self.maxddlen
+
+        for i, _ in self._curve_periods():
+            value = values[i]
+            # update the maximum seen peak
+            if value > peak:
+                peak = value
+                ddlen = 0  # start of streak
+
+            dd = 100.0 * (peak - value) / peak
+            ddlen += bool(dd)  # if peak == value -> dd = 0
+
+            maxdd = max(maxdd, dd)
+            maxddlen = max(maxddlen, ddlen)
+
+        self.peak, self.ddlen = peak, ddlen
+        self.dd, self.maxdd, self.maxddlen = dd, maxdd, maxddlen
+
+        super(CurveTimeDrawDown, self).stop()
+
+
+class CurveTimeReturn(CurveTimeFrameAnalyzer, TimeReturn):
+    """``TimeReturn`` calculated after the run from the recorded equity curve
+
+    Only the returns of the portfolio (or of the fund) can be calculated.
+    Setting the ``data`` param raises ``ValueError``
+
+    Params and output: see ``TimeReturn``
+    """
+
+    def start(self):
+        """ """
+        if self.p.data is not None:
+            raise ValueError("CurveTimeReturn cannot track the values of a data")
+
+        super(CurveTimeReturn, self).start()
+
+    def stop(self):
+        """ """
+        values = self._curve.values(self._fundmode)
+        periods = self._curve_periods()
+        ends = [i for i, _ in periods[1:]] + [len(values)]
+
+        value_start = self._lastvalue  # initial value of the portfolio
+        for (i, dtkey), iend in zip(periods, ends):
+            if i:
+                value_start = values[i - 1]  # last value of previous period
+
+            self.rets[dtkey] = round(values[iend - 1] / value_start - 1.0, 6)
+
+        if periods:
+            self._value_start = value_start
+            self._lastvalue = self._value = values[-1]
+
+        super(CurveTimeReturn, self).stop()
+
+
+class CurveReturns(CurveTimeFrameAnalyzer, Returns):
+    """``Returns`` calculated after the run from the recorded equity curve
+
+    Params and output: see ``Returns``
+    """
+
+    def stop(self):
+        """ """
+        self._tcount = len(self._curve_periods())
+        super(CurveReturns, self).stop()
+
+
+class CurveSharpeRatio(CurveAnalyzer, SharpeRatio):
+    """``SharpeRatio`` calculated after the run from the returns of a
+    ``CurveTimeReturn`` child
+
+    The ``legacyannual`` param is not supported and raises ``ValueError``
+
+    Params and output: see ``SharpeRatio``
+    """
+
+    def __init__(self):
+        """ """
+        if self.p.legacyannual:
+            raise ValueError("CurveSharpeRatio does not support legacyannual")
+
+        self.timereturn = CurveTimeReturn(
+            timeframe=self.p.timeframe,
+            compression=self.p.compression,
+            fund=self.p.fund,
+        )
+
+
+class CurveSharpeRatio_A(CurveSharpeRatio):
+    """Extension of ``CurveSharpeRatio`` which returns the Sharpe Ratio
+    directly in annualized form
+
+    The following param has been changed from ``CurveSharpeRatio``
+
+      - ``annualize`` (default: ``True``)
+    """
+
+    params = (("annualize", True),)
+
+
+class CurveVWR(CurveTimeFrameAnalyzer, VWR):
+    """``VWR`` calculated after the run from the recorded equity curve
+
+    Params and output: see ``VWR``
+    """
+
+    def __init__(self):
+        """ """
+        self._returns = CurveReturns(
+            timeframe=self.p.timeframe,
+            compression=self.p.compression,
+            tann=self.p.tann,
+        )
+
+    def stop(self):
+        """ """
+        values = self._curve.values(self._fundmode)
+        pis, pns = self._pis, self._pns
+
+        # The value of the bar which starts a period closes the previous one
+        # and is the initial value of the new one
+        lasti = -1
+        for lasti, _ in self._curve_periods():
+            pns[-1] = values[lasti]
+            pis.append(values[lasti])
+            pns.append(None)
+
+        if lasti < len(values) - 1:
+            pns[-1] = values[-1]  # bars seen after the start of last period
+
+        super(CurveVWR, self).stop()
+
+
+class CurvePeriodStats(CurveAnalyzer, PeriodStats):
+    """``PeriodStats`` calculated after the run from the returns of a
+    ``CurveTimeReturn`` child
+
+    Params and output: see ``PeriodStats``
+    """
+
+    def __init__(self):
+        """ """
+        self._tr = CurveTimeReturn(
+            timeframe=self.p.timeframe,
+            compression=self.p.compression,
+            fund=self.p.fund,
+        )
@@ -51,6 +51,8 @@ class Returns(TimeFrameAnalyzerBase):
 
     """
 
+    optmetrics = ("rtot", "ravg", "rnorm", "rnorm100")
+
     params = (
         ("tann", None),
         ("fund", None),
@@ -44,6 +44,8 @@ class SharpeRatio(Analyzer):
 
     """
 
+    optmetrics = ("sharperatio",)
+
     params = (
         ("timeframe", TimeFrame.Years),
         ("compression", 1),
@@ -61,6 +61,8 @@ class SQN(Analyzer):
 
     alias = ("SystemQualityNumber",)
 
+    optmetrics = ("sqn", "trades")
+
     def create_analysis(self):
         """Replace default implementation to instantiate an AutoOrdereDict
         rather than an OrderedDict
@@ -68,6 +68,8 @@ class TradeAnalyzer(Analyzer):
 
     """
 
+    optmetrics = ("total.total", "won.total", "lost.total", "pnl.net.total")
+
     def create_analysis(self):
         """ """
         self.rets = AutoOrderedDict(
@@ -54,6 +54,8 @@ class VWR(TimeFrameAnalyzerBase):
 
     """
 
+    optmetrics = ("vwr",)
+
     params = (
         ("timeframe", bt.TimeFrame.Days),  # Default to Days
         ("compression", None),
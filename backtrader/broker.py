@@ -59,11 +59,14 @@ class BrokerBase(with_metaclass(MetaBroker, object)):
 
     params = (("commission", CommInfoBase()),)
 
+    _wakeup = None
+
     def __init__(self):
         """ """
         if not hasattr(self, "p"):
             self.p = type("Params", (), dict(self.params))()
         self.comminfo = dict()
+        self._dcomminfo = dict()  # data -> comminfo resolution cache
         self.init()
 
     def init(self):
@@ -72,6 +75,8 @@ class BrokerBase(with_metaclass(MetaBroker, object)):
         if None not in self.comminfo:
             self.comminfo = dict({None: self.p.commission})
 
+        self._dcomminfo = dict()
+
     def start(self):
         """ """
         self.init()
@@ -79,6 +84,16 @@ class BrokerBase(with_metaclass(MetaBroker, object)):
     def stop(self):
         """ """
 
+    def setwakeup(self, wakeup):
+        """Installs (or removes with ``None``) the callable which wakes up
+        ``Cerebro.run_async`` when an order notification arrives from the
+        broker side. It can be called from any thread
+
+        :param wakeup:
+
+        """
+        self._wakeup = wakeup
+
     def add_order_history(self, orders, notify=False):
         """Add order history. See cerebro for details
 
@@ -100,13 +115,23 @@ class BrokerBase(with_metaclass(MetaBroker, object)):
         """Retrieves the ``CommissionInfo`` scheme associated with the given
         ``data``
 
+        The resolution is cached per ``data`` and invalidated when a scheme is
+        added with ``setcommission`` or ``addcommissioninfo``
+
         :param data:
 
         """
-        if data._name in self.comminfo:
-            return self.comminfo[data._name]
+        try:
+            return self._dcomminfo[data]
+        except KeyError:
+            pass
+
+        comminfo = self.comminfo.get(data._name)
+        if comminfo is None:
+            comminfo = self.comminfo[None]
 
-        return self.comminfo[None]
+        self._dcomminfo[data] = comminfo
+        return comminfo
 
     def setcommission(
         self,
@@ -155,6 +180,7 @@ class BrokerBase(with_metaclass(MetaBroker, object)):
         comm.leverage = leverage
         comm.automargin = automargin
         self.comminfo[name] = comm
+        self._dcomminfo.clear()
 
     def addcommissioninfo(self, comminfo, name=None):
         """Adds a ``CommissionInfo`` object that will be the default for all assets if
@@ -165,6 +191,7 @@ class BrokerBase(with_metaclass(MetaBroker, object)):
 
         """
         self.comminfo[name] = comminfo
+        self._dcomminfo.clear()
 
     def getcash(self):
         """ """
@@ -127,6 +127,10 @@ class BackBroker(bt.BrokerBase):
 
         self.orders = list()  # will only be appending
         self.pending = collections.deque()  # popleft and append(right)
+        # ref -> order for the orders which are actually pending. Removing
+        # an order (cancellation) only deletes it here and the stale entry
+        # in the deque is discarded when "next" reaches it
+        self._pendingrefs = dict()
         self._toactivate = collections.deque()  # to activate in next cycle
 
         self.positions = collections.defaultdict(Position)
@@ -331,10 +335,8 @@ class BackBroker(bt.BrokerBase):
         :param bracket:  (Default value = False)
 
         """
-        try:
-            self.pending.remove(order)
-        except ValueError:
-            # If the list didn't have the element we didn't cancel anything
+        if self._pendingrefs.pop(order.ref, None) is None:
+            # If the order was not pending we didn't cancel anything
             return False
 
         order.cancel()
@@ -462,9 +464,9 @@ class BackBroker(bt.BrokerBase):
 
         """
         if safe:
-            os = [x.clone() for x in self.pending]
+            os = [x.clone() for x in self._pendingrefs.values()]
         else:
-            os = [x for x in self.pending]
+            os = list(self._pendingrefs.values())
 
         return os
 
@@ -547,6 +549,12 @@ class BackBroker(bt.BrokerBase):
 
     def check_submitted(self):
         """ """
+        if not self.submitted:
+            return
+
+        if self._check_submitted_batch():
+            return  # all orders accepted in one go
+
         cash = self.cash
         positions = dict()
 
@@ -574,6 +582,70 @@ class BackBroker(bt.BrokerBase):
             self._ococheck(order)
             self._bracketize(order, cancel=True)
 
+    def _check_submitted_batch(self):
+        """Tries to accept all submitted orders at once.
+
+        The cash impact of a pseudo-execution is independent of the cash
+        level, so the running cash checked for each order can never be lower
+        than the current cash minus the sum of the worst-case outflows of all
+        orders. For orders without parent, with a plain commission scheme
+        (default calculations, no leverage) and no compensation data the
+        worst-case outflow is the full operation cost plus the commission of
+        the whole size. If the cash covers the aggregate, the sequential
+        pseudo-execution would accept every order and it can be skipped.
+
+        Returns ``True`` if the orders were accepted, ``False`` (leaving the
+        queue untouched) if the regular check has to run
+
+        """
+        coo = self.p.coo
+        groups = dict()
+        for order in self.submitted:
+            data = order.data
+            if order.parent is not None or data._compensate is not None:
+                return False
+
+            comminfo = self.getcommissioninfo(data)
+            if (
+                not comminfo._stdcomm
+                or not comminfo._stdmargin
+                or not comminfo._stdopcost
+                or not comminfo._stdsize
+                or not comminfo._stdvaluesize
+                or not comminfo._stdcashadjust
+                or comminfo.get_leverage() != 1.0
+            ):
+                return False  # the sequential check prices with the overrides
+
+            if coo and order.exectype == Order.Market:
+                price = data.open[0]
+            else:
+                price = order.created.price
+
+            sizes, prices = groups.setdefault(comminfo, (list(), list()))
+            sizes.append(order.executed.remsize)
+            prices.append(price)
+
+        outflow = 0.0
+        for comminfo, (sizes, prices) in groups.items():
+            outflow += sum(comminfo.getoperationcosts(sizes, prices))
+            outflow += sum(comminfo.getcommissions(sizes, prices))
+
+        if self.cash - outflow < 0.0:
+            return False
+
+        orders = list(self.submitted)
+        self.submitted.clear()
+        for order in orders:
+            order.pannotated = None
+            order.submit()
+            order.accept()
+
+        self.pending.extend(orders)
+        self._pendingrefs.update((order.ref, order) for order in orders)
+        self.notifs.extend(order.clone() for order in orders)
+        return True
+
     def submit_accept(self, order):
         """
 
@@ -584,6 +656,7 @@ class BackBroker(bt.BrokerBase):
         order.submit()
         order.accept()
         self.pending.append(order)
+        self._pendingrefs[order.ref] = order
         self.notify(order)
 
     def _bracketize(self, order, cancel=False):
@@ -620,10 +693,10 @@ class BackBroker(bt.BrokerBase):
         ocoref = self._ocos.get(parentref, None)
         ocol = self._ocol.pop(ocoref, None)
         if ocol:
-            for i in range(len(self.pending) - 1, -1, -1):
-                o = self.pending[i]
-                if o is not None and o.ref in ocol:
-                    del self.pending[i]
+            # only the members of the group are looked up (latest first)
+            for oref in reversed(ocol):
+                o = self._pendingrefs.pop(oref, None)
+                if o is not None:
                     o.cancel()
                     self.notify(o)
 
@@ -1390,6 +1463,9 @@ class BackBroker(bt.BrokerBase):
         for data, pos in self.positions.items():
             if pos:
                 comminfo = self.getcommissioninfo(data)
+                if comminfo._stdcredit and not comminfo._creditrate:
+                    continue  # nothing can be charged, skip dt conversion
+
                 dt0 = data.datetime.datetime()
                 dcredit = comminfo.get_credit_interest(data, pos, dt0)
                 self.d_credit[data] += dcredit
@@ -1401,12 +1477,16 @@ class BackBroker(bt.BrokerBase):
         self._process_order_history()
 
         # Iterate once over all elements of the pending queue
+        pendingrefs = self._pendingrefs
         self.pending.append(None)
         while True:
             order = self.pending.popleft()
             if order is None:
                 break
 
+            if pendingrefs.pop(order.ref, None) is None:
+                continue  # removed (ex: cancelled) while waiting in the queue
+
             if order.expire():
                 self.notify(order)
                 self._ococheck(order)
@@ -1414,11 +1494,13 @@ class BackBroker(bt.BrokerBase):
 
             elif not order.active():
                 self.pending.append(order)  # cannot yet be processed
+                pendingrefs[order.ref] = order
 
             else:
                 self._try_exec(order)
                 if order.alive():
                     self.pending.append(order)
+                    pendingrefs[order.ref] = order
 
                 elif order.status == Order.Completed:
                     # a bracket parent order may have been executed
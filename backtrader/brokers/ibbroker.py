@@ -33,6 +33,7 @@ from backtrader import BrokerBase, Order, date2num
 from backtrader.orders.iborder import IBOrder
 from backtrader.position import Position
 from backtrader.stores import ibstore_insync
+from backtrader.utils.latency import latency
 from backtrader.utils.py3 import (
     integer_types,
     string_types,
@@ -559,6 +560,8 @@ class IBBroker(with_metaclass(MetaSingletonIBBroker, BrokerBase)):
         :param check:  (Default value = True)
 
         """
+        if latency.enabled:
+            latency.stamp("submit")
         pref = self._take_children(order)
         if pref is None:  # order has not been taken
             return order
@@ -928,6 +931,8 @@ class IBBroker(with_metaclass(MetaSingletonIBBroker, BrokerBase)):
 
         """
         self.notifs.append(order.clone())
+        if self._wakeup is not None:
+            self._wakeup()
 
     def _try_exec_historical(self, order):
         """
@@ -568,6 +568,8 @@ class OandaBroker(with_metaclass(MetaOandaBroker, BrokerBase)):
 
         """
         self.notifs.append(order.clone())
+        if self._wakeup is not None:
+            self._wakeup()
 
     def get_notification(self):
         """ """
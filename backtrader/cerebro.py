@@ -57,16 +57,22 @@ from .utils.py3 import (
     zip,
 )
 from .writer import WriterFile
+from .journal import Journal
+from .warmstart import WarmStart
 from .feeds.chainer import Chainer
 from .feeds.rollover import RollOver
 from .utils.iter import iterize
 from .utils.optreturn import OptReturn
+from .utils.optcheckpoint import OptCheckpoint
+from .utils.optprogress import OptProgress
+from .utils.optsink import OptSink
 from .utils.params import make_params
 from .utils.calendar import addcalendar, addtz
 from .utils.timer import create_timer, schedule_timer, notify_timer
 from .engine.runner import (
     startrun,
     finishrun,
+    optcolumns,
     runstrategies,
     prerunstrategies,
     runstrategieskenel,
@@ -93,6 +99,11 @@ class Cerebro(with_metaclass(MetaParams, object)):
         ("exactbars", False),
         ("optdatas", True),
         ("optreturn", True),
+        ("optcompact", False),
+        ("optchunksize", 1),
+        ("optunordered", False),
+        ("optmaxtasks", None),
+        ("optfork", False),
         ("objcache", False),
         ("live", False),
         ("writer", False),
@@ -148,6 +159,14 @@ class Cerebro(with_metaclass(MetaParams, object)):
         self._pretimers = list()
         self._ohistory = list()
         self._fhistory = None
+        self._journal = None
+        self._warmstart = None
+        self._optsink = None
+        self._optcheckpoint = None
+        self._optcoordinator = None
+        self._optcost = None
+        self._opttotal = None
+        self._wakeup = None  # set by run_async
         self._optcount = 1
         self.runningstrats = list()
 
@@ -328,6 +347,42 @@ class Cerebro(with_metaclass(MetaParams, object)):
         """
         self.writers.append((wrtcls, args, kwargs))
 
+    def addjournal(self, filename, **kwargs):
+        """Records every order notification delivered by the broker (state
+        changes and execution bits) to the append-only binary journal
+        ``filename``. The records are written by a background thread and can
+        be read back with ``backtrader.journal.readjournal``
+
+        Any other kwargs are passed to ``Journal``.
+
+        **Note**: the journal is not active during optimization runs
+
+        :param filename:
+        :param **kwargs:
+
+        """
+        self._journal = Journal(filename=filename, **kwargs)
+        return self._journal
+
+    def addwarmstart(self, filename, **kwargs):
+        """Saves the lines of the datas and of the strategies (indicators
+        included) to ``filename`` when the run stops and restores them when a
+        later run starts with the same datas and strategies, which then only
+        have to receive the bars after the snapshot instead of the history
+        needed to warm up the indicators
+
+        Any other kwargs are passed to ``WarmStart``.
+
+        **Note**: only restored if the datas are not preloaded (ex: live
+        datas) and not active during optimization runs
+
+        :param filename:
+        :param **kwargs:
+
+        """
+        self._warmstart = WarmStart(filename=filename, **kwargs)
+        return self._warmstart
+
     def addlistener(self, lstcls, *args, **kwargs):
         """
 
@@ -377,6 +432,10 @@ class Cerebro(with_metaclass(MetaParams, object)):
         """Adds an ``Analyzer`` class to the mix. Instantiation will be done at
         ``run`` time
 
+        ``_name`` can be passed to name the analyzer and ``_optmetrics`` (an
+        iterable of dotted keys like ``max.drawdown``) to replace the
+        ``optmetrics`` declared by the class for compact optimization results
+
         :param ancls:
         :param *args:
         :param **kwargs:
@@ -650,6 +709,257 @@ class Cerebro(with_metaclass(MetaParams, object)):
         """
         self.optcbs.append(cb)
 
+    def optprogress(self, cb=None, every=1):
+        """Adds an optimization callback reporting the progress every
+        ``every`` finished combinations with ``cb(done, total, elapsed, eta)``
+        (times in seconds). ``total`` and ``eta`` are ``None`` when the number
+        of combinations is not known in advance (it is known when ``optcost``,
+        ``optunordered``, ``optchunksize=0`` or a checkpoint are used). Without
+        ``cb`` a progress line is written to ``sys.stderr``
+
+        Returns the created ``OptProgress``
+
+        :param cb:  (Default value = None)
+        :param every:  (Default value = 1)
+
+        """
+        progress = OptProgress(self, cb=cb, every=every)
+        self.optcbs.append(progress)
+        return progress
+
+    def optcost(self, cost):
+        """Sets a cost hint for the combinations of an optimization run in a
+        process pool: ``cost(params)`` receives a dict with the params of a
+        combination and returns its expected cost (any comparable value). The
+        most expensive combinations are started first, so that a slow one does
+        not start last and keep the other processes waiting
+
+        The hint is only used in the main process (it need not be picklable)
+
+        :param cost:
+
+        """
+        self._optcost = cost
+
+    def addoptsink(self, filename=None, maxrows=10000):
+        """Collects the results of an optimization in an ``OptSink``: a
+        columnar table which is written to a SQLite file once more than
+        ``maxrows`` rows are held in memory. Compact records (``optcompact``)
+        are used and ``run`` returns the sink instead of a list of results
+
+        Returns the created ``OptSink``, which can be queried with
+        ``todataframe``, ``top`` or ``query``
+
+        :param filename: SQLite file to use (default: a temporary file)
+        :param maxrows: rows kept in memory before writing them to disk
+
+        """
+        self._optsink = OptSink(filename=filename, maxrows=maxrows)
+        self.p.optcompact = True
+        return self._optsink
+
+    def addoptcheckpoint(self, filename):
+        """Records the result of each combination run during an optimization
+        in the SQLite file ``filename``, keyed by a hash of the strategy
+        class (including its source code), the identity of the datas, the
+        params of the combination and the recorded metrics
+
+        Running the same optimization again with the same file only runs the
+        combinations not yet recorded. Recorded results are delivered first.
+        Compact records (``optcompact``) are used
+
+        Returns the created ``OptCheckpoint``
+
+        :param filename: SQLite file (created if it does not exist)
+
+        """
+        self._optcheckpoint = OptCheckpoint(filename)
+        self.p.optcompact = True
+        return self._optcheckpoint
+
+    def addoptcoordinator(self, address, authkey=None, chunksize=8, timeout=None):
+        """Runs the combinations of ``optstrategy`` on remote workers instead
+        of a local process pool. The coordinator listens on ``address`` (a
+        ``(host, port)`` tuple for TCP or a path for a Unix socket) and hands
+        chunks of ``chunksize`` combinations to the workers connected with
+        ``optworker``, which run them with their own (locally cached) data
+        feeds and send back the results
+
+        If a worker is lost (the connection drops or no answer arrives within
+        ``timeout`` seconds) its chunk is handed to another worker. Results
+        arrive in completion order. Compact records (``optcompact``) are used
+
+        Returns the created ``OptCoordinator``. Its ``address`` attribute holds
+        the actual address (with the chosen port if ``0`` was given) and
+        ``close`` stops listening
+
+        The messages are pickled: anyone able to connect could run code on
+        the coordinator and the workers. With a TCP address and no ``authkey``
+        a random key is generated, which is in the ``authkey`` attribute of
+        the coordinator and has to be given to the workers
+
+        :param address:
+        :param authkey: shared key (bytes) to authenticate the workers
+        :param chunksize:  (Default value = 8)
+        :param timeout:  (Default value = None)
+
+        """
+        from .engine.distributed import OptCoordinator
+
+        self._optcoordinator = OptCoordinator(
+            address, authkey=authkey, chunksize=chunksize, timeout=timeout
+        )
+        self.p.optcompact = True
+        return self._optcoordinator
+
+    def optworker(self, address, authkey=None, wait=10.0):
+        """Works for the optimization coordinator listening on ``address``
+        (see ``addoptcoordinator``) until it has no more combinations to run
+
+        The cerebro must hold the same data feeds, analyzers and broker
+        settings as the coordinator. Strategies need not be added: they are
+        received with each combination (the classes must be importable). The
+        data feeds are loaded once and reused for all combinations
+
+        Returns the number of combinations run
+
+        :param address:
+        :param authkey: key of the coordinator, required for TCP addresses
+          (Default value = None)
+        :param wait: seconds to keep trying to connect (Default value = 10.0)
+
+        """
+        from .engine.distributed import optworker
+
+        return optworker(self, address, authkey=authkey, wait=wait)
+
+    def optcolumns(self, strategy):
+        """Returns the names of the values held in the compact records
+        returned when optimizing with ``optcompact=True``: the names of the
+        params of ``strategy`` followed by ``analyzername.metric`` for the
+        ``optmetrics`` of each analyzer
+
+        :param strategy: the strategy class passed to ``optstrategy``
+
+        """
+        return optcolumns(self, strategy)
+
+    def optimize(self, strategy, space, method="random", metric=None, **kwargs):
+        """Searches the params of ``strategy`` running only a subset of the
+        combinations, as opposed to the exhaustive search of ``optstrategy``.
+        Returns a list of ``Trial(params, score, pruned, budget)`` sorted from
+        best to worst
+
+        ``space`` is a dict with the candidate values of each param, like the
+        kwargs of ``optstrategy``: ``dict(period=range(10, 50), mult=[1, 2])``
+
+        ``method`` can be:
+
+          - ``random``: ``ntrials`` combinations chosen at random
+
+          - ``halving``: successive halving. ``ntrials`` random combinations
+            run on a fraction of the data and only the best ``1/eta`` go on to
+            the next round, which uses ``eta`` times more data. Only the last
+            round uses all the data. Needs ``preload`` to know the data length
+
+          - ``tpe``: after ``nstartup`` random combinations, new ones are
+            sampled favoring the values seen in the best ``gamma`` part of the
+            results (Tree-structured Parzen Estimator for discrete values),
+            until ``ntrials`` combinations have been run
+
+        ``metric`` is the score to compare runs: either a string with the name
+        of an analyzer and the dotted key of the value (``"sharperatio.sharperatio"``)
+        or a callable receiving the strategy. ``maximize`` (default: ``True``)
+        tells the direction
+
+        ``prune`` is an optional callable receiving the strategy every
+        ``pruneevery`` bars. If it returns ``True`` the run is aborted and the
+        worker moves on to the next combination (score ``None``). Example:
+        ``lambda s: s.broker.getvalue() < 0.8 * s.broker.startingcash``. It
+        has to be picklable (a module level function) if ``maxcpus != 1``
+
+        Other kwargs: ``ntrials`` (50), ``seed`` (None), ``eta`` (3),
+        ``nstartup`` (10), ``ncandidates`` (24), ``gamma`` (0.25)
+
+        Callbacks added with ``optcallback`` receive each ``Trial``
+
+        :param strategy:
+        :param space:
+        :param method:  (Default value = "random")
+        :param metric:  (Default value = None)
+        :param **kwargs:
+
+        """
+        from .engine.optimizer import optimize
+
+        return optimize(self, strategy, space, method=method, metric=metric, **kwargs)
+
+    def walkforward(
+        self,
+        strategy,
+        space,
+        train,
+        test,
+        step=None,
+        metric=None,
+        maximize=True,
+        warmup=0,
+        anchored=False,
+    ):
+        """Walk-forward analysis of ``strategy``: the data is split in windows
+        of ``train`` bars (in-sample) followed by ``test`` bars (out-of-sample).
+        In each window all the combinations of ``space`` (a dict like the
+        kwargs of ``optstrategy``) are run on the in-sample bars and the best
+        one according to ``metric`` (see ``optimize``) is then run on the
+        out-of-sample bars
+
+        Windows move forward ``step`` bars (default: ``test``). With
+        ``anchored=True`` all in-sample periods start at the first bar. Sizes
+        are counted in bars of the first data feed and the other data feeds
+        are sliced to the same datetime range
+
+        ``warmup`` bars before each out-of-sample period are delivered to the
+        strategy to prime its indicators. The out-of-sample returns are only
+        measured from the first test bar
+
+        The data feeds are loaded once, in the main process, and shared with
+        the worker processes (``maxcpus``). Each window is built by slicing the
+        loaded arrays. The in-sample combinations of all windows run
+        concurrently and the out-of-sample run of a window starts as soon as
+        its last combination is done
+
+        Returns a ``WalkForward(windows, datetime, value)`` where ``windows``
+        holds a ``WFWindow(train, test, params, score, datetime, value)`` per
+        window and ``datetime``/``value`` are the out-of-sample equity curves
+        of the windows chained one after the other, starting from the broker
+        starting cash
+
+        :param strategy:
+        :param space:
+        :param train:
+        :param test:
+        :param step:  (Default value = None)
+        :param metric:  (Default value = None)
+        :param maximize:  (Default value = True)
+        :param warmup:  (Default value = 0)
+        :param anchored:  (Default value = False)
+
+        """
+        from .engine.walkforward import walkforward
+
+        return walkforward(
+            self,
+            strategy,
+            space,
+            train,
+            test,
+            step=step,
+            metric=metric,
+            maximize=maximize,
+            warmup=warmup,
+            anchored=anchored,
+        )
+
     def optstrategy(self, strategy, *args, **kwargs):
         """Adds a ``Strategy`` class to the mix for optimization. Instantiation
         will happen during ``run`` time.
@@ -871,12 +1181,44 @@ class Cerebro(with_metaclass(MetaParams, object)):
         if "runstrats" in rv:
             del rv["runstrats"]
             del rv["optcbs"]
+        rv["_journal"] = None  # holds a thread and an open file
+        rv["_warmstart"] = None  # holds the running strategies
+        rv["_optsink"] = None  # results are only collected in the parent
+        rv["_optcheckpoint"] = None
+        rv["_optcoordinator"] = None  # holds a listening socket and threads
+        rv["_optcost"] = None  # only used to order the combinations
+        rv["_wakeup"] = None  # bound to a running event loop
         return rv
 
+    async def run_async(self, **kwargs):
+        """Coroutine version of ``run`` for live trading inside an asyncio
+        event loop: ``results = await cerebro.run_async()``
+
+        Instead of having each live feed wait up to ``qcheck`` seconds for
+        data, the engine awaits the next event signaled by any data feed,
+        store or broker. Feeds, stores and brokers get a wakeup callable with
+        ``setwakeup`` and call it as soon as data or a notification arrives,
+        from the event loop (e.g. callbacks of an ``asyncio.Protocol``) or
+        from any other thread. Live feeds which do not signal
+        (``_asyncwakeup`` is ``False``) are polled every ``qcheck`` seconds
+
+        Data is always delivered bar by bar (``preload`` and ``runonce`` are
+        off) and optimization is not supported. ``runstop`` wakes up the
+        engine. The kwargs are those of ``run``
+
+        :param **kwargs:
+
+        """
+        from .engine.asyncrun import run_async
+
+        return await run_async(self, **kwargs)
+
     def runstop(self):
         """If invoked from inside a strategy or anywhere else, including other
         threads the execution will stop as soon as possible."""
         self._event_stop = True  # signal a stop has been requested
+        if self._wakeup is not None:
+            self._wakeup()  # run_async may be awaiting an event
 
     def prerun(self, **kwargs):
         self._event_stop = False  # Stop is requested
@@ -1004,6 +1346,9 @@ class Cerebro(with_metaclass(MetaParams, object)):
             if order is None:
                 break
 
+            if self._journal is not None:
+                self._journal.put(order)
+
             owner = order.owner
             if owner is None:
                 owner = self.runningstrats[0]  # default
@@ -113,6 +113,10 @@ class CommInfoBase(with_metaclass(MetaParams)):
 
     COMM_PERC, COMM_FIXED = range(2)
 
+    # Set during __init__, if the default calculations are in place
+    _stdcomm = _stdmargin = _stdcredit = False
+    _stdsize = _stdopcost = _stdvaluesize = _stdpnl = _stdcashadjust = False
+
     params = (
         ("commission", 0.0),
         ("mult", 1.0),
@@ -155,6 +159,24 @@ class CommInfoBase(with_metaclass(MetaParams)):
 
         self._creditrate = self.p.interest / 365.0
 
+        # The bulk methods can only bypass the per-item calls if the
+        # calculations have not been overridden in a subclass
+        cls = type(self)
+        self._stdcomm = (
+            cls._getcommission is CommInfoBase._getcommission
+            and cls.getcommission is CommInfoBase.getcommission
+        )
+        self._stdmargin = cls.get_margin is CommInfoBase.get_margin
+        self._stdsize = cls.getsize is CommInfoBase.getsize
+        self._stdopcost = cls.getoperationcost is CommInfoBase.getoperationcost
+        self._stdvaluesize = cls.getvaluesize is CommInfoBase.getvaluesize
+        self._stdpnl = cls.profitandloss is CommInfoBase.profitandloss
+        self._stdcashadjust = cls.cashadjust is CommInfoBase.cashadjust
+        self._stdcredit = (
+            cls.get_credit_interest is CommInfoBase.get_credit_interest
+            and cls._get_credit_interest is CommInfoBase._get_credit_interest
+        )
+
     @property
     def margin(self):
         """ """
@@ -346,6 +368,144 @@ class CommInfoBase(with_metaclass(MetaParams)):
         return days * self._creditrate * abs(size) * price
 
 
+    # Bulk versions of the methods above. They take iterables (lists, tuples,
+    # arrays) of equal length and return a list with the result for each
+    # element. The params are fetched only once per call and if the default
+    # calculations are in place the per-item method calls are skipped
+    def _margins(self, prices):
+        """Returns the margin for each of the given prices
+
+        :param prices:
+
+        """
+        if not self._stdmargin:
+            return [self.get_margin(p) for p in prices]
+
+        automargin = self.p.automargin
+        if not automargin:
+            margin = self.p.margin
+            return [margin for p in prices]
+
+        mult = self.p.mult if automargin < 0 else automargin
+        return [p * mult for p in prices]
+
+    def getsizes(self, prices, cashes):
+        """Bulk version of ``getsize``
+
+        :param prices:
+        :param cashes:
+
+        """
+        if not self._stdsize:
+            return [self.getsize(p, c) for p, c in zip(prices, cashes)]
+
+        leverage = self.p.leverage
+        if not self._stocklike:
+            prices = self._margins(prices)
+
+        return [int(leverage * (c // p)) for p, c in zip(prices, cashes)]
+
+    def getoperationcosts(self, sizes, prices):
+        """Bulk version of ``getoperationcost``
+
+        :param sizes:
+        :param prices:
+
+        """
+        if not self._stdopcost:
+            return [self.getoperationcost(s, p) for s, p in zip(sizes, prices)]
+
+        if not self._stocklike:
+            prices = self._margins(prices)
+
+        return [abs(s) * p for s, p in zip(sizes, prices)]
+
+    def getvaluesizes(self, sizes, prices):
+        """Bulk version of ``getvaluesize``
+
+        :param sizes:
+        :param prices:
+
+        """
+        if not self._stdvaluesize:
+            return [self.getvaluesize(s, p) for s, p in zip(sizes, prices)]
+
+        if not self._stocklike:
+            return [abs(s) * m for s, m in zip(sizes, self._margins(prices))]
+
+        return [s * p for s, p in zip(sizes, prices)]
+
+    def getcommissions(self, sizes, prices):
+        """Bulk version of ``getcommission``
+
+        :param sizes:
+        :param prices:
+
+        """
+        if not self._stdcomm:
+            return [self.getcommission(s, p) for s, p in zip(sizes, prices)]
+
+        comm = self.p.commission
+        if self._commtype == self.COMM_PERC:
+            return [abs(s) * comm * p for s, p in zip(sizes, prices)]
+
+        return [abs(s) * comm for s in sizes]
+
+    def profitandlosses(self, sizes, prices, newprices):
+        """Bulk version of ``profitandloss``
+
+        :param sizes:
+        :param prices:
+        :param newprices:
+
+        """
+        if not self._stdpnl:
+            return [
+                self.profitandloss(s, p, n) for s, p, n in zip(sizes, prices, newprices)
+            ]
+
+        mult = self.p.mult
+        return [s * (n - p) * mult for s, p, n in zip(sizes, prices, newprices)]
+
+    def cashadjusts(self, sizes, prices, newprices):
+        """Bulk version of ``cashadjust``
+
+        :param sizes:
+        :param prices:
+        :param newprices:
+
+        """
+        if not self._stdcashadjust:
+            return [
+                self.cashadjust(s, p, n) for s, p, n in zip(sizes, prices, newprices)
+            ]
+
+        if self._stocklike:
+            return [0.0 for s in sizes]
+
+        mult = self.p.mult
+        return [s * (n - p) * mult for s, p, n in zip(sizes, prices, newprices)]
+
+    def get_credit_interests(self, datas, positions, dts):
+        """Bulk version of ``get_credit_interest``
+
+        If no interest is charged with the default calculation, no position
+        is looked at
+
+        :param datas:
+        :param positions:
+        :param dts:
+
+        """
+        if self._stdcredit and not self._creditrate:
+            return [0.0 for d in datas]
+
+        return [
+            self.get_credit_interest(d, pos, dt)
+            for d, pos, dt in zip(datas, positions, dts)
+        ]
+
+
 class CommissionInfo(CommInfoBase):
     """Base Class for the actual Commission Schemes.
 
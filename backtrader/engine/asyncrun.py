@@ -0,0 +1,135 @@
+# Copyright (c) 2025 backtrader contributors
+"""
+Execução ao vivo nativa em asyncio (``await cerebro.run_async()``): o loop espera o
+próximo evento de qualquer data feed, store ou broker em vez de consultar os data
+feeds a cada ``qcheck``.
+Todas as funções e docstrings devem ser line-wrap ≤ 90 caracteres.
+"""
+
+import asyncio
+import itertools
+import threading
+
+from backtrader.engine.runner import NextLoop, startstrategies, stopstrategies
+
+
+class Wakeup(object):
+    """
+    Sinal de "há algo novo" instalado com ``setwakeup`` nos data feeds, stores e
+    broker. Chamado na thread do event loop (ex: callbacks de um
+    ``asyncio.Protocol``) marca o evento diretamente; chamado de outra thread (ex:
+    streaming em thread) agenda a marcação no loop.
+
+    :param loop: event loop em que ``run_async`` executa
+    """
+
+    def __init__(self, loop):
+        self._loop = loop
+        self._thread = threading.get_ident()
+        self._event = asyncio.Event()
+
+    def __call__(self):
+        if threading.get_ident() == self._thread:
+            self._event.set()
+            return
+
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            pass  # loop já fechado
+
+    def clear(self):
+        """
+        Descarta as chamadas anteriores.
+        """
+        self._event.clear()
+
+    async def wait(self, timeout=None):
+        """
+        Espera a próxima chamada, no máximo ``timeout`` segundos (``None``: sem
+        limite).
+        """
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+def _sources(cerebro):
+    """
+    Retorna os objetos que aceitam ``setwakeup``: data feeds, stores e broker.
+    """
+    sources = list(cerebro.datas) + list(cerebro.stores) + [cerebro._broker]
+    return [s for s in sources if hasattr(s, "setwakeup")]
+
+
+def _polltimeout(cerebro):
+    """
+    Retorna o intervalo máximo de espera sem eventos: o menor ``qcheck`` dos data
+    feeds ao vivo que não chamam o wakeup, ou que têm filtros (ex: resample) que
+    fecham barras pelo relógio. ``None`` se nenhum precisa ser consultado.
+    """
+    qchecks = [
+        d.p.qcheck
+        for d in cerebro.datas
+        if d.islive() and (not d._asyncwakeup or d._filters)
+    ]
+    return min(qchecks) if qchecks else None
+
+
+async def _runnext(cerebro, runstrats, wakeup):
+    """
+    Loop "next" assíncrono: executa iterações sem espera enquanto houver barras e,
+    quando nenhum data feed tem barra, aguarda o próximo evento.
+    """
+    loop = NextLoop(cerebro, runstrats)
+    timeout = _polltimeout(cerebro)
+    while True:
+        wakeup.clear()  # eventos durante o step são vistos no wait seguinte
+        ret = loop.step(wait=False)
+        if ret is False:
+            break
+
+        if ret is None:
+            await wakeup.wait(timeout)
+        else:
+            await asyncio.sleep(0)  # deixa os callbacks do loop executarem
+
+    loop.finish()
+
+
+async def run_async(cerebro, **kwargs):
+    """
+    Ponto de entrada de ``Cerebro.run_async`` (ver a documentação do método).
+    """
+    cerebro.prerun(**kwargs)
+    if not cerebro.datas:
+        return []
+
+    if cerebro._dooptimize:
+        raise ValueError("run_async does not optimize: use run")
+
+    # sempre barra a barra, como ao vivo
+    cerebro._dorunonce = cerebro._dopreload = False
+
+    wakeup = Wakeup(asyncio.get_running_loop())
+    sources = _sources(cerebro)
+    cerebro._wakeup = wakeup
+    for source in sources:
+        source.setwakeup(wakeup)
+
+    try:
+        iterstrat = next(itertools.product(*cerebro.strats))
+        runstrats = startstrategies(cerebro, iterstrat)
+        if runstrats:
+            await _runnext(cerebro, runstrats, wakeup)
+            for strat in runstrats:
+                strat._stop()
+        runstrats = stopstrategies(cerebro, runstrats)
+    finally:
+        cerebro._wakeup = None
+        for source in sources:
+            source.setwakeup(None)
+
+    cerebro.runstrats.append(runstrats)
+    return cerebro.finishrun()
@@ -0,0 +1,287 @@
+# Copyright (c) 2025 backtrader contributors
+"""
+Otimização distribuída: um coordenador entrega lotes de combinações por TCP (ou
+socket Unix) a workers em outras máquinas, que executam com os dados locais e
+devolvem os resultados. Lotes de um worker perdido voltam para a fila.
+Todas as funções e docstrings devem ser line-wrap ≤ 90 caracteres.
+"""
+
+import collections
+import logging
+import os
+import queue
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+from backtrader.engine.optimizer import _preload
+from backtrader.engine.runner import optcolumns
+
+logger = logging.getLogger(__name__)
+
+# Mensagens (tuples serializadas com pickle por ``multiprocessing.connection``):
+#   coordenador -> worker: ("welcome", config), ("chunk", cid, itens), ("stop",)
+#   worker -> coordenador: ("result", cid, resultados), ("error", texto)
+# ``itens`` é uma lista de ``(i, iterstrat)`` e ``resultados`` de ``(i, resultado)``
+#
+# ``multiprocessing.connection`` desserializa tudo o que recebe: quem conecta sem a
+# authkey poderia executar código nos dois lados. Em TCP a authkey é obrigatória.
+
+
+def _islocal(address):
+    """
+    Indica se ``address`` é um socket Unix ou um named pipe (protegidos pelas
+    permissões do sistema) e não um endereço TCP.
+    """
+    return isinstance(address, str)
+
+
+class OptCoordinator(object):
+    """
+    Serve as combinações de uma otimização (``optstrategy``) em lotes de
+    ``chunksize`` para os workers conectados em ``address``. Cada conexão é
+    atendida por uma thread: envia um lote, espera o resultado e envia o próximo.
+
+    Se a conexão cair (ou o worker não responder em ``timeout`` segundos) o lote
+    volta para a fila e é entregue a outro worker. Um resultado que chegue depois
+    de o lote já ter sido concluído por outro worker é descartado.
+
+    :param address: ``(host, porta)`` para TCP (porta 0: escolhida pelo sistema)
+        ou caminho de um socket Unix
+    :param authkey: chave (bytes) compartilhada com os workers. ``None`` em TCP
+        gera uma chave aleatória, disponível em ``authkey`` para os workers
+    :param chunksize: combinações por lote
+    :param timeout: segundos de espera pelo resultado de um lote (``None``: sem
+        limite)
+    """
+
+    def __init__(self, address, authkey=None, chunksize=8, timeout=None):
+        self.chunksize = max(1, chunksize)
+        self.timeout = timeout
+        if authkey is None and not _islocal(address):
+            authkey = os.urandom(32)
+        self.authkey = authkey
+        self._listener = Listener(address, authkey=authkey, backlog=64)
+        self.address = self._listener.address  # com a porta efetiva
+        self._cond = threading.Condition()
+        self._todo = collections.deque()  # ids dos lotes a entregar
+        self._chunks = list()
+        self._done = set()
+        self._results = queue.Queue()
+        self._config = None  # definido no início da otimização
+        self._running = False
+        self._closed = False
+        # workers podem conectar antes do início da otimização
+        self._acceptor = threading.Thread(target=self._accept)
+        self._acceptor.daemon = True
+        self._acceptor.start()
+
+    def _accept(self):
+        """
+        Aceita conexões de workers (thread).
+        """
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError, AuthenticationError) as e:
+                if not self._closed:  # handshake falhou (ex: authkey errada)
+                    logger.warning("Worker connection refused: %r", e)
+                continue
+
+            if self._closed:
+                conn.close()
+                break
+
+            t = threading.Thread(target=self._serve, args=(conn,))
+            t.daemon = True
+            t.start()
+
+    def _nextchunk(self):
+        """
+        Retorna o id do próximo lote a entregar ou ``None`` se a otimização
+        terminou, esperando enquanto houver lotes em execução em outros workers.
+        """
+        with self._cond:
+            while self._running and not self._todo:
+                self._cond.wait()
+            return self._todo.popleft() if self._running else None
+
+    def _requeue(self, cid):
+        """
+        Devolve um lote à fila (worker perdido).
+        """
+        with self._cond:
+            if self._running and cid not in self._done:
+                self._todo.appendleft(cid)
+                self._cond.notify()
+
+    def _serve(self, conn):
+        """
+        Atende um worker até o fim da otimização ou a perda da conexão (thread).
+        """
+        cid = None
+        try:
+            with self._cond:
+                while self._config is None and not self._closed:
+                    self._cond.wait()
+                config = self._config
+            if config is None:
+                return  # fechado antes de iniciar uma otimização
+
+            conn.send(("welcome", config))
+            while True:
+                cid = self._nextchunk()
+                if cid is None:
+                    conn.send(("stop",))
+                    break
+
+                conn.send(("chunk", cid, self._chunks[cid]))
+                if self.timeout is not None and not conn.poll(self.timeout):
+                    raise EOFError("worker timeout")
+
+                msg = conn.recv()
+                if msg[0] == "error":
+                    self._results.put(msg)
+                    cid = None
+                    break
+
+                with self._cond:
+                    if cid not in self._done:
+                        self._done.add(cid)
+                        self._results.put(msg)
+                cid = None
+        except (OSError, EOFError):
+            pass
+        finally:
+            if cid is not None:
+                self._requeue(cid)
+            conn.close()
+
+    def run(self, cerebro, iterstrats):
+        """
+        Distribui ``iterstrats`` e gera ``(i, resultado)`` à medida que os lotes
+        terminam (fora de ordem), com ``i`` a posição da combinação.
+        """
+        items = list(enumerate(iterstrats))
+        size = self.chunksize
+        classes = [stratcls for stratcls, _, _ in items[0][1]] if items else []
+
+        with self._cond:
+            self._chunks = [items[i: i + size] for i in range(0, len(items), size)]
+            self._todo = collections.deque(range(len(self._chunks)))
+            self._done = set()
+            self._results = queue.Queue()
+            self._config = dict(
+                optreturn=getattr(cerebro.p, "optreturn", True),
+                optcompact=getattr(cerebro.p, "optcompact", False),
+                columns=[optcolumns(cerebro, c) for c in classes],
+            )
+            self._running = bool(self._chunks)
+            self._cond.notify_all()
+
+        try:
+            remaining = len(self._chunks)
+            while remaining:
+                msg = self._results.get()
+                if msg[0] == "error":
+                    raise RuntimeError("Optimization worker failed: %s" % msg[1])
+
+                remaining -= 1
+                for i, result in msg[2]:
+                    yield i, result
+        finally:
+            with self._cond:
+                self._running = False
+                self._cond.notify_all()
+
+    def close(self):
+        """
+        Para de aceitar conexões e fecha o socket.
+        """
+        if self._closed:
+            return
+
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        try:  # desbloqueia o accept da thread
+            Client(self.address, authkey=self.authkey).close()
+        except (OSError, EOFError):
+            pass
+        self._acceptor.join()
+        self._listener.close()
+
+
+def optworker(cerebro, address, authkey=None, wait=10.0):
+    """
+    Executa como worker de um ``OptCoordinator``: conecta em ``address`` e roda
+    os lotes recebidos com os data feeds, analyzers e broker de ``cerebro`` (os
+    dados são carregados uma vez). Tenta conectar durante ``wait`` segundos.
+    ``authkey`` é obrigatória em TCP (a ``authkey`` do coordenador).
+    Retorna o número de combinações executadas.
+    """
+    if authkey is None and not _islocal(address):
+        raise ValueError("An authkey is needed to connect to a TCP coordinator")
+
+    deadline = time.time() + wait
+    while True:
+        try:
+            conn = Client(address, authkey=authkey)
+            break
+        except (OSError, EOFError):
+            if time.time() >= deadline:
+                raise
+            time.sleep(0.1)
+
+    count = 0
+    try:
+        try:
+            config = conn.recv()[1]
+        except EOFError:
+            return count  # coordenador fechado antes de iniciar
+
+        cerebro.p.optreturn = config["optreturn"]
+        cerebro.p.optcompact = config["optcompact"]
+        cerebro.prerun()
+        cerebro._dooptimize = True
+        predata = _preload(cerebro)
+        checked = set()
+        while True:
+            try:
+                msg = conn.recv()
+            except EOFError:
+                break  # coordenador encerrado
+
+            if msg[0] == "stop":
+                break
+
+            _, cid, items = msg
+            results = list()
+            for i, iterstrat in items:
+                for idx, (stratcls, _, _) in enumerate(iterstrat):
+                    if idx in checked:
+                        continue
+                    columns = optcolumns(cerebro, stratcls)
+                    if columns != config["columns"][idx]:
+                        conn.send(("error", "columns differ: %r" % (columns,)))
+                        return count
+                    checked.add(idx)
+
+                try:
+                    runstrat = cerebro.runstrategies(iterstrat, predata=predata)
+                except Exception as e:
+                    conn.send(("error", repr(e)))
+                    raise
+
+                results.append((i, runstrat))
+                count += 1
+
+            conn.send(("result", cid, results))
+    finally:
+        conn.close()
+        if predata:
+            for data in cerebro.datas:
+                data.stop()
+
+    return count
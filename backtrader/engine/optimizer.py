@@ -0,0 +1,374 @@
+# Copyright (c) 2025 backtrader contributors
+"""
+Otimização adaptativa de parâmetros: busca aleatória, successive halving e
+amostragem no estilo TPE, com interrupção antecipada de execuções sem chance.
+Todas as funções e docstrings devem ser line-wrap ≤ 90 caracteres.
+"""
+
+import collections
+import math
+import multiprocessing
+import random
+
+from backtrader.analyzer import Analyzer
+from backtrader.engine.runner import _optmetric, stopstrategies
+
+# Resultado de uma combinação avaliada: parâmetros (dict), pontuação (``None``
+# se interrompida por ``prune``), se foi interrompida e a fração dos dados usada
+Trial = collections.namedtuple("Trial", "params score pruned budget")
+
+OPTDEFAULTS = dict(
+    maximize=True,
+    ntrials=50,
+    seed=None,
+    prune=None,
+    pruneevery=20,
+    eta=3,
+    nstartup=10,
+    ncandidates=24,
+    gamma=0.25,
+)
+
+
+class TrialStop(Exception):
+    """
+    Interrompe a execução de uma combinação antes do fim dos dados.
+    :param pruned: ``True`` se a combinação foi descartada por ``prune``
+    """
+
+    def __init__(self, pruned):
+        super(TrialStop, self).__init__(pruned)
+        self.pruned = pruned
+
+
+class TrialPruner(Analyzer):
+    """
+    Analyzer interno que interrompe a combinação em execução quando a fração de
+    barras do orçamento foi atingida ou quando o callable ``prune`` do
+    ``cerebro._trialspec`` considera a combinação sem chance.
+    """
+
+    def start(self):
+        """ """
+        self._budget, self._prune, self._every = self.strategy.cerebro._trialspec
+        self._maxlen = None
+        if self._budget < 1.0:
+            buflen = self.strategy.data.buflen()  # só conhecido com preload
+            if buflen:
+                self._maxlen = max(1, int(math.ceil(buflen * self._budget)))
+
+    def next(self):
+        """ """
+        n = len(self.strategy)
+        if self._prune is not None and not n % self._every:
+            if self._prune(self.strategy):
+                raise TrialStop(True)
+
+        if self._maxlen is not None and n >= self._maxlen:
+            raise TrialStop(False)
+
+
+def _score(strat, metric):
+    """
+    Calcula a métrica de uma estratégia: callable ``metric(strategy)`` ou texto
+    ``nome_do_analyzer.chave`` (ex: ``sharperatio.sharperatio``).
+    """
+    if callable(metric):
+        return metric(strat)
+    name, _, path = metric.partition(".")
+    return _optmetric(strat.analyzers.getbyname(name).get_analysis(), path)
+
+
+def _runtrial(task):
+    """
+    Executa uma combinação (em um processo do pool ou no processo principal) e
+    retorna ``(idx, Trial)``, com ``idx`` a posição da combinação no lote.
+    """
+    idx, cerebro, strategy, params, budget, metric, predata = task
+    cerebro._trialspec = (budget, cerebro._optprune, cerebro._optpruneevery)
+    try:
+        runstrats = cerebro.runstrategies([(strategy, (), params)], predata=predata)
+        pruned = False
+    except TrialStop as e:
+        runstrats = cerebro.runningstrats
+        pruned = e.pruned
+        for strat in runstrats:
+            strat._stop()  # finaliza os analyzers com as barras vistas
+        # para broker, data feeds, stores e journal como no fim normal da execução
+        runstrats = stopstrategies(cerebro, runstrats, predata=predata)
+
+    score = None if pruned else _score(runstrats[0], metric)
+    return idx, Trial(params, score, pruned, budget)
+
+
+class _Space(object):
+    """
+    Espaço discreto de parâmetros: ``{nome: valores}``. As combinações são
+    indexadas em base mista, sem materializar o produto cartesiano.
+    """
+
+    def __init__(self, space):
+        self.names = list(space)
+        self.values = [list(v) for v in space.values()]
+        self.size = 1
+        for v in self.values:
+            self.size *= len(v)
+
+    def decode(self, idx):
+        """
+        Retorna a combinação (tuple de índices por parâmetro) de número ``idx``.
+        """
+        combo = list()
+        for values in reversed(self.values):
+            idx, i = divmod(idx, len(values))
+            combo.append(i)
+        return tuple(reversed(combo))
+
+    def params(self, combo):
+        """
+        Converte uma combinação (índices) em dict de parâmetros.
+        """
+        return dict((n, v[i]) for n, v, i in zip(self.names, self.values, combo))
+
+    def sample(self, rng, n, exclude=()):
+        """
+        Sorteia até ``n`` combinações distintas que não estejam em ``exclude``.
+        """
+        n = min(n, self.size - len(exclude))
+        if self.size <= 4 * (n + len(exclude)):
+            pool = [c for c in map(self.decode, range(self.size)) if c not in exclude]
+            return rng.sample(pool, n)
+
+        chosen = set()
+        while len(chosen) < n:
+            combo = self.decode(rng.randrange(self.size))
+            if combo not in exclude:
+                chosen.add(combo)
+        return list(chosen)
+
+
+class Optimizer(object):
+    """
+    Executa ``cerebro.optimize``. Cada lote de combinações é avaliado no pool
+    de processos (``imap_unordered``: um processo liberado por uma combinação
+    interrompida já recebe a próxima) ou em sequência se ``maxcpus == 1``.
+    """
+
+    def __init__(self, cerebro, strategy, space, method, metric, **kwargs):
+        self.cerebro = cerebro
+        self.strategy = strategy
+        self.space = _Space(space)
+        self.method = method
+        self.metric = metric
+        self.maximize = kwargs["maximize"]
+        self.ntrials = min(kwargs["ntrials"], self.space.size)
+        self.rng = random.Random(kwargs["seed"])
+        self.eta = kwargs["eta"]
+        if not self.eta >= 2:  # com eta <= 1 as rodadas de halving não terminam
+            raise ValueError("eta must be at least 2: %r" % (self.eta,))
+        self.nstartup = kwargs["nstartup"]
+        self.ncandidates = kwargs["ncandidates"]
+        self.gamma = kwargs["gamma"]
+        self.trials = list()
+        self._pool = None
+        self._predata = False
+
+    def _key(self, trial):
+        """
+        Valor usado na ordenação (maior é melhor, interrompidas por último).
+        """
+        if trial.score is None:
+            return float("-inf")
+        return trial.score if self.maximize else -trial.score
+
+    def _evaluate(self, combos, budget=1.0):
+        """
+        Avalia as combinações com a fração ``budget`` dos dados e retorna a lista
+        de ``Trial`` na ordem de ``combos``.
+        """
+        cerebro, strategy, getparams = self.cerebro, self.strategy, self.space.params
+        metric, predata = self.metric, self._predata
+        tasks = [
+            (i, cerebro, strategy, getparams(c), budget, metric, predata)
+            for i, c in enumerate(combos)
+        ]
+        if self._pool is None:
+            results = map(_runtrial, tasks)
+        else:
+            results = self._pool.imap_unordered(_runtrial, tasks)
+
+        trials = [None] * len(tasks)
+        for i, trial in results:
+            trials[i] = trial
+            for cb in cerebro.optcbs:
+                cb(trial)
+        return trials
+
+    def run(self):
+        """
+        Executa a otimização e retorna a lista de ``Trial``, da melhor para a
+        pior. As combinações que usaram uma fração maior dos dados (``halving``)
+        vêm antes das descartadas em rodadas anteriores.
+        """
+        cerebro = self.cerebro
+        # halving reavalia as combinações a cada rodada: total não conhecido
+        cerebro._opttotal = None if self.method == "halving" else self.ntrials
+        cerebro._optresumed = 0
+        for cb in cerebro.optcbs:  # callbacks com estado (ex: OptProgress)
+            if hasattr(cb, "start"):
+                cb.start()
+
+        maxcpus = getattr(cerebro.p, "maxcpus", 1)
+        if maxcpus != 1:
+            self._predata = _preload(cerebro)
+            self._pool = multiprocessing.Pool(maxcpus or None)
+
+        try:
+            getattr(self, "_run_" + self.method)()
+        finally:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+            if self._predata:
+                for data in cerebro.datas:
+                    data.stop()
+
+        return sorted(self.trials, key=lambda t: (t.budget, self._key(t)), reverse=True)
+
+    def _run_random(self):
+        """
+        Busca aleatória: ``ntrials`` combinações sorteadas sem repetição.
+        """
+        combos = self.space.sample(self.rng, self.ntrials)
+        self.trials.extend(self._evaluate(combos))
+
+    def _run_halving(self):
+        """
+        Successive halving: as ``ntrials`` combinações começam com uma fração
+        pequena dos dados; a cada rodada só a melhor ``1/eta`` parte segue e a
+        fração de dados é multiplicada por ``eta``, até usar todos os dados.
+        """
+        combos = self.space.sample(self.rng, self.ntrials)
+        rungs = 0
+        while self.eta ** (rungs + 1) <= len(combos):
+            rungs += 1
+
+        for rung in range(rungs + 1):
+            budget = float(self.eta ** (rung - rungs))
+            trials = self._evaluate(combos, budget)
+            if rung == rungs:
+                self.trials.extend(trials)
+                break
+
+            order = sorted(
+                range(len(combos)), key=lambda i: self._key(trials[i]), reverse=True
+            )
+            keep = max(1, len(combos) // self.eta)
+            self.trials.extend(trials[i] for i in order[keep:])  # descartadas
+            combos = [combos[i] for i in order[:keep]]
+
+    def _run_tpe(self):
+        """
+        Amostragem no estilo TPE (Tree-structured Parzen Estimator) para espaços
+        discretos: depois de ``nstartup`` combinações aleatórias, as combinações
+        avaliadas são divididas em boas (fração ``gamma``) e ruins; para cada
+        parâmetro são estimadas as frequências de cada valor nos dois grupos e, de
+        ``ncandidates`` candidatas sorteadas a partir das boas, são escolhidas as
+        de maior razão boas/ruins. Cada rodada avalia um lote do tamanho do pool.
+        """
+        seen = dict()  # combo -> Trial
+        batch = getattr(self.cerebro.p, "maxcpus", 1) or multiprocessing.cpu_count()
+
+        combos = self.space.sample(self.rng, min(self.nstartup, self.ntrials))
+        while combos:
+            seen.update(zip(combos, self._evaluate(combos)))
+            n = min(batch, self.ntrials - len(seen))
+            combos = self._tpe_propose(seen, n) if n > 0 else []
+
+        self.trials.extend(seen.values())
+
+    def _tpe_propose(self, seen, n):
+        """
+        Propõe ``n`` combinações ainda não avaliadas.
+        """
+        ranked = sorted(seen, key=lambda c: self._key(seen[c]), reverse=True)
+        ngood = max(1, int(math.ceil(self.gamma * len(ranked))))
+        good, bad = ranked[:ngood], ranked[ngood:]
+
+        densities = list()
+        for p, values in enumerate(self.space.values):
+            gcount = [1.0] * len(values)  # suavização de Laplace
+            bcount = [1.0] * len(values)
+            for c in good:
+                gcount[c[p]] += 1.0
+            for c in bad:
+                bcount[c[p]] += 1.0
+            gtot, btot = sum(gcount), sum(bcount)
+            densities.append(([x / gtot for x in gcount], [x / btot for x in bcount]))
+
+        scored = dict()
+        for _ in range(max(self.ncandidates, n)):
+            combo = tuple(
+                self.rng.choices(range(len(lgood)), weights=lgood)[0]
+                for lgood, _ in densities
+            )
+            if combo not in seen and combo not in scored:
+                scored[combo] = sum(
+                    math.log(lgood[i]) - math.log(lbad[i])
+                    for i, (lgood, lbad) in zip(combo, densities)
+                )
+
+        combos = sorted(scored, key=scored.get, reverse=True)[:n]
+        if len(combos) < n:  # completa com combinações aleatórias
+            exclude = set(seen) | set(combos)
+            combos += self.space.sample(self.rng, n - len(combos), exclude=exclude)
+        return combos
+
+
+def _preload(cerebro):
+    """
+    Pré-carrega os dados no processo principal (como ``startrun`` com
+    ``optdatas``) para que os processos do pool não tenham que fazê-lo.
+    Retorna ``True`` se os dados foram pré-carregados.
+    """
+    optdatas = getattr(cerebro.p, "optdatas", True)
+    if not (optdatas and cerebro._dopreload and cerebro._dorunonce):
+        return False
+
+    for data in cerebro.datas:
+        data.reset()
+        if cerebro._exactbars < 1:
+            data.extend(size=getattr(cerebro.p, "lookahead", 0))
+        data._start()
+        data.preload()
+    return True
+
+
+def optimize(cerebro, strategy, space, method="random", metric=None, **kwargs):
+    """
+    Ponto de entrada de ``Cerebro.optimize`` (ver a documentação do método).
+    """
+    if method not in ("random", "halving", "tpe"):
+        raise ValueError("Unknown optimization method: %s" % method)
+    if metric is None:
+        raise ValueError("A metric is needed to compare the runs")
+
+    kwargs = dict(OPTDEFAULTS, **kwargs)
+    cerebro.prerun()
+    olddooptimize = cerebro._dooptimize
+    cerebro._dooptimize = True
+    oldp = (cerebro.p.optreturn, cerebro.p.optcompact)
+    cerebro.p.optreturn = cerebro.p.optcompact = False  # estratégias no worker
+    cerebro._optprune = kwargs.pop("prune")
+    cerebro._optpruneevery = max(1, kwargs.pop("pruneevery"))
+    cerebro.analyzers.append((TrialPruner, (), dict(_name="_trialpruner")))
+    try:
+        optimizer = Optimizer(cerebro, strategy, space, method, metric, **kwargs)
+        return optimizer.run()
+    finally:
+        cerebro.analyzers.pop()
+        cerebro.p.optreturn, cerebro.p.optcompact = oldp
+        # um cerebro.run posterior executa normalmente
+        cerebro._dooptimize = olddooptimize
+        for name in ("_optprune", "_optpruneevery", "_trialspec"):
+            cerebro.__dict__.pop(name, None)
@@ -4,8 +4,14 @@ Lógica de execução e orquestração do loop principal do backtrader.
 Todas as funções e docstrings devem ser line-wrap ≤ 90 caracteres.
 """
 
+import collections
+import datetime
+import gc
 import itertools
 import multiprocessing
+import time
+from backtrader.utils.date import date2num, num2date
+from backtrader.utils.latency import latency
 from backtrader.utils.optreturn import OptReturn
 from backtrader.observers.broker import Broker
 from backtrader.observers.buysell import BuySell
@@ -18,18 +24,45 @@ def startrun(cerebro):
     Inicia a execução das estratégias, incluindo otimização se necessário.
     :param cerebro: Instância de Cerebro
     """
-    iterstrats = itertools.product(*cerebro.strats)
     dooptimize = getattr(cerebro, "_dooptimize", False)
+    sink = getattr(cerebro, "_optsink", None) if dooptimize else None
+    checkpoint = getattr(cerebro, "_optcheckpoint", None) if dooptimize else None
+    if sink is not None or checkpoint is not None:
+        columns = [optcolumns(cerebro, c) for c in _stratclasses(cerebro)]
+        if sink is not None:
+            sink.start(columns)
+        if checkpoint is not None:
+            checkpoint.start(cerebro, columns)
+    iterstrats = itertools.product(*cerebro.strats)
+    keys = collections.deque()  # chaves das combinações pendentes, em ordem
+    cerebro._opttotal = None  # número de combinações, se conhecido
+    cerebro._optresumed = 0  # resultados retomados do checkpoint
+    if dooptimize:
+        for cb in cerebro.optcbs:  # callbacks com estado (ex: OptProgress)
+            if hasattr(cb, "start"):
+                cb.start()
+    if checkpoint is not None:
+        iterstrats = _optresume(cerebro, sink, checkpoint, iterstrats, keys)
     maxcpus = getattr(cerebro.p, "maxcpus", 1)
     predata = getattr(cerebro.p, "predata", False)
-    if not dooptimize or maxcpus == 1:
+    coordinator = getattr(cerebro, "_optcoordinator", None) if dooptimize else None
+    if coordinator is not None:
+        # Workers remotos executam as combinações com seus próprios dados
+        keys = list(keys)  # resultados fora de ordem: acesso pela posição
+        for i, r in coordinator.run(cerebro, iterstrats):
+            if checkpoint is not None:
+                checkpoint.put(keys[i], r)
+            _optresult(cerebro, sink, r)
+    elif not dooptimize or maxcpus == 1:
         # Se não for otimização ou só 1 núcleo, executa sequencial
         for iterstrat in iterstrats:
             runstrat = cerebro.runstrategies(iterstrat, predata=predata)
-            cerebro.runstrats.append(runstrat)
             if dooptimize:
-                for cb in cerebro.optcbs:
-                    cb(runstrat)
+                if checkpoint is not None:
+                    checkpoint.put(keys.popleft(), runstrat)
+                _optresult(cerebro, sink, runstrat)
+            else:
+                cerebro.runstrats.append(runstrat)
     else:
         optdatas = getattr(cerebro.p, "optdatas", True)
         dopreload = getattr(cerebro, "_dopreload", False)
@@ -43,15 +76,191 @@ def startrun(cerebro):
                 data._start()
                 if dopreload:
                     data.preload()
-        pool = multiprocessing.Pool(maxcpus or None)
-        for r in pool.imap(cerebro, iterstrats):
-            cerebro.runstrats.append(r)
-            for cb in cerebro.optcbs:
-                cb(r)
-        pool.close()
+        _optpool(cerebro, sink, checkpoint, iterstrats, keys, maxcpus)
         if optdatas and dopreload and dorunonce:
             for data in cerebro.datas:
                 data.stop()
+    if checkpoint is not None:
+        checkpoint.stop()
+
+
+class _OptBatch(object):
+    """
+    Callable enviado ao pool: executa um lote ``[(i, iterstrat)]`` e retorna
+    ``[(i, resultado)]``, para que a posição de cada combinação acompanhe o
+    resultado quando a ordem de execução não é a ordem das combinações.
+    """
+
+    def __init__(self, cerebro):
+        self.cerebro = cerebro
+
+    def __call__(self, batch):
+        return [(i, self.cerebro(iterstrat)) for i, iterstrat in batch]
+
+
+def _optparams(iterstrat):
+    """
+    Retorna os parâmetros de uma combinação (de todas as estratégias) em um dict.
+    """
+    return dict(kv for _, _, kwargs in iterstrat for kv in kwargs.items())
+
+
+def _optbatches(items, nprocs, chunksize):
+    """
+    Divide ``items`` em lotes de ``chunksize``. Com ``chunksize`` 0 os lotes são
+    adaptativos (guided scheduling): cada lote leva ``1 / (2 * nprocs)`` das
+    combinações restantes, de modo que os primeiros são grandes (pouca troca de
+    mensagens) e os últimos pequenos (os processos terminam juntos).
+    """
+    batches = list()
+    start, size = 0, chunksize
+    while start < len(items):
+        if not chunksize:
+            size = max(1, (len(items) - start) // (2 * nprocs))
+        batches.append(items[start: start + size])
+        start += size
+    return batches
+
+
+# Estado herdado pelos processos criados com ``optfork``: (cerebro, iterstrats)
+_optforkstate = None
+
+
+def _optforkbatch(batch):
+    """
+    Executa, em um processo criado com fork, o lote de combinações de índices
+    ``batch`` com o ``cerebro`` herdado do processo principal.
+    """
+    cerebro, iterstrats = _optforkstate
+    return [(i, cerebro(iterstrats[i])) for i in batch]
+
+
+def _optpool(cerebro, sink, checkpoint, iterstrats, keys, maxcpus):
+    """
+    Executa as combinações no pool de processos. Sem opções de agendamento usa
+    ``pool.imap`` sobre as combinações (sem materializá-las). Com ``optcost``,
+    ``optunordered``, ``optchunksize=0`` ou ``optfork`` as combinações são
+    numeradas, ordenadas da mais cara para a mais barata (``optcost``) e
+    divididas em lotes; sem ``optunordered`` os resultados voltam à ordem original
+    antes da entrega.
+
+    Com ``optfork`` os processos são criados com fork depois do preload e herdam
+    o ``cerebro`` e as combinações (copy-on-write): só os índices trafegam. Os
+    objetos existentes são congelados (``gc.freeze``) para que a coleta de lixo
+    dos processos não escreva nos seus cabeçalhos e duplique as páginas.
+    """
+    global _optforkstate
+
+    nprocs = maxcpus or multiprocessing.cpu_count()
+    chunksize = getattr(cerebro.p, "optchunksize", 1)
+    unordered = getattr(cerebro.p, "optunordered", False)
+    cost = getattr(cerebro, "_optcost", None)
+    maxtasks = getattr(cerebro.p, "optmaxtasks", None)
+    fork = getattr(cerebro.p, "optfork", False)
+    fork = fork and "fork" in multiprocessing.get_all_start_methods()
+    if chunksize and not unordered and cost is None and not fork:
+        pool = multiprocessing.Pool(maxcpus or None, maxtasksperchild=maxtasks)
+        for r in pool.imap(cerebro, iterstrats, chunksize):
+            if checkpoint is not None:
+                checkpoint.put(keys.popleft(), r)  # imap preserva a ordem
+            _optresult(cerebro, sink, r)
+        pool.close()
+        return
+
+    items = list(enumerate(iterstrats))
+    if cerebro._opttotal is None:
+        cerebro._opttotal = len(items)
+    keys = list(keys)  # acesso pela posição da combinação
+    if fork:
+        _optforkstate = (cerebro, [iterstrat for _, iterstrat in items])
+    if cost is not None:
+        items.sort(key=lambda item: cost(_optparams(item[1])), reverse=True)
+
+    batches = _optbatches(items, nprocs, chunksize)
+    if fork:
+        func = _optforkbatch
+        batches = [[i for i, _ in batch] for batch in batches]
+        gc.freeze()  # também vale para processos recriados (maxtasksperchild)
+        ctx = multiprocessing.get_context("fork")
+        pool = ctx.Pool(maxcpus or None, maxtasksperchild=maxtasks)
+    else:
+        func = _OptBatch(cerebro)
+        pool = multiprocessing.Pool(maxcpus or None, maxtasksperchild=maxtasks)
+
+    try:
+        imap = pool.imap_unordered if unordered else pool.imap
+        pending = dict()  # resultados aguardando os anteriores (ordem original)
+        nexti = 0
+        for batch in imap(func, batches):
+            if not unordered:
+                pending.update(batch)
+                batch = list()
+                while nexti in pending:
+                    batch.append((nexti, pending.pop(nexti)))
+                    nexti += 1
+
+            for i, r in batch:
+                if checkpoint is not None:
+                    checkpoint.put(keys[i], r)
+                _optresult(cerebro, sink, r)
+        pool.close()
+    finally:
+        if fork:
+            gc.unfreeze()
+            _optforkstate = None
+
+
+def _optresume(cerebro, sink, checkpoint, iterstrats, keys):
+    """
+    Entrega os resultados das combinações já presentes no checkpoint e retorna
+    a lista das pendentes. ``keys`` recebe as chaves das pendentes, na mesma
+    ordem. A filtragem é feita aqui (e não de forma preguiçosa dentro do
+    ``pool.imap``) para que os resultados sejam entregues na thread principal.
+    """
+    pending, stored = list(), list()
+    for iterstrat in iterstrats:
+        key = checkpoint.key(iterstrat)
+        runstrat = checkpoint.get(key)
+        if runstrat is None:
+            pending.append(iterstrat)
+            keys.append(key)
+        else:
+            stored.append(runstrat)
+    cerebro._opttotal = len(pending) + len(stored)
+    cerebro._optresumed = len(stored)
+    for runstrat in stored:
+        _optresult(cerebro, sink, runstrat)
+    return pending
+
+
+def _stratclasses(cerebro):
+    """
+    Retorna a classe de estratégia de cada posição de ``cerebro.strats``. Os
+    iteradores de ``optstrategy`` são consumidos em um elemento e recompostos.
+    """
+    classes = list()
+    for i, strats in enumerate(cerebro.strats):
+        if isinstance(strats, list):
+            classes.append(strats[0][0])
+        else:
+            first = next(strats)
+            cerebro.strats[i] = itertools.chain([first], strats)
+            classes.append(first[0])
+    return classes
+
+
+def _optresult(cerebro, sink, runstrat):
+    """
+    Entrega o resultado de uma combinação da otimização: ao ``OptSink`` (se
+    houver) ou à lista ``cerebro.runstrats``, e aos callbacks ``optcbs``.
+    """
+    if sink is not None:
+        for idx, record in enumerate(runstrat):
+            sink.append(idx, record)
+    else:
+        cerebro.runstrats.append(runstrat)
+    for cb in cerebro.optcbs:
+        cb(runstrat)
 
 
 def finishrun(cerebro):
@@ -63,6 +272,9 @@ def finishrun(cerebro):
     if not dooptimize:
         # evitar lista de listas para casos regulares
         return cerebro.runstrats[0]
+    sink = getattr(cerebro, "_optsink", None)
+    if sink is not None:
+        return sink  # resultados na tabela e não em memória
     return cerebro.runstrats
 
 
@@ -73,6 +285,34 @@ def runstrategies(cerebro, iterstrat, predata=False):
     :param iterstrat: Iterador de estratégias
     :param predata: Flag de pré-carregamento
     """
+    runstrats = startstrategies(cerebro, iterstrat, predata=predata)
+    if runstrats:
+        if getattr(cerebro, "_dopreload", False) and getattr(
+            cerebro, "_dorunonce", False
+        ):
+            if getattr(cerebro.p, "oldsync", False):
+                cerebro._runonce_old(runstrats)
+            else:
+                cerebro._runonce(runstrats)
+        else:
+            if getattr(cerebro.p, "oldsync", False):
+                cerebro._runnext_old(runstrats)
+            else:
+                cerebro._runnext(runstrats)
+        for strat in runstrats:
+            strat._stop()
+    return stopstrategies(cerebro, runstrats, predata=predata)
+
+
+def startstrategies(cerebro, iterstrat, predata=False):
+    """
+    Inicia stores, broker e data feeds e instancia as estratégias, deixando tudo
+    pronto para o loop principal.
+    :param cerebro: Instância de Cerebro
+    :param iterstrat: Iterador de estratégias
+    :param predata: Flag de pré-carregamento
+    :return: lista das estratégias instanciadas
+    """
     cerebro._init_stcount()
     cerebro.runningstrats = runstrats = list()
     for store in cerebro.stores:
@@ -87,6 +327,9 @@ def runstrategies(cerebro, iterstrat, predata=False):
     for orders, onotify in cerebro._ohistory:
         cerebro._broker.add_order_history(orders, onotify)
     cerebro._broker.start()
+    journal = getattr(cerebro, "_journal", None)
+    if journal is not None and not getattr(cerebro, "_dooptimize", False):
+        journal.start()
     for feed in cerebro.feeds:
         feed.start()
     if getattr(cerebro, "writers_csv", False):
@@ -160,6 +403,10 @@ def runstrategies(cerebro, iterstrat, predata=False):
             writer.start()
         for listener in getattr(cerebro, "runlisteners", []):
             listener.start(cerebro)
+        warmstart = getattr(cerebro, "_warmstart", None)
+        if warmstart is not None and not getattr(cerebro, "_dooptimize", False):
+            # linhas restauradas do snapshot: os data feeds entregam só o que falta
+            warmstart.start(cerebro, runstrats)
         cerebro._timers = []
         cerebro._timerscheat = []
         for timer in cerebro._pretimers:
@@ -168,21 +415,24 @@ def runstrategies(cerebro, iterstrat, predata=False):
                 cerebro._timerscheat.append(timer)
             else:
                 cerebro._timers.append(timer)
-        if getattr(cerebro, "_dopreload", False) and getattr(
-            cerebro, "_dorunonce", False
-        ):
-            if getattr(cerebro.p, "oldsync", False):
-                cerebro._runonce_old(runstrats)
-            else:
-                cerebro._runonce(runstrats)
-        else:
-            if getattr(cerebro.p, "oldsync", False):
-                cerebro._runnext_old(runstrats)
-            else:
-                cerebro._runnext(runstrats)
-        for strat in runstrats:
-            strat._stop()
+    return runstrats
+
+
+def stopstrategies(cerebro, runstrats, predata=False):
+    """
+    Para broker, data feeds e stores depois do loop principal e monta o
+    resultado (estratégias ou retornos da otimização).
+    :param cerebro: Instância de Cerebro
+    :param runstrats: Lista de estratégias executadas
+    :param predata: Flag de pré-carregamento
+    """
+    warmstart = getattr(cerebro, "_warmstart", None)
+    if warmstart is not None:
+        warmstart.stop()  # antes de parar os data feeds, com as linhas intactas
     cerebro._broker.stop()
+    journal = getattr(cerebro, "_journal", None)
+    if journal is not None:
+        journal.stop()
     if not predata:
         for data in cerebro.datas:
             data.stop()
@@ -191,6 +441,8 @@ def runstrategies(cerebro, iterstrat, predata=False):
     for store in cerebro.stores:
         store.stop()
     if getattr(cerebro, "_dooptimize", False) and getattr(cerebro.p, "optreturn", True):
+        if getattr(cerebro.p, "optcompact", False):
+            return [optrecord(strat) for strat in runstrats]
         results = list()
         for strat in runstrats:
             for a in strat.analyzers:
@@ -206,6 +458,56 @@ def runstrategies(cerebro, iterstrat, predata=False):
     return runstrats
 
 
+def _optmetric(analysis, metric):
+    """
+    Busca uma métrica escalar pelo caminho com pontos (ex: ``max.drawdown``).
+    Retorna ``None`` se algum nível não existir.
+    """
+    value = analysis
+    for key in metric.split("."):
+        try:
+            value = value[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return value
+
+
+def optrecord(strat):
+    """
+    Monta o registro compacto de uma estratégia otimizada: os valores dos
+    parâmetros seguidos das métricas declaradas em ``optmetrics`` por cada
+    analyzer (analyzers sem ``optmetrics`` não entram no registro).
+    :param strat: Estratégia já executada
+    :return: tuple com os valores, na ordem de ``optcolumns``
+    """
+    values = list(strat.params._getvalues())
+    for analyzer in strat.analyzers:
+        if analyzer.optmetrics:
+            analysis = analyzer.get_analysis()
+            values.extend(_optmetric(analysis, m) for m in analyzer.optmetrics)
+    return tuple(values)
+
+
+def optcolumns(cerebro, strategy):
+    """
+    Retorna os nomes das colunas dos registros de ``optrecord`` para uma
+    classe de estratégia: os parâmetros e ``nome_do_analyzer.métrica``.
+    Calculado no processo principal, os nomes não trafegam com os resultados.
+    :param cerebro: Instância de Cerebro
+    :param strategy: Classe da estratégia otimizada
+    """
+    columns = list(strategy.params._getkeys())
+    counts = collections.defaultdict(itertools.count)
+    for ancls, _, ankwargs in cerebro.analyzers:
+        anname = ankwargs.get("_name", "") or ancls.__name__.lower()
+        anname += str(next(counts[anname]) or "")
+        metrics = ankwargs.get("_optmetrics")
+        if metrics is None:  # como em Strategy._addanalyzer: vale o da classe
+            metrics = ancls.optmetrics
+        columns.extend("%s.%s" % (anname, m) for m in metrics or ())
+    return columns
+
+
 def prerunstrategies(cerebro, iterstrat, predata=False):
     """
     Executa o pré-processamento das estratégias antes do loop principal.
@@ -290,16 +592,211 @@ def runstrategieskenel(cerebro):
     pass
 
 
+class NextLoop(object):
+    """
+    Loop "next" (dados não pré-carregados ou ao vivo) dividido em iterações: cada
+    ``step`` sincroniza os data feeds pelo datetime, entrega as notificações e
+    chama ``next`` das estratégias. Usado por ``_runnext`` e por ``run_async``.
+    :param cerebro: Instância de Cerebro
+    :param runstrats: Lista de estratégias em execução
+    """
+
+    def __init__(self, cerebro, runstrats):
+        self.cerebro = cerebro
+        self.runstrats = runstrats
+        self.datas = datas = sorted(
+            cerebro.datas, key=lambda x: (x._timeframe, x._compression)
+        )
+        self.rsonly = [i for i, x in enumerate(datas) if x.resampling and not x.replaying]
+        self.onlyresample = len(datas) == len(self.rsonly)
+        self.noresample = not self.rsonly
+        self.ldatas_noclones = len(datas) - sum(d._clone for d in datas)
+        self.dt0 = date2num(datetime.datetime.max) - 2  # padrão no máximo
+        self.warmstart = getattr(cerebro, "_warmstart", None)  # snapshots periódicos
+        if getattr(cerebro, "_dooptimize", False):
+            self.warmstart = None
+
+    def qcheck(self):
+        """
+        Indica se os data feeds devem esperar ``qcheck`` por dados ao vivo: não
+        se algum já tem dados no buffer, a menos que nenhum ou todos estejam ao
+        vivo.
+        """
+        datas = self.datas
+        if not any(d.haslivedata() for d in datas):
+            return True
+        livecount = sum(d._laststatus == d.LIVE for d in datas)
+        return not livecount or livecount == self.ldatas_noclones
+
+    def step(self, wait=True):
+        """
+        Executa uma iteração. Com ``wait=False`` os data feeds ao vivo não esperam
+        por dados. Retorna ``True`` se barras foram entregues, ``None`` se nenhum
+        data feed tinha uma barra (ao vivo) e ``False`` ao terminar (dados
+        esgotados ou ``runstop``).
+        """
+        cerebro, datas = self.cerebro, self.datas
+        if latency.enabled:
+            latency.setorigin(None)  # a origem vem da barra entregue nesta iteração
+        newqcheck = wait and self.qcheck()
+        # notificações da store antes de mover os dados, que podem não andar por
+        # causa de um erro reportado pela store
+        cerebro._storenotify()
+        if cerebro._event_stop:
+            return False
+        cerebro._datanotify()
+        if cerebro._event_stop:
+            return False
+
+        # os data feeds descontam do qcheck o tempo já gasto nesta iteração
+        drets = list()
+        qstart = time.time()
+        for d in datas:
+            d.do_qcheck(newqcheck, time.time() - qstart)
+            drets.append(d.next(ticks=False))
+
+        d0ret = any(drets)
+        if not d0ret and any(dret is None for dret in drets):
+            d0ret = None
+
+        lastret = False
+        if d0ret:
+            self._sync(drets)
+        elif d0ret is None:
+            # ao vivo sem barra: filtros (resample...) ainda podem produzir barras
+            for data in datas:
+                data._check()
+        else:
+            lastret = datas[0]._last()
+            for data in datas[1:]:
+                lastret += data._last(datamaster=datas[0])
+            if not lastret:
+                return False  # só faz uma volta extra se os "last" produziram algo
+
+        cerebro._datanotify()  # os dados podem ter gerado notificações
+        if cerebro._event_stop:
+            return False
+
+        runstrats = self.runstrats
+        if d0ret or lastret:  # timers antes do broker
+            self._checktimers(cheat=True)
+            if getattr(cerebro.p, "cheat_on_open", False):
+                for strat in runstrats:
+                    strat._next_open()
+                    if cerebro._event_stop:
+                        return False
+
+        cerebro._brokernotify()
+        if cerebro._event_stop:
+            return False
+
+        if d0ret or lastret:  # barras dos data feeds ou dos filtros
+            self._checktimers(cheat=False)
+            for strat in runstrats:
+                strat._next()
+                if cerebro._event_stop:
+                    return False
+            self._nextwriters()
+            if self.warmstart is not None:
+                self.warmstart.next()
+
+        return d0ret
+
+    def _sync(self, drets):
+        """
+        Alinha os data feeds pelo menor datetime entregue: os que estão à frente
+        voltam uma barra e os que não entregaram tentam contra o mestre.
+        """
+        datas = self.datas
+        dts = [d.datetime[0] if ret else None for d, ret in zip(datas, drets)]
+        if self.onlyresample or self.noresample:
+            dt0 = min(d for d in dts if d is not None)
+        else:
+            rsonly = self.rsonly
+            dt0 = min(d for i, d in enumerate(dts) if d is not None and i not in rsonly)
+
+        dmaster = datas[dts.index(dt0)]  # e mestre do tempo
+        self.dt0 = dt0
+        self.cerebro._dtmaster = dmaster.num2date(dt0)
+        self.cerebro._udtmaster = num2date(dt0)
+
+        for i, ret in enumerate(drets):
+            if ret:
+                continue
+            d = datas[i]
+            d._check(forcedata=dmaster)  # força a saída
+            if d.next(datamaster=dmaster, ticks=False):
+                dts[i] = d.datetime[0]
+
+        # só os que estão no datetime do mestre entregam
+        for i, dti in enumerate(dts):
+            if dti is None:
+                continue
+            di = datas[i]
+            if dti > dt0:
+                di.rewind()  # ainda não pode entregar
+            elif not di.replaying:
+                di._tick_fill(force=True)  # replay já preenche os ticks
+
+    def _checktimers(self, cheat=False):
+        """
+        Notifica os timers vencidos no datetime corrente.
+        """
+        cerebro = self.cerebro
+        timers = cerebro._timerscheat if cheat else cerebro._timers
+        for t in timers:
+            if not t.check(self.dt0):
+                continue
+
+            t.params.owner.notify_timer(t, t.lastwhen, *t.args, **t.kwargs)
+            if t.params.strats:
+                for strat in self.runstrats:
+                    strat.notify_timer(t, t.lastwhen, *t.args, **t.kwargs)
+
+    def _nextwriters(self):
+        """
+        Entrega os valores da barra aos writers.
+        """
+        cerebro = self.cerebro
+        runwriters = getattr(cerebro, "runwriters", None)
+        if not runwriters:
+            return
+
+        if getattr(cerebro, "writers_csv", False):
+            wvalues = list()
+            for data in cerebro.datas:
+                if getattr(data, "csv", False):
+                    wvalues.extend(data.getwritervalues())
+            for strat in self.runstrats:
+                wvalues.extend(strat.getwritervalues())
+            for writer in runwriters:
+                if writer.p.csv:
+                    writer.addvalues(wvalues)
+
+        for writer in runwriters:
+            writer.next()
+
+    def finish(self):
+        """
+        Última chance de entregar notificações dos data feeds e das stores.
+        """
+        cerebro = self.cerebro
+        if not cerebro._event_stop:
+            cerebro._datanotify()
+        if not cerebro._event_stop:
+            cerebro._storenotify()
+
+
 def _runnext(cerebro, runstrats):
     """
     Executa o loop de execução "next" para as estratégias.
     :param cerebro: Instância de Cerebro
     :param runstrats: Lista de estratégias em execução
     """
-    # Implementação extraída de cerebro.py
-    for strat in runstrats:
-        while not strat.stop():
-            strat.next()
+    loop = NextLoop(cerebro, runstrats)
+    while loop.step() is not False:
+        pass
+    loop.finish()
 
 
 def _runonce(cerebro, runstrats):
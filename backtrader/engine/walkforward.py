@@ -0,0 +1,382 @@
+# Copyright (c) 2025 backtrader contributors
+"""
+Walk-forward em paralelo: otimização dentro da amostra e validação fora da amostra
+de todas as janelas no pool de processos, com os dados carregados uma única vez.
+Todas as funções e docstrings devem ser line-wrap ≤ 90 caracteres.
+"""
+
+import array
+import bisect
+import collections
+import copy
+import math
+import multiprocessing
+
+from backtrader.analyzer import Analyzer
+from backtrader.engine.optimizer import _preload, _score, _Space
+from backtrader.feed import DataBase
+
+NAN = float("NaN")
+
+# Resultado de uma janela: limites (datetime float) do treino e do teste, melhores
+# parâmetros e pontuação dentro da amostra, curva de valor fora da amostra
+WFWindow = collections.namedtuple("WFWindow", "train test params score datetime value")
+
+# Resultado completo: janelas e a curva fora da amostra encadeada
+WalkForward = collections.namedtuple("WalkForward", "windows datetime value")
+
+# Parâmetros copiados do data feed original para os data feeds das janelas
+_DATAPARAMS = (
+    "timeframe",
+    "compression",
+    "tz",
+    "sessionstart",
+    "sessionend",
+    "calendar",
+)
+
+
+class ArrayData(DataBase):
+    """
+    Data feed sobre arrays já carregados (``{alias: sequência}``), usado para
+    entregar uma fatia dos dados sem ler a fonte original novamente. Os valores
+    são usados como estão (datetime em float, já convertido para UTC).
+
+    O ``preload`` copia cada fatia diretamente para o buffer da linha, sem passar
+    por ``load`` barra a barra.
+    """
+
+    params = (("arrays", None),)
+
+    def start(self):
+        """ """
+        super(ArrayData, self).start()
+        arrays = self.p.arrays
+        self._columns = [
+            (getattr(self.lines, alias), arrays.get(alias))
+            for alias in self.lines.getlinealiases()
+        ]
+        self._size = len(arrays["datetime"])
+        self._idx = 0
+
+    def preload(self):
+        """ """
+        dtline = self.lines.datetime
+        if dtline.mode == dtline.QBuffer or self._ffilters:
+            return super(ArrayData, self).preload()
+
+        for line, values in self._columns:
+            if values is None:
+                values = array.array(str("d"), [NAN]) * self._size
+            line.array = array.array(str("d"), values) + line.array  # + extensão
+
+        self.home()
+
+    def _load(self):
+        """ """
+        idx = self._idx
+        if idx >= self._size:
+            return False
+
+        for line, values in self._columns:
+            line[0] = NAN if values is None else values[idx]
+
+        self._idx = idx + 1
+        return True
+
+
+_arrayclasses = dict()
+
+
+def _arraydatacls(aliases):
+    """
+    Retorna uma subclasse de ``ArrayData`` com as linhas extras de ``aliases``
+    (ex: linhas adicionais de um ``PandasData``).
+    """
+    extra = tuple(a for a in aliases if a not in ArrayData.lines.getlinealiases())
+    if not extra:
+        return ArrayData
+
+    cls = _arrayclasses.get(extra)
+    if cls is None:
+        cls = type(str("ArrayData_" + "_".join(extra)), (ArrayData,), dict(lines=extra))
+        _arrayclasses[extra] = cls
+    return cls
+
+
+class _WFCurve(Analyzer):
+    """
+    Analyzer interno que pede à estratégia o registro da curva de valor.
+    """
+
+    def start(self):
+        """ """
+        self.strategy._getequitycurve()
+
+
+def _windows(size, train, test, step, anchored):
+    """
+    Retorna as janelas como ``(inicio_treino, inicio_teste, fim_teste)`` em
+    barras do primeiro data feed (fim exclusivo). A última janela de teste pode
+    ser mais curta para usar todas as barras.
+    """
+    windows = list()
+    start = 0
+    while start + train < size:
+        trainstart = 0 if anchored else start
+        teststart = start + train
+        windows.append((trainstart, teststart, min(teststart + test, size)))
+        start += step
+    return windows
+
+
+# Estado dos processos do pool (herdado no fork ou recebido uma vez por processo)
+_wfstate = None
+_wfcache = dict()
+
+
+def _wfinit(state):
+    """
+    Inicializador dos processos do pool.
+    """
+    global _wfstate
+    _wfstate = state
+    _wfcache.clear()
+
+
+def _wfcerebro(start, end, oos):
+    """
+    Retorna o ``cerebro`` da fatia ``[start, end)`` (barras do primeiro data
+    feed) e se os dados foram pré-carregados. O último é mantido em cache, já que
+    as tarefas de uma janela chegam em sequência ao processo.
+    """
+    key = (start, end, oos)
+    cached = _wfcache.get(key)
+    if cached is not None:
+        return cached
+
+    for cerebro, predata in _wfcache.values():
+        if predata:
+            for data in cerebro.datas:
+                data.stop()
+    _wfcache.clear()
+
+    template, datas = _wfstate["cerebro"], _wfstate["datas"]
+    cerebro = copy.copy(template)
+    cerebro.datas, cerebro.datasbyname, cerebro.feeds = list(), dict(), list()
+    if oos:
+        cerebro.analyzers = template.analyzers + [(_WFCurve, (), dict(_name="_wfcurve"))]
+
+    dt0 = datas[0][1]["datetime"]
+    first, last = dt0[start], dt0[end - 1]
+    for name, arrays, kwargs in datas:
+        dts = arrays["datetime"]
+        lo, hi = bisect.bisect_left(dts, first), bisect.bisect_right(dts, last)
+        window = dict((alias, values[lo:hi]) for alias, values in arrays.items())
+        datacls = _arraydatacls(list(arrays))
+        cerebro.adddata(datacls(arrays=window, **kwargs), name=name)
+
+    cached = _wfcache[key] = (cerebro, _preload(cerebro))
+    return cached
+
+
+def _wfinsample(task):
+    """
+    Executa uma combinação dentro da amostra de uma janela e retorna
+    ``(janela, combinação, pontuação)``.
+    """
+    w, combo = task
+    trainstart, teststart, _ = _wfstate["windows"][w]
+    cerebro, predata = _wfcerebro(trainstart, teststart, False)
+    params = _wfstate["space"].params(_wfstate["space"].decode(combo))
+    strategy = _wfstate["strategy"]
+    runstrats = cerebro.runstrategies([(strategy, (), params)], predata=predata)
+    score = _score(runstrats[0], _wfstate["metric"]) if runstrats else None
+    return w, combo, score
+
+
+def _wfoutsample(task):
+    """
+    Executa os melhores parâmetros de uma janela fora da amostra (com as barras
+    de ``warmup`` antes do teste) e retorna ``(janela, datetimes, valores, base)``
+    a partir da primeira barra de teste. ``base`` é o valor antes dessa barra.
+    """
+    w, params = task
+    _, teststart, testend = _wfstate["windows"][w]
+    start = max(0, teststart - _wfstate["warmup"])
+    cerebro, predata = _wfcerebro(start, testend, True)
+    strategy = _wfstate["strategy"]
+    strat = cerebro.runstrategies([(strategy, (), params)], predata=predata)[0]
+
+    curve = strat._getequitycurve()
+    values = curve.values(strat.broker.get_fundmode())
+    dtstart = _wfstate["datas"][0][1]["datetime"][teststart]
+    first = bisect.bisect_left(curve.datetime, dtstart)
+    base = values[first - 1] if first else strat.broker.startingcash
+    return w, curve.datetime[first:], values[first:], base
+
+
+def _better(score, best, maximize):
+    """
+    Indica se ``score`` é melhor que ``best`` (``None`` e NaN nunca são).
+    """
+    if score is None or score != score:
+        return False
+    if best is None:
+        return True
+    return score > best if maximize else score < best
+
+
+def _dataarrays(data):
+    """
+    Retorna uma cópia (``{alias: array}``) das barras pré-carregadas de ``data``.
+    """
+    size = data.buflen()
+    return dict(
+        (alias, array.array(str("d"), line.array[:size]))
+        for alias, line in zip(data.lines.getlinealiases(), data.lines)
+    )
+
+
+def walkforward(
+    cerebro,
+    strategy,
+    space,
+    train,
+    test,
+    step=None,
+    metric=None,
+    maximize=True,
+    warmup=0,
+    anchored=False,
+):
+    """
+    Ponto de entrada de ``Cerebro.walkforward`` (ver a documentação do método).
+    """
+    if metric is None:
+        raise ValueError("A metric is needed to compare the runs")
+    if train < 1 or test < 1:
+        raise ValueError("train and test must be at least 1 bar")
+
+    cerebro.prerun()
+    olddooptimize = cerebro._dooptimize
+    cerebro._dooptimize = True
+    oldp = (cerebro.p.optreturn, cerebro.p.optcompact)
+    cerebro.p.optreturn = cerebro.p.optcompact = False
+    try:
+        datas = list()
+        for data in cerebro.datas:  # uma única carga da fonte original
+            data.reset()
+            data._start()
+            data.preload()
+            kwargs = dict((p, getattr(data.p, p)) for p in _DATAPARAMS)
+            datas.append((data._name, _dataarrays(data), kwargs))
+            data.stop()
+
+        template = copy.copy(cerebro)
+        template.datas, template.datasbyname, template.feeds = list(), dict(), list()
+
+        space = _Space(space)
+        windows = _windows(
+            len(datas[0][1]["datetime"]), train, test, step or test, anchored
+        )
+        state = dict(
+            cerebro=template,
+            datas=datas,
+            strategy=strategy,
+            space=space,
+            metric=metric,
+            windows=windows,
+            warmup=warmup,
+        )
+        return _walkforward(cerebro, state, maximize)
+    finally:
+        cerebro.p.optreturn, cerebro.p.optcompact = oldp
+        cerebro._dooptimize = olddooptimize  # um cerebro.run posterior é normal
+
+
+def _walkforward(cerebro, state, maximize):
+    """
+    Distribui as tarefas: todas as combinações de todas as janelas entram no
+    pool de uma vez e a validação fora da amostra de uma janela é enviada assim
+    que a última de suas combinações termina, em paralelo com as demais.
+    """
+    windows, space = state["windows"], state["space"]
+    istasks = [(w, combo) for w in range(len(windows)) for combo in range(space.size)]
+    pending = [space.size] * len(windows)
+    best = [(None, None)] * len(windows)  # (pontuação, combinação)
+    oos = dict()
+
+    maxcpus = getattr(cerebro.p, "maxcpus", 1)
+    pool = None
+    if maxcpus == 1:
+        _wfinit(state)
+        results = map(_wfinsample, istasks)
+    else:
+        pool = multiprocessing.Pool(maxcpus or None, _wfinit, (state,))
+        nprocs = maxcpus or multiprocessing.cpu_count()
+        chunksize = max(1, min(space.size, len(istasks) // (4 * nprocs)))
+        results = pool.imap_unordered(_wfinsample, istasks, chunksize)
+
+    try:
+        for w, combo, score in results:
+            if _better(score, best[w][0], maximize):
+                best[w] = (score, combo)
+            pending[w] -= 1
+            if pending[w] or best[w][1] is None:
+                continue
+
+            task = (w, space.params(space.decode(best[w][1])))
+            if pool is None:
+                oos[w] = _wfoutsample(task)
+            else:
+                oos[w] = pool.apply_async(_wfoutsample, (task,))
+
+        if pool is not None:
+            oos = dict((w, res.get()) for w, res in oos.items())
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        else:
+            _wfinit(None)
+
+    return _stitch(cerebro, state, best, oos)
+
+
+def _stitch(cerebro, state, best, oos):
+    """
+    Monta as janelas e encadeia as curvas fora da amostra: cada janela começa do
+    valor final da anterior (a curva da janela é escalada pela razão entre esse
+    valor e o valor antes da primeira barra de teste).
+    """
+    dt0 = state["datas"][0][1]["datetime"]
+    space = state["space"]
+    windows = list()
+    stitched_dt = array.array(str("d"))
+    stitched_value = array.array(str("d"))
+    equity = cerebro.broker.startingcash
+    for w, (trainstart, teststart, testend) in enumerate(state["windows"]):
+        score, combo = best[w]
+        params = None if combo is None else space.params(space.decode(combo))
+        dts, values = array.array(str("d")), array.array(str("d"))
+        if w in oos:
+            _, dts, values, base = oos[w]
+            scale = equity / base if base else math.nan
+            stitched_dt.extend(dts)
+            stitched_value.extend(v * scale for v in values)
+            if values:
+                equity = stitched_value[-1]
+
+        windows.append(
+            WFWindow(
+                (dt0[trainstart], dt0[teststart - 1]),
+                (dt0[teststart], dt0[testend - 1]),
+                params,
+                score,
+                dts,
+                values,
+            )
+        )
+
+    return WalkForward(windows, stitched_dt, stitched_value)
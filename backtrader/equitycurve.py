@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import array
+
+__all__ = ["EquityCurve"]
+
+
+class EquityCurve(object):
+    """Columnar record of the broker state seen by a strategy on each bar
+
+    The strategy appends one row per bar (right after delivering the
+    ``notify_cashvalue`` / ``notify_fund`` notifications) to four
+    ``array.array`` of doubles:
+
+      - ``datetime``: the strategy datetime (float in backtrader format)
+      - ``cash``
+      - ``value``
+      - ``fundvalue``
+
+    A single curve is kept per strategy, no matter how many analyzers read
+    from it, and it is only created if an analyzer asks for it with
+    ``Strategy._getequitycurve``
+    """
+
+    def __init__(self):
+        self.datetime = array.array(str("d"))
+        self.cash = array.array(str("d"))
+        self.value = array.array(str("d"))
+        self.fundvalue = array.array(str("d"))
+
+    def __len__(self):
+        return len(self.datetime)
+
+    def append(self, dt, cash, value, fundvalue):
+        """Adds the state of a bar to the curve
+
+        :param dt: strategy datetime as a float
+        :param cash:
+        :param value:
+        :param fundvalue:
+
+        """
+        self.datetime.append(dt)
+        self.cash.append(cash)
+        self.value.append(value)
+        self.fundvalue.append(fundvalue)
+
+    def values(self, fundmode=False):
+        """Returns the array with the portfolio values or with the fund values
+        if ``fundmode`` is ``True``
+
+        :param fundmode:  (Default value = False)
+
+        """
+        return self.fundvalue if fundmode else self.value
@@ -217,6 +217,11 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase, dataseries.OHLCDateT
 
     _started = False
 
+    # Set to True by live feeds which call ``_wakeup`` as soon as data arrives
+    # (see ``setwakeup``). Others are polled every ``qcheck`` by ``run_async``
+    _asyncwakeup = False
+    _wakeup = None
+
     def _start_finish(self):
         """ """
         # A live feed (for example) may have learnt something about the
@@ -342,6 +347,17 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase, dataseries.OHLCDateT
         qwait = max(0.0, qwait - qlapse)
         self._qcheck = qwait
 
+    def setwakeup(self, wakeup):
+        """Installs (or removes with ``None``) the callable which wakes up
+        ``Cerebro.run_async`` when new data or notifications arrive. It can be
+        called from any thread. While installed the feed must not block waiting
+        for data
+
+        :param wakeup:
+
+        """
+        self._wakeup = wakeup
+
     def islive(self):
         """If this returns True, ``Cerebro`` will deactivate ``preload`` and
         ``runonce`` because a live data source must be fetched tick by tick (or
@@ -362,6 +378,8 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase, dataseries.OHLCDateT
         if self._laststatus != status:
             self.notifs.append((status, args, kwargs))
             self._laststatus = status
+            if self._wakeup is not None:
+                self._wakeup()
 
     def get_notifications(self):
         """ """
@@ -25,6 +25,7 @@ from __future__ import (
     unicode_literals,
 )
 
+import collections
 import datetime
 import threading
 import time
@@ -34,6 +35,7 @@ from backtrader import TimeFrame, date2num, num2date
 from backtrader.commissions.ibcommission import IBCommInfo
 from backtrader.feed import DataBase
 from backtrader.stores import ibstore_insync
+from backtrader.utils.latency import latency
 from backtrader.utils.py3 import (
     integer_types,
     string_types,
@@ -42,6 +44,49 @@ from backtrader.utils.py3 import (
 from dateutil.relativedelta import relativedelta
 
 
+# Returned by IBData._getlive when no live message arrived within qcheck
+_NOLIVE = object()
+
+# Real-time volume made from the trades of a market data Ticker
+_RTVolume = collections.namedtuple("_RTVolume", "datetime price size")
+
+# Tick types of the trades in ``Ticker.ticks``: RTVolume / RT trade volume (if
+# requested, the same trades are also reported as last) and last / delayed last
+_RTVOLTICKS = (48, 77)
+_LASTTICKS = (4, 68)
+
+
+class _LiveTick(object):
+    """Adapts the ``tickByTicks`` entries of a ``Ticker`` to the interface
+    expected by ``IBData._load_rtticks`` (``dataType`` and ``datetime``)"""
+
+    __slots__ = ("dataType", "datetime", "tick")
+
+    def __init__(self, tick):
+        """
+
+        :param tick:
+
+        """
+        if hasattr(tick, "midPoint"):
+            self.dataType = "RT_TICK_MIDPOINT"
+        elif hasattr(tick, "bidPrice"):
+            self.dataType = "RT_TICK_BID_ASK"
+        else:
+            self.dataType = "RT_TICK_LAST"
+
+        self.datetime = tick.time
+        self.tick = tick
+
+    def __getattr__(self, name):
+        """
+
+        :param name:
+
+        """
+        return getattr(self.tick, name)
+
+
 class MetaIBData(DataBase.__class__):
     """ """
 
@@ -181,6 +226,9 @@ class IBData(with_metaclass(MetaIBData, DataBase)):
     # _store = ibstore.IBStore
     _store = ibstore_insync.IBStoreInsync
 
+    # the live callbacks call the wakeup of ``Cerebro.run_async``
+    _asyncwakeup = True
+
     # Minimum size supported by real-time bars
     RTBAR_MINSIZE = (TimeFrame.Seconds, 5)
 
@@ -244,7 +292,10 @@ class IBData(with_metaclass(MetaIBData, DataBase)):
         self.pretradecontract = self.parsecontract(self.p.tradename)
         self.constractStartDate = None  # 用于保存合约开始日期，data/datetime
         self.commission = None  # 用于保存数据对应的佣金信息,在生成对应合同时初始化
-        self._lock_q = threading.Condition()  # sync access to qlive
+        self._lock_q = threading.Condition()  # sync access to _qlive
+        self._qlive = collections.deque()  # (arrival time, origin, live message)
+        self._livestamp = 0.0  # arrival time of the last delivered message
+        self._liveorigin = None  # socket receive time of it (latency enabled)
 
     def caldate(self):
         """ """
@@ -432,6 +483,7 @@ class IBData(with_metaclass(MetaIBData, DataBase)):
         # Kickstart store and get queue to wait on
         self.qlive = self.ib.start(data=self)
         self.qhist = None
+        self._histtask = None  # pending paced historical request
 
         self._usertvol = not self.p.rtbar
         tfcomp = (self._timeframe, self._compression)
@@ -453,6 +505,7 @@ class IBData(with_metaclass(MetaIBData, DataBase)):
         self._statelivereconn = False  # if reconnecting in live state
         self._subcription_valid = False  # subscription state
         self._storedmsg = dict()  # keep pending live message (under None)
+        self._qlive.clear()
 
         if not self.ib.isConnected():
             return
@@ -504,10 +557,13 @@ class IBData(with_metaclass(MetaIBData, DataBase)):
         if self.contract is None or self._subcription_valid:
             return
 
+        # The subscription callbacks move the incoming messages to _qlive
         if self._usertvol and self._timeframe != bt.TimeFrame.Ticks:
             self.qlive = self.ib.reqMktData(self.contract, self.p.what)
+            self.qlive.updateEvent += self.ontickerupdate
         elif self._usertvol and self._timeframe == bt.TimeFrame.Ticks:
             self.qlive = self.ib.reqTickByTickData(self.contract, self.p.what)
+            self.qlive.updateEvent += self.ontickerupdate
         else:
             self.qlive = self.ib.reqRealTimeBars(
                 contract=self.contract,
@@ -534,7 +590,7 @@ class IBData(with_metaclass(MetaIBData, DataBase)):
 
     def haslivedata(self):
         """ """
-        return bool(self._storedmsg or self.qlive)
+        return bool(self._storedmsg or self._qlive)
 
     def updatelivedata(self, step=0, bars=None, hist=True):
         """
@@ -577,9 +633,92 @@ class IBData(with_metaclass(MetaIBData, DataBase)):
                 # 有2个以上数据,按timeframe频率更新，避免频率重复调用,一直更新到倒数第2个数据，仅保存最后一个数据:-1不包含-1，只到-2
                 self.updatelivedata(newdatalen - 1, bars[:-1])
                 bars[:] = bars[-1:]
-        else:
+        elif bars:
+            # real-time bars: hand them over to _load and keep the list empty
+            msgs = bars[:]
+            del bars[:]
+            self._livepush(msgs)
+
+    def ontickerupdate(self, ticker):
+        """Callback of the market data and tick-by-tick subscriptions
+
+        :param ticker:
+
+        """
+        if self._timeframe == bt.TimeFrame.Ticks:
+            self._livepush([_LiveTick(tick) for tick in ticker.tickByTicks])
+            return
+
+        # only the trades of this update: bid/ask updates leave ticker.last in
+        # place and must not replay the previous trade
+        ticks = ticker.ticks
+        trades = [t for t in ticks if t.tickType in _RTVOLTICKS and t.size]
+        if not trades:
+            trades = [t for t in ticks if t.tickType in _LASTTICKS and t.size]
+        self._livepush([_RTVolume(t.time, t.price, t.size) for t in trades])
+
+    def _livepush(self, msgs):
+        """Queues live messages, stamped with their arrival time, and wakes up
+        a ``_load`` waiting for them
+
+        :param msgs:
+
+        """
+        if not msgs:
+            return
+
+        stamp = time.perf_counter()
+        origin = None
+        if latency.enabled:
+            latency.stamp("enqueue")
+            origin = latency.origin()
+        with self._lock_q:
+            self._qlive.extend((stamp, origin, msg) for msg in msgs)
+            self._lock_q.notify()
+        if self._wakeup is not None:
+            self._wakeup()
+
+    def _waitlive(self, timeout):
+        """Waits at most ``timeout`` seconds for a live message. The network
+        events are processed by the event loop of the store, which returns as
+        soon as any update arrives, instead of sleeping a fixed amount of time
+
+        :param timeout:
+
+        """
+        deadline = time.perf_counter() + timeout
+        try:
+            self.ib.sleep(0)  # deliver what is already in the socket buffers
+            while not self._qlive:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0.0:
+                    break
+                self.ib.waitOnUpdate(timeout=remaining)
+        except RuntimeError:
+            # the event loop is running in another thread: wait for the
+            # callbacks to notify the arrival
             with self._lock_q:
-                self._lock_q.notify()
+                if not self._qlive:
+                    self._lock_q.wait(max(0.0, deadline - time.perf_counter()))
+
+    def _getlive(self):
+        """Returns the next live message or ``_NOLIVE`` if none arrived within
+        ``qcheck`` seconds. The arrival time of the returned message is kept
+        in ``_livestamp`` (``time.perf_counter`` clock)
+
+
+        """
+        if not self._qlive and self._wakeup is None:
+            # under run_async the event loop delivers the callbacks while the
+            # engine awaits: never block it here
+            self._waitlive(self._qcheck)
+
+        with self._lock_q:
+            if not self._qlive:
+                return _NOLIVE
+            self._livestamp, self._liveorigin, msg = self._qlive.popleft()
+
+        return msg
 
     def _load(self):
         """ """
@@ -588,16 +727,9 @@ class IBData(with_metaclass(MetaIBData, DataBase)):
 
         while True:
             if self._state == self._ST_LIVE:
-                time.time()
-                with self._lock_q:
-                    if len(self.qlive) == 0:
-                        self.ib.sleep(1)
-                        self._lock_q.wait(timeout=self._qcheck)
-                    try:
-                        msg = self.qlive.pop(0)
-                    except Exception:
-                        # print("_load live data Exception:", e)
-                        return None
+                msg = self._getlive()
+                if msg is _NOLIVE:
+                    return None
 
                 if msg is None:  # Conn broken during historical/backfilling
                     self._subcription_valid = False
@@ -663,7 +795,7 @@ class IBData(with_metaclass(MetaIBData, DataBase)):
                 # Process the message according to expected return type
                 if not self._statelivereconn:
                     if self._laststatus != self.LIVE:
-                        if len(self.qlive) <= 1:  # very short live queue
+                        if len(self._qlive) <= 1:  # very short live queue
                             self.put_notification(self.LIVE)
 
                     if self._usertvol and self._timeframe != bt.TimeFrame.Ticks:
@@ -673,6 +805,9 @@ class IBData(with_metaclass(MetaIBData, DataBase)):
                     else:
                         ret = self._load_rtbar(msg)
                     if ret:
+                        if latency.enabled:
+                            latency.setorigin(self._liveorigin, self._livestamp)
+                            latency.stamp("load")
                         return True
 
                     # could not load bar ... go and get new one
@@ -688,33 +823,15 @@ class IBData(with_metaclass(MetaIBData, DataBase)):
                 dtend = None
                 dtend = msg.datetime if self._usertvol else msg.time
 
-                self.qhist = self.ib.reqHistoricalData(
-                    contract=self.contract,
-                    endDateTime=dtend,
-                    durationStr=self.p.durationStr,
-                    barSizeSetting=self.p.barSizeSetting,
-                    whatToShow=self.p.what,
-                    useRTH=self.p.useRTH,
-                    formatDate=self.p.formatDate,
-                    keepUpToDate=self.p.keepUpToDate,
-                )
-                self.qhist.updateEvent += self.onliveupdate
-
-                self.p.fromdate = self.qhist[0].date
-                self.p.todate = self.qhist[-1].date
-                if isinstance(self.p.fromdate, datetime.date):
-                    self.p.fromdate = datetime.datetime.combine(
-                        self.p.fromdate, datetime.time()
-                    )
-                if isinstance(self.p.todate, datetime.date):
-                    self.p.todate = datetime.datetime.combine(
-                        self.p.todate, datetime.time()
-                    )
+                self._reqhist(dtend)
                 self._state = self._ST_HISTORBACK
                 self._statelivereconn = False  # no longer in live
                 continue
 
             elif self._state == self._ST_HISTORBACK:
+                if not self._histready():
+                    return None  # run_async: the bars are still arriving
+
                 if len(self.qhist) > 0:
                     msg = self.qhist.pop(0)
                     if len(self.qhist) == 0:
@@ -821,30 +938,17 @@ class IBData(with_metaclass(MetaIBData, DataBase)):
                     useRTH=self.p.useRTH,
                     tz=self._tz,
                 )
+                assert len(self.qhist) > 0
+                self._sethistdates()
+            elif self.fromdate > float("-inf"):
+                # a period: split in requests which run concurrently
+                dtend = ""
+                if self.todate < float("inf"):
+                    dtend = num2date(self.todate)
+                self._reqhist(dtend, begindate=num2date(self.fromdate))
             else:
-                self.qhist = self.ib.reqHistoricalData(
-                    contract=self.contract,
-                    endDateTime=self.p.todate,
-                    durationStr=self.p.durationStr,
-                    barSizeSetting=self.p.barSizeSetting,
-                    whatToShow=self.p.what,
-                    useRTH=self.p.useRTH,
-                    formatDate=self.p.formatDate,
-                    keepUpToDate=self.p.keepUpToDate,
-                )
-                self.qhist.updateEvent += self.onliveupdate
-
-            assert len(self.qhist) > 0
-            self.p.fromdate = self.qhist[0].date
-            self.p.todate = self.qhist[-1].date
-            if isinstance(self.p.fromdate, datetime.date):
-                self.p.fromdate = datetime.datetime.combine(
-                    self.p.fromdate, datetime.time()
-                )
-            if isinstance(self.p.todate, datetime.date):
-                self.p.todate = datetime.datetime.combine(
-                    self.p.todate, datetime.time()
-                )
+                self._reqhist(self.p.todate)
+
             self._state = self._ST_HISTORBACK
             return True  # continue before
 
@@ -861,6 +965,95 @@ class IBData(with_metaclass(MetaIBData, DataBase)):
         self._state = self._ST_LIVE
         return True  # no return before - implicit continue
 
+    def _reqhist(self, enddate, begindate=None):
+        """Requests the historical bars up to ``enddate`` (since ``begindate``
+        or else for ``durationStr``) through the paced scheduler of the store
+        without waiting for them. The requests of all the datas run
+        concurrently and ``_load`` picks up the bars when they are needed
+
+        :param enddate:
+        :param begindate:  (Default value = None)
+
+        """
+        if self.p.keepUpToDate:
+            # the update subscription is bound to a single blocking request
+            self._sethist(
+                self.ib.reqHistoricalData(
+                    contract=self.contract,
+                    endDateTime=enddate,
+                    durationStr=self.p.durationStr,
+                    barSizeSetting=self.p.barSizeSetting,
+                    whatToShow=self.p.what,
+                    useRTH=self.p.useRTH,
+                    formatDate=self.p.formatDate,
+                    keepUpToDate=True,
+                )
+            )
+            return
+
+        self.qhist = None
+        self._histtask = self.ib.reqHistoricalDataPaced(
+            contract=self.contract,
+            endDateTime=enddate,
+            durationStr=self.p.durationStr,
+            barSizeSetting=self.p.barSizeSetting,
+            whatToShow=self.p.what,
+            useRTH=self.p.useRTH,
+            formatDate=self.p.formatDate,
+            begindate=begindate,
+        )
+        self._histtask.add_done_callback(self._histdone)
+
+    def _histdone(self, task):
+        """Wakes up ``Cerebro.run_async`` when the historical bars are there
+
+        :param task:
+
+        """
+        if self._wakeup is not None:
+            self._wakeup()
+
+    def _histready(self):
+        """Returns ``True`` once the requested historical bars are in
+        ``qhist``, waiting for them unless running under ``run_async``
+
+
+        """
+        if self.qhist is not None:
+            return True
+
+        task = self._histtask
+        if not task.done():
+            if self._wakeup is not None:
+                return False  # _histdone will wake up the engine
+            self.ib.waitHistoricalData(task)
+
+        self._histtask = None
+        self._sethist(task.result())
+        return True
+
+    def _sethist(self, bars):
+        """
+
+        :param bars:
+
+        """
+        self.qhist = bars
+        self.qhist.updateEvent += self.onliveupdate
+        if bars:
+            self._sethistdates()
+
+    def _sethistdates(self):
+        """Sets fromdate/todate to the period of the historical bars"""
+        self.p.fromdate = self.qhist[0].date
+        self.p.todate = self.qhist[-1].date
+        if isinstance(self.p.fromdate, datetime.date):
+            self.p.fromdate = datetime.datetime.combine(
+                self.p.fromdate, datetime.time()
+            )
+        if isinstance(self.p.todate, datetime.date):
+            self.p.todate = datetime.datetime.combine(self.p.todate, datetime.time())
+
     def _load_rtbar(self, rtbar, hist=False):
         """
 
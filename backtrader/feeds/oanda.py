@@ -180,7 +180,9 @@ class OandaData(with_metaclass(MetaOandaData, DataBase)):
             self._state = self._ST_HISTORBACK
             return True
 
-        self.qlive = self.o.streaming_prices(self.p.dataname, tmout=tmout)
+        self.qlive = self.o.streaming_prices(
+            self.p.dataname, tmout=tmout, q=None if instart else self.qlive
+        )
         if instart:
             self._statelivereconn = self.p.backfill_start
         else:
@@ -54,6 +54,7 @@ class LaguerreRSI(PeriodN):
     plotinfo = dict(plotymargin=0.15, plotyticks=[0.0, 0.2, 0.5, 0.8, 1.0])
 
     l0, l1, l2, l3 = 0.0, 0.0, 0.0, 0.0
+    warmattrs = ("l0", "l1", "l2", "l3")  # intermediate values for WarmStart
 
     def next(self):
         """ """
@@ -104,6 +105,7 @@ class LaguerreFilter(PeriodN):
     plotinfo = dict(subplot=False)
 
     l0, l1, l2, l3 = 0.0, 0.0, 0.0, 0.0
+    warmattrs = ("l0", "l1", "l2", "l3")  # intermediate values for WarmStart
 
     def next(self):
         """ """
@@ -73,6 +73,8 @@ class ParabolicSAR(PeriodN):
         ("afmax", 0.20),
     )
 
+    warmattrs = ("_status",)  # state of the trend for WarmStart
+
     plotinfo = dict(subplot=False)
     plotlines = dict(
         psar=dict(marker=".", markersize=4.0, color="black", fillstyle="full", ls=""),
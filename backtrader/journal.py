@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import collections
+import io
+import struct
+import threading
+
+from .metabase import MetaParams
+from .utils.py3 import with_metaclass
+
+__all__ = ["Journal", "JournalRecord", "JournalFill", "readjournal"]
+
+JOURNAL_MAGIC = b"BTJ1"
+
+# Record layouts (little endian, no padding). Each record starts with a byte
+# indicating the kind so that a reader can find the size of the rest
+#   order state: ref, dataid, status, ordtype, exectype, dt, size, price,
+#                executed size, executed price, executed comm
+#   fill:        ref, dt, size, price, value, comm, pnl, psize, pprice
+_KIND_STATE, _KIND_FILL = 0, 1
+_STATE = struct.Struct("<BIiBBBdddddd")
+_FILL = struct.Struct("<BIdddddddd")
+
+JournalRecord = collections.namedtuple(
+    "JournalRecord",
+    "ref dataid status ordtype exectype dt size price exsize exprice excomm",
+)
+
+JournalFill = collections.namedtuple(
+    "JournalFill", "ref dt size price value comm pnl psize pprice"
+)
+
+
+class Journal(with_metaclass(MetaParams, object)):
+    """Append-only binary journal of order notifications
+
+    Each order notification delivered by the broker is packed into a compact
+    fixed-size record (plus one record per execution bit contained in the
+    notification) and put into a ``collections.deque``. Appending to and
+    popping from a deque are atomic operations and no lock is taken in the
+    bar loop.
+
+    A background thread wakes up every ``flushsecs`` (or as soon as
+    ``batch`` records are waiting) and writes all pending records to the file
+    in a single operation. Nothing but the records waiting for the next flush
+    is kept in memory.
+
+    The records can be read back with ``readjournal``
+
+    Params:
+
+      - ``filename`` (default: ``None``): name of the file to which records
+        will be appended. It is created if it does not exist
+
+      - ``flushsecs`` (default: ``1.0``): maximum number of seconds a record
+        stays in memory before being written out
+
+      - ``batch`` (default: ``1024``): number of pending records which
+        triggers an early flush
+
+      - ``fsync`` (default: ``False``): call ``os.fsync`` after each flush to
+        force the data to disk
+
+    """
+
+    params = (
+        ("filename", None),
+        ("flushsecs", 1.0),
+        ("batch", 1024),
+        ("fsync", False),
+    )
+
+    def __init__(self):
+        """ """
+        self._queue = collections.deque()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._fd = None
+        self._running = False
+
+    def start(self):
+        """Opens the file and starts the flushing thread"""
+        if self._running:
+            return
+
+        self._fd = io.open(self.p.filename, "ab")
+        if not self._fd.tell():  # new file - mark the format
+            self._fd.write(JOURNAL_MAGIC)
+
+        self._running = True
+        self._wakeup.clear()
+        self._thread = threading.Thread(target=self._t_flush, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the flushing thread, writes pending records and closes the
+        file"""
+        if not self._running:
+            return
+
+        self._running = False
+        self._wakeup.set()
+        self._thread.join()
+        self._thread = None
+
+        self._flush()  # anything added after the thread exited
+        self._fd.close()
+        self._fd = None
+
+    def put(self, order, dt=None):
+        """Packs the notified ``order`` (a clone delivered by the broker) and
+        its pending execution bits and queues them for writing
+
+        :param order:
+        :param dt:  (Default value = None) datetime (float) of the state
+          change. If ``None`` the current datetime of the order data is used
+
+        """
+        if not self._running:
+            return  # not started (ex: optimization runs) - nothing drains it
+
+        if dt is None:
+            data = order.data
+            dt = data.datetime[0] if len(data) else order.created.dt or 0.0
+
+        executed = order.executed
+        q = self._queue
+        q.append(
+            _STATE.pack(
+                _KIND_STATE,
+                order.ref,
+                getattr(order.data, "_id", None) or -1,
+                order.status,
+                order.ordtype,
+                order.exectype or 0,
+                dt,
+                order.created.size,
+                order.created.price or 0.0,
+                executed.size,
+                executed.price,
+                executed.comm,
+            )
+        )
+
+        for exbit in executed.iterpending():
+            q.append(
+                _FILL.pack(
+                    _KIND_FILL,
+                    order.ref,
+                    exbit.dt,
+                    exbit.size,
+                    exbit.price,
+                    exbit.value,
+                    exbit.comm,
+                    exbit.pnl,
+                    exbit.psize,
+                    exbit.pprice,
+                )
+            )
+
+        if len(q) >= self.p.batch:
+            self._wakeup.set()
+
+    def _t_flush(self):
+        """Thread body: flush the queue periodically or on demand"""
+        while self._running:
+            self._wakeup.wait(self.p.flushsecs)
+            self._wakeup.clear()
+            self._flush()
+
+    def _flush(self):
+        """Writes out all pending records"""
+        q = self._queue
+        chunks = list()
+        try:
+            while True:
+                chunks.append(q.popleft())
+        except IndexError:
+            pass
+
+        if chunks:
+            self._fd.write(b"".join(chunks))
+            self._fd.flush()
+            if self.p.fsync:
+                import os  # keep the import local, seldom used
+
+                os.fsync(self._fd.fileno())
+
+
+def readjournal(filename):
+    """Generator which returns the records of a journal file in the order
+    they were written. Order state changes are returned as ``JournalRecord``
+    and execution bits as ``JournalFill`` instances
+
+    :param filename:
+
+    """
+    structs = {_KIND_STATE: _STATE, _KIND_FILL: _FILL}
+    with io.open(filename, "rb") as f:
+        if f.read(len(JOURNAL_MAGIC)) != JOURNAL_MAGIC:
+            raise ValueError("%s is not a journal file" % filename)
+
+        while True:
+            kind = f.read(1)
+            if not kind:
+                break
+
+            rstruct = structs.get(ord(kind))
+            if rstruct is None:
+                break  # unknown record - stop
+
+            rec = f.read(rstruct.size - 1)
+            if len(rec) < rstruct.size - 1:
+                break  # incomplete write - stop
+
+            fields = rstruct.unpack(kind + rec)[1:]
+            if rstruct is _STATE:
+                yield JournalRecord(*fields)
+            else:
+                yield JournalFill(*fields)
@@ -33,6 +33,7 @@ from .linebuffer import LineActions, LineNum
 from .lineroot import LineRoot, LineSingle
 from .lineseries import LineSeries, LineSeriesMaker
 from .utils import DotDict
+from .utils.latency import latency
 from .utils.py3 import range, string_types, with_metaclass, zip
 
 
@@ -181,6 +182,10 @@ class LineIterator(with_metaclass(MetaLineIterator, LineSeries)):
     _mindatas = 1
     _ltype = LineSeries.IndType
 
+    # attributes (not lines) holding state across bars, saved and restored by
+    # WarmStart together with the lines
+    warmattrs = ()
+
     plotinfo = dict(
         plot=True,
         subplot=True,
@@ -324,7 +329,12 @@ class LineIterator(with_metaclass(MetaLineIterator, LineSeries)):
             # supporting datas with different lengths
             minperstatus = self._getminperstatus()
             if minperstatus < 0:
-                self.next()
+                if latency.enabled:
+                    latency.stamp("next_enter")
+                    self.next()
+                    latency.stamp("next_exit")
+                else:
+                    self.next()
             elif minperstatus == 0:
                 self.nextstart()  # only called for the 1st value
             else:
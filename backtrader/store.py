@@ -62,6 +62,7 @@ class Store(with_metaclass(MetaSingleton, object)):
     """Base class for all Stores"""
 
     _started = False
+    _wakeup = None
 
     params = ()
 
@@ -127,6 +128,18 @@ class Store(with_metaclass(MetaSingleton, object)):
 
         """
         self.notifs.append((msg, args, kwargs))
+        if self._wakeup is not None:
+            self._wakeup()
+
+    def setwakeup(self, wakeup):
+        """Installs (or removes with ``None``) the callable which wakes up
+        ``Cerebro.run_async`` when a notification is put. It can be called from
+        any thread
+
+        :param wakeup:
+
+        """
+        self._wakeup = wakeup
 
     def get_notifications(self):
         """ """
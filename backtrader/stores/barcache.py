@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import array
+import bisect
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+NAN = float("NaN")
+
+_MAGIC = b"BTBARS1\n"
+
+
+class BarCache(object):
+    """On-disk cache of historical bars shared by the stores
+
+    The bars of each key (store, instrument, bar size, what to show, trading
+    hours ... as chosen by the store) are kept in a columnar file: a json
+    header followed by each column as an array of doubles. ``datetime`` holds
+    the bar timestamps in seconds since the epoch (UTC) and the other columns
+    are numeric fields of the bars. The header records the period already
+    covered, so that only the missing head or tail of a request is fetched
+
+    The last bars of a period which ends within ``settle`` seconds of the
+    time it was fetched may still change (a bar in progress): such a period
+    is only taken as covered up to its last bar, which is fetched again
+
+    Usage by a store, with ``fetch(begin, end)`` returning the columns::
+
+      bars = cache.get(key, begin, end, fetch)
+
+    or step by step (e.g. with asynchronous requests)::
+
+      for b, e in cache.missing(key, begin, end):
+          cache.update(key, b, e, fetch(b, e))
+      bars = cache.read(key, begin, end)
+
+    :param path: directory of the files (Default value = None: the
+        ``BT_BARCACHE`` environment variable or ``~/.backtrader/barcache``)
+    :param settle: seconds after which bars are final (Default value = 86400)
+
+    """
+
+    def __init__(self, path=None, settle=86400.0):
+        """ """
+        if path is None:
+            path = os.environ.get("BT_BARCACHE") or os.path.join(
+                os.path.expanduser("~"), ".backtrader", "barcache"
+            )
+        self.path = path
+        self.settle = settle
+        self._loaded = dict()  # filename -> (mtime, header, columns)
+
+    @classmethod
+    def create(cls, barcache):
+        """Returns the cache for the ``barcache`` parameter of a store:
+        ``None``/``False`` (no cache), ``True`` (default directory), a
+        directory or a ``BarCache`` instance
+
+        :param barcache:
+
+        """
+        if not barcache:
+            return None
+        if isinstance(barcache, BarCache):
+            return barcache
+        if barcache is True:
+            return cls()
+        return cls(path=barcache)
+
+    def filename(self, key):
+        """Returns the file holding the bars of ``key`` (a tuple of values)
+
+        :param key:
+
+        """
+        text = json.dumps([str(k) for k in key])
+        name = "_".join(str(k) for k in key)
+        name = "".join(c if c.isalnum() or c in "-." else "_" for c in name)
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.path, "%s_%s.bars" % (name[:80], digest))
+
+    def _load(self, key):
+        """Returns ``(header, columns)`` of ``key`` or ``(None, None)``
+
+        :param key:
+
+        """
+        fname = self.filename(key)
+        try:
+            mtime = os.stat(fname).st_mtime
+        except OSError:
+            return None, None
+
+        cached = self._loaded.get(fname)
+        if cached is not None and cached[0] == mtime:
+            return cached[1], cached[2]
+
+        with open(fname, "rb") as f:
+            data = f.read()
+
+        if not data.startswith(_MAGIC):
+            return None, None  # not a cache file: ignore it
+
+        hend = data.index(b"\n", len(_MAGIC))
+        header = json.loads(data[len(_MAGIC) : hend].decode("utf-8"))
+        count = header["count"]
+        offset = hend + 1
+        columns = dict()
+        for name in header["columns"]:
+            column = array.array(str("d"))
+            column.frombytes(data[offset : offset + 8 * count])
+            if header["byteorder"] != sys.byteorder:
+                column.byteswap()
+            columns[name] = column
+            offset += 8 * count
+
+        self._loaded[fname] = (mtime, header, columns)
+        return header, columns
+
+    def _save(self, key, header, columns):
+        """Writes the file of ``key`` (replacing it at once)
+
+        :param key:
+        :param header:
+        :param columns:
+
+        """
+        fname = self.filename(key)
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+        names = ["datetime"] + sorted(n for n in columns if n != "datetime")
+        header = dict(
+            header,
+            columns=names,
+            count=len(columns["datetime"]),
+            byteorder=sys.byteorder,
+        )
+        fd, tmpname = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_MAGIC)
+                f.write(json.dumps(header).encode("utf-8") + b"\n")
+                for name in names:
+                    f.write(columns[name].tobytes())
+            os.replace(tmpname, fname)
+        except BaseException:
+            os.remove(tmpname)
+            raise
+
+        self._loaded.pop(fname, None)
+
+    def missing(self, key, begin, end):
+        """Returns the periods ``[(begin, end)]`` of a request which are not in
+        the cache: everything, the head and/or the tail or nothing.
+        ``begin=None`` asks for the bars the broker gives by default, which the
+        cache satisfies if it holds anything
+
+        :param key:
+        :param begin: seconds since the epoch or ``None``
+        :param end: seconds since the epoch or ``None`` (now)
+
+        """
+        end = time.time() if end is None else end
+        header, _ = self._load(key)
+        if header is None:
+            return [(begin, end)]
+
+        periods = list()
+        if begin is not None and begin < header["begin"]:
+            periods.append((begin, header["begin"]))
+        if end > header["end"]:
+            periods.append((header["end"], end))
+        return periods
+
+    def update(self, key, begin, end, columns):
+        """Adds the bars fetched for the period ``[begin, end]``. Fetched bars
+        replace cached bars with the same datetime
+
+        :param key:
+        :param begin: seconds since the epoch or ``None``
+        :param end: seconds since the epoch or ``None`` (now)
+        :param columns: dict of sequences with a ``datetime`` column
+
+        """
+        now = time.time()
+        end = now if end is None else end
+        new = dict((n, array.array(str("d"), c)) for n, c in columns.items())
+        dts = new.get("datetime")
+        if dts is None:
+            new["datetime"] = dts = array.array(str("d"))
+
+        if begin is None:  # the broker chose the start
+            begin = dts[0] if dts else end
+        if end > now - self.settle:  # the last bars may still change
+            end = min(end, max(dts)) if dts else begin
+
+        header, old = self._load(key)
+        if header is not None:
+            merged = _merge(old, new)
+            begin = min(begin, header["begin"])
+            end = max(end, header["end"])
+        else:
+            merged = _merge(dict(datetime=array.array(str("d"))), new)
+
+        self._save(key, dict(begin=begin, end=end), merged)
+
+    def read(self, key, begin, end):
+        """Returns the cached bars of ``[begin, end]`` as a dict of columns
+        (``array('d')``), empty if nothing is cached
+
+        :param key:
+        :param begin: seconds since the epoch or ``None`` (from the first)
+        :param end: seconds since the epoch or ``None`` (up to the last)
+
+        """
+        _, columns = self._load(key)
+        if columns is None:
+            return dict(datetime=array.array(str("d")))
+
+        dts = columns["datetime"]
+        lo = 0 if begin is None else bisect.bisect_left(dts, begin)
+        hi = len(dts) if end is None else bisect.bisect_right(dts, end)
+        return dict((name, column[lo:hi]) for name, column in columns.items())
+
+    def get(self, key, begin, end, fetch):
+        """Returns the bars of ``[begin, end]`` calling ``fetch(begin, end)``
+        (which returns a dict of columns) only for the missing periods
+
+        :param key:
+        :param begin: seconds since the epoch or ``None``
+        :param end: seconds since the epoch or ``None`` (now)
+        :param fetch:
+
+        """
+        for b, e in self.missing(key, begin, end):
+            self.update(key, b, e, fetch(b, e))
+        return self.read(key, begin, end)
+
+
+def _merge(old, new):
+    """Merges two sets of columns sorted by datetime. The rows of ``new`` win
+    over rows of ``old`` with the same datetime. Columns missing in one of
+    them are filled with NaN
+
+    :param old:
+    :param new:
+
+    """
+    rows = dict()
+    for source in (old, new):
+        for i, dt in enumerate(source["datetime"]):
+            rows[dt] = (source, i)
+
+    order = sorted(rows)
+    names = set(old) | set(new)
+    merged = dict()
+    for name in names:
+        column = array.array(str("d"))
+        for dt in order:
+            source, i = rows[dt]
+            values = source.get(name)
+            column.append(NAN if values is None else values[i])
+        merged[name] = column
+    return merged
@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import socket
+import struct
+import threading
+import time
+
+_MAGIC = b"BTCAP1\n"
+
+# each record: arrival time, length of the channel, length of the payload
+_RECORD = struct.Struct(str("<dHI"))
+
+
+class CaptureWriter(object):
+    """Records a live inbound message stream with the arrival time of each
+    chunk, to be replayed offline (``readcapture``, ``replay`` and
+    ``ReplayServer``)
+
+    The payload is recorded as received (e.g. the raw bytes of a socket); the
+    channel (bytes) tells apart several streams in one capture (e.g. the
+    callbacks of each subscription). ``write`` can be called from any thread
+
+    :param path: file of the capture (overwritten)
+    :param clock: source of the arrival times (Default value = time.time)
+
+    """
+
+    def __init__(self, path, clock=time.time):
+        """ """
+        self.path = path
+        self.clock = clock
+        self.count = 0
+        self._lock = threading.Lock()
+        self._f = open(path, "wb")
+        self._f.write(_MAGIC)
+
+    def write(self, payload, channel=b""):
+        """Records ``payload`` (bytes) arrived now on ``channel``
+
+        :param payload:
+        :param channel:  (Default value = b"")
+
+        """
+        record = _RECORD.pack(self.clock(), len(channel), len(payload))
+        with self._lock:
+            if self._f is None:
+                return  # closed
+            self._f.write(record)
+            self._f.write(channel)
+            self._f.write(payload)
+            self.count += 1
+
+    def flush(self):
+        """ """
+        with self._lock:
+            if self._f is not None:
+                self._f.flush()
+
+    def close(self):
+        """ """
+        with self._lock:
+            if self._f is not None:
+                self._f.close()
+                self._f = None
+
+    def __enter__(self):
+        """ """
+        return self
+
+    def __exit__(self, *args):
+        """ """
+        self.close()
+
+
+def readcapture(path, channel=None):
+    """Generates the records of a capture as ``(time, channel, payload)``
+
+    :param path:
+    :param channel: only the records of this channel (Default value = None:
+        all)
+
+    """
+    with open(path, "rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError("%s is not a capture" % path)
+
+        while True:
+            header = f.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                break  # end (or a record cut by the end of the recording)
+
+            ts, clen, plen = _RECORD.unpack(header)
+            rchannel = f.read(clen)
+            payload = f.read(plen)
+            if len(payload) < plen:
+                break
+
+            if channel is None or rchannel == channel:
+                yield ts, rchannel, payload
+
+
+class _Pacer(object):
+    """Waits until the time of each record, scaled by ``speed`` from the time
+    of the first one (``speed`` 0: no waiting)"""
+
+    def __init__(self, speed, stop=None):
+        """ """
+        self.speed = speed
+        self.stop = stop
+        self._t0 = self._r0 = None
+
+    def wait(self, ts):
+        """Waits for the record of time ``ts``. Returns ``False`` if stopped
+
+        :param ts:
+
+        """
+        if self._r0 is None:
+            self._t0, self._r0 = time.time(), ts
+
+        if self.speed:
+            delay = self._t0 + (ts - self._r0) / self.speed - time.time()
+            if delay > 0:
+                if self.stop is not None:
+                    return not self.stop.wait(delay)
+                time.sleep(delay)
+
+        return self.stop is None or not self.stop.is_set()
+
+
+def replay(path, callback, speed=1.0, channel=None, stop=None):
+    """Calls ``callback(payload)`` with the records of a capture at the
+    recorded pace (scaled by ``speed``: 0 as fast as possible). Returns the
+    number of records delivered
+
+    :param path:
+    :param callback:
+    :param speed:  (Default value = 1.0)
+    :param channel: only this channel (Default value = None: all)
+    :param stop: ``threading.Event`` to stop the replay (Default value = None)
+
+    """
+    pacer = _Pacer(speed, stop)
+    count = 0
+    for ts, _, payload in readcapture(path, channel):
+        if not pacer.wait(ts):
+            break
+        callback(payload)
+        count += 1
+
+    return count
+
+
+class ReplayServer(object):
+    """Serves a capture of a socket stream (e.g. recorded by the IB
+    ``Connection``) on a local socket, to run the live code paths offline
+
+    For each connection the server waits for the first bytes of the client
+    (the API handshake) and then sends the recorded chunks at the recorded
+    pace (scaled by ``speed``: 0 as fast as possible). The rest of what the
+    client sends is read and ignored: the session is deterministic as long as
+    the client sends the same requests (same request ids) as when recorded
+
+    :param path: capture file
+    :param address: ``(host, port)`` (Default value = ("127.0.0.1", 0): the
+        port is chosen by the system, see ``address``)
+    :param speed:  (Default value = 1.0)
+    :param channel: channel of the capture (Default value = None: all)
+
+    """
+
+    def __init__(self, path, address=("127.0.0.1", 0), speed=1.0, channel=None):
+        """ """
+        self.path = path
+        self.speed = speed
+        self.channel = channel
+        self.sent = 0  # records sent to the last client
+        self._stop = threading.Event()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(address)
+        self._sock.listen(4)
+        self.address = self._sock.getsockname()
+        self._lock = threading.Lock()
+        self._conns = list()  # accepted sockets, shut down by close
+        self._threads = list()
+        self._acceptor = threading.Thread(target=self._accept)
+        self._acceptor.daemon = True
+        self._acceptor.start()
+
+    def _accept(self):
+        """Accepts the connections (thread)"""
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                break  # closed
+
+            with self._lock:
+                if self._stop.is_set():
+                    conn.close()
+                    break
+                self._conns.append(conn)
+                t = threading.Thread(target=self._serve, args=(conn,))
+                t.daemon = True
+                t.start()
+                self._threads.append(t)
+
+    def _serve(self, conn):
+        """Replays the capture to a client (thread)
+
+        :param conn:
+
+        """
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sent = 0
+        drain = None
+        try:
+            if not conn.recv(4096):
+                return  # gone before the handshake
+
+            drain = threading.Thread(target=self._drain, args=(conn,))
+            drain.daemon = True
+            drain.start()
+
+            pacer = _Pacer(self.speed, self._stop)
+            for ts, _, payload in readcapture(self.path, self.channel):
+                if not pacer.wait(ts):
+                    break
+                conn.sendall(payload)
+                self.sent += 1
+        except OSError:
+            pass  # client gone
+        finally:
+            try:
+                conn.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+            if drain is not None:
+                drain.join()  # until the client closes (or close is called)
+            conn.close()
+
+    @staticmethod
+    def _drain(conn):
+        """Reads and ignores the requests of the client (thread)
+
+        :param conn:
+
+        """
+        try:
+            while conn.recv(65536):
+                pass
+        except OSError:
+            pass
+
+    def close(self):
+        """Stops the replays, disconnects the clients and closes the socket"""
+        self._stop.set()
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+        self._acceptor.join()
+        with self._lock:
+            conns, threads = list(self._conns), list(self._threads)
+
+        # wakes up the threads blocked in recv (no handshake yet, drain) or in
+        # sendall (client not reading)
+        for conn in conns:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # already closed by its thread
+
+        for t in threads:
+            t.join()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import asyncio
+import collections
+import time
+
+
+class TokenBucket(object):
+    """Token bucket holding up to ``capacity`` tokens, refilled at ``rate``
+    tokens per second. Taking a token when the bucket is empty has to wait for
+    the next refill
+
+    :param rate: tokens added per second
+    :param capacity: maximum number of tokens (burst size)
+    :param clock: callable returning the current time in seconds
+
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        """ """
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = float(capacity)
+        self._last = clock()
+
+    def _refill(self):
+        """ """
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def delay(self):
+        """Returns the seconds to wait until a token is available (0.0 if one is
+        available now)
+
+
+        """
+        self._refill()
+        if self.tokens >= 1.0 - 1e-9:  # rounding of the refill after a wait
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+    def take(self):
+        """Takes a token (``delay`` must have returned 0.0)"""
+        self._refill()
+        self.tokens -= 1.0
+
+
+class HistPacer(object):
+    """Paces historical data requests to keep them within the limits of IB,
+    which answers with pacing violations (and may disconnect) if:
+
+      - more than ``maxrequests`` (60) requests are made within ``period``
+        (600 seconds). A token bucket with ``burst`` tokens refilled at
+        ``(maxrequests - burst) / period`` tokens per second never goes over
+        it in any window of ``period`` seconds
+
+      - an identical request is repeated within ``identical`` (15) seconds
+
+      - more than ``samecontract`` (5) requests for the same contract,
+        exchange and tick type are made within ``samewindow`` (2) seconds
+
+      - more than ``maxconcurrent`` requests are open at the same time
+
+    ``acquire`` waits (in the event loop) until a request may be sent and
+    ``release`` must be called when its answer has arrived
+
+    :param maxconcurrent:  (Default value = 50)
+    :param maxrequests:  (Default value = 60)
+    :param period:  (Default value = 600.0)
+    :param burst:  (Default value = 30)
+    :param identical:  (Default value = 15.0)
+    :param samecontract:  (Default value = 5)
+    :param samewindow:  (Default value = 2.0)
+    :param clock: callable returning the time in seconds (Default value =
+        time.monotonic)
+    :param sleep: coroutine function to wait (Default value = asyncio.sleep)
+
+    """
+
+    def __init__(
+        self,
+        maxconcurrent=50,
+        maxrequests=60,
+        period=600.0,
+        burst=30,
+        identical=15.0,
+        samecontract=5,
+        samewindow=2.0,
+        clock=time.monotonic,
+        sleep=asyncio.sleep,
+    ):
+        """ """
+        burst = max(1, min(burst, maxrequests - 1))
+        self.bucket = TokenBucket((maxrequests - burst) / period, burst, clock)
+        self.maxconcurrent = maxconcurrent
+        self.identical = identical
+        self.samecontract = samecontract
+        self.samewindow = samewindow
+        self.clock = clock
+        self.sleep = sleep
+        self.active = 0  # open requests
+        self._lastsent = dict()  # request key -> time sent
+        self._bycontract = collections.defaultdict(collections.deque)
+        self._waiters = collections.deque()  # futures waiting for a free slot
+
+    def delay(self, key, ckey):
+        """Returns the seconds to wait until a request may be sent (0.0 if it
+        can be sent now), not counting the open requests limit
+
+        :param key: identifies identical requests
+        :param ckey: identifies the contract, exchange and tick type
+
+        """
+        now = self.clock()
+        wait = self.bucket.delay()
+
+        last = self._lastsent.get(key)
+        if last is not None:
+            wait = max(wait, last + self.identical - now)
+
+        sent = self._bycontract[ckey]
+        while sent and sent[0] <= now - self.samewindow:
+            sent.popleft()
+        if len(sent) >= self.samecontract:
+            wait = max(wait, sent[0] + self.samewindow - now)
+
+        return wait if wait > 1e-6 else 0.0  # rounding of the times after a wait
+
+    def sent(self, key, ckey):
+        """Records that a request has been sent
+
+        :param key:
+        :param ckey:
+
+        """
+        now = self.clock()
+        self.bucket.take()
+        self._lastsent[key] = now
+        self._bycontract[ckey].append(now)
+
+        # forget identical requests which can already be repeated
+        if len(self._lastsent) > 1024:
+            limit = now - self.identical
+            self._lastsent = dict(
+                (k, t) for k, t in self._lastsent.items() if t > limit
+            )
+
+    async def acquire(self, key, ckey):
+        """Waits until the request can be sent and records it
+
+        :param key:
+        :param ckey:
+
+        """
+        while self.active >= self.maxconcurrent:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+
+        self.active += 1  # the slot is held while waiting for the pacing
+        try:
+            while True:
+                wait = self.delay(key, ckey)
+                if not wait:
+                    break
+                await self.sleep(wait)
+        except BaseException:
+            self.release()
+            raise
+
+        self.sent(key, ckey)
+
+    def release(self):
+        """Frees the slot of a request whose answer has arrived"""
+        self.active -= 1
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+
+def mergebars(lists, merged):
+    """Appends to ``merged`` the bars of ``lists`` (the answers for consecutive
+    periods, in chronological order) skipping the bars repeated at the joins
+
+    :param lists:
+    :param merged: the list to fill
+
+    """
+    last = None
+    for bars in lists:
+        for bar in bars:
+            if last is not None and bar.date <= last:
+                continue
+            merged.append(bar)
+            last = bar.date
+
+    return merged
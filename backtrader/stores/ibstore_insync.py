@@ -37,7 +37,11 @@ from copy import copy
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Awaitable, Dict, Iterator, List, Optional, Union
+from zoneinfo import ZoneInfo
 
+from backtrader.stores.barcache import BarCache
+from backtrader.stores.capture import CaptureWriter
+from backtrader.stores.ibpacing import HistPacer, mergebars
 from backtrader.stores.ibstore import IBStore
 from backtrader.stores.ibstores import util as util
 from backtrader.stores.ibstores.client import Client
@@ -49,6 +53,7 @@ from backtrader.stores.ibstores.contract import (
 )
 from backtrader.stores.ibstores.objects import (
     AccountValue,
+    BarData,
     BarDataList,
     DepthMktDataDescription,
     Execution,
@@ -91,6 +96,83 @@ from backtrader.utils.py3 import queue
 from eventkit import Event
 
 
+def _utc(dt):
+    """Datetimes without timezone are taken as UTC (as kept by the datas)
+
+    :param dt:
+
+    """
+    if isinstance(dt, datetime) and dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _epoch(dt):
+    """Seconds since the epoch of a datetime or date (naive: UTC)
+
+    :param dt:
+
+    """
+    if not isinstance(dt, datetime):
+        dt = datetime(dt.year, dt.month, dt.day)
+    return _utc(dt).timestamp()
+
+
+def _utcts(ts):
+    """UTC datetime of ``ts`` seconds since the epoch
+
+    :param ts:
+
+    """
+    return datetime.fromtimestamp(ts, timezone.utc)
+
+
+# kinds of bar dates kept by the bar cache (``dtkind`` column)
+_DTDATE, _DTAWARE, _DTNAIVE = 0, 1, 2
+
+_BARFIELDS = ("open", "high", "low", "close", "volume", "average", "barCount")
+
+
+def _barcolumns(bars):
+    """Columns for the bar cache of a list of ``BarData``
+
+    :param bars:
+
+    """
+    columns = dict((name, [getattr(b, name) for b in bars]) for name in _BARFIELDS)
+    columns["datetime"] = [_epoch(b.date) for b in bars]
+    columns["dtkind"] = [
+        _DTDATE
+        if not isinstance(b.date, datetime)
+        else _DTAWARE if b.date.tzinfo is not None else _DTNAIVE
+        for b in bars
+    ]
+    return columns
+
+
+def _cachedbars(columns):
+    """List of ``BarData`` from the columns of the bar cache
+
+    :param columns:
+
+    """
+    bars = list()
+    for i, ts in enumerate(columns["datetime"]):
+        dt = _utcts(ts)
+        kind = columns["dtkind"][i]
+        if kind == _DTDATE:
+            dt = dt.date()
+        elif kind == _DTNAIVE:
+            dt = dt.replace(tzinfo=None)
+
+        bar = BarData(date=dt)
+        for name in _BARFIELDS:
+            setattr(bar, name, columns[name][i])
+        bar.barCount = int(bar.barCount)
+        bars.append(bar)
+    return bars
+
+
 class ErrorMsg(object):
     """ """
 
@@ -368,6 +450,9 @@ class IBStoreInsync(IBStore):
         ("timerefresh", 60.0),  # How often to refresh the timeoffset
         ("indcash", True),  # Treat IND codes as CASH elements
         ("runmode", None),
+        ("histconcurrent", 50),  # max open historical requests (IB limit: 50)
+        ("barcache", None),  # on-disk bar cache: True, a directory or a BarCache
+        ("record", None),  # file to record the inbound stream (see capture.py)
     )
 
     events = (
@@ -414,7 +499,7 @@ class IBStoreInsync(IBStore):
         return super().getdata(*args, **kwargs)
 
     def getbroker(self):
-        """Returns broker with *args, **kwargs from registered ``BrokerCls""" """""
+        """Returns broker with *args, **kwargs from registered ``BrokerCls``"""
         return super().getbroker()
 
     def __init__(self):
@@ -422,6 +507,9 @@ class IBStoreInsync(IBStore):
         super(IBStore, self).__init__()
 
         self.runmode = self.p.runmode
+        # paces the historical requests of all the datas
+        self.histpacer = HistPacer(maxconcurrent=self.p.histconcurrent)
+        self.barcache = BarCache.create(self.p.barcache)
         # Account list received
         self._event_accdownload = threading.Event()
 
@@ -478,6 +566,8 @@ class IBStoreInsync(IBStore):
 
         self.wrapper = Wrapper(self)
         self.client = Client(self.wrapper)
+        if self.p.record:
+            self.client.conn.recorder = CaptureWriter(self.p.record)
         self.errorEvent += self._onError
         self.client.apiEnd += self.disconnectedEvent
         self._logger = logging.getLogger("ib_insync.ib")
@@ -1390,6 +1480,8 @@ class IBStoreInsync(IBStore):
             f"session time {util.formatSI(stats.duration)}s."
         )
         self.client.disconnect()
+        if self.client.conn.recorder is not None:
+            self.client.conn.recorder.flush()
         self.disconnectedEvent.emit()
 
     def isConnected(self) -> bool:
@@ -2376,6 +2468,113 @@ class IBStoreInsync(IBStore):
         self.client.cancelHistoricalData(bars.reqId)
         self.wrapper.endSubscription(bars)
 
+    def reqHistoricalDataPaced(
+        self,
+        contract: Contract,
+        endDateTime: Union[datetime, date, str, None],
+        durationStr: str,
+        barSizeSetting: str,
+        whatToShow: str,
+        useRTH: bool,
+        formatDate: int = 1,
+        begindate: Optional[datetime] = None,
+        timeout: float = 60,
+    ) -> asyncio.Task:
+        """Schedule a historical bar data request and return at once.
+
+        The requests go through ``histpacer``, which keeps them within the IB
+        pacing limits, so the requests of all the datas can be scheduled
+        together and run concurrently. With ``begindate`` the period up to
+        ``endDateTime`` is split in as many requests as needed (see
+        ``histsegments``), which also run concurrently, and the answers are
+        merged in order. Naive datetimes are taken as UTC.
+
+        With the ``barcache`` parameter of the store and a ``begindate`` the
+        bars already on disk are not requested again: only the missing head
+        and/or tail of the period are. The cached bars are always requested
+        with ``formatDate=2`` (UTC); with ``formatDate=1`` the intraday bars
+        are returned as naive times of ``TimezoneTWS`` (or of the local time
+        zone if not set), as TWS does.
+
+        The returned task resolves to a :class:`.BarDataList`. Use
+        ``waitHistoricalData`` to block until it is done.
+
+        :param contract: Contract of interest.
+        :type contract: Contract
+        :param endDateTime: End of the period ('' or None: now).
+        :type endDateTime: Union[datetime, date, str, None]
+        :param durationStr: Duration of a single request (without
+                ``begindate``).
+        :type durationStr: str
+        :param barSizeSetting: Time period of one bar.
+        :type barSizeSetting: str
+        :param whatToShow: Source for constructing bars.
+        :type whatToShow: str
+        :param useRTH: Only data from within Regular Trading Hours.
+        :type useRTH: bool
+        :param formatDate:  (Default value = 1)
+        :type formatDate: int
+        :param begindate: Start of the period (Default value = None)
+        :type begindate: Optional[datetime]
+        :param timeout: Timeout of each request once sent (Default value = 60)
+        :type timeout: float
+        :rtype: asyncio.Task
+
+        """
+        return util.getLoop().create_task(
+            self.reqHistoricalDataPacedAsync(
+                contract,
+                endDateTime,
+                durationStr,
+                barSizeSetting,
+                whatToShow,
+                useRTH,
+                formatDate,
+                begindate,
+                timeout,
+            )
+        )
+
+    def waitHistoricalData(self, task: asyncio.Task) -> BarDataList:
+        """Run the event loop until a task of ``reqHistoricalDataPaced`` is
+        done and return its bars. The requests of the other tasks progress
+        meanwhile.
+
+        :param task:
+        :type task: asyncio.Task
+        :rtype: BarDataList
+
+        """
+        return self._run(task)
+
+    def histsegments(self, begindate, enddate, barSizeSetting):
+        """Split the period from ``begindate`` to ``enddate`` in consecutive
+        requests with the durations supported by IB for ``barSizeSetting``:
+        the smallest one reaching ``enddate`` or else the largest one. Returns
+        a list of ``(end, durationStr)``.
+
+        :param begindate:
+        :param enddate:
+        :param barSizeSetting:
+
+        """
+        n, t = barSizeSetting.split()
+        timeframe, compression = self._sizes[t]
+        durations = self.getdurations(timeframe, int(n) * compression)
+
+        segments = list()
+        dt = begindate
+        while durations and dt < enddate:
+            for duration in durations:
+                end = self.dt_plus_duration(dt, duration)
+                if end >= enddate:
+                    end = enddate
+                    break
+            segments.append((end, duration))
+            dt = end
+
+        return segments
+
     def reqHistoricalSchedule(
         self,
         contract: Contract,
@@ -3683,6 +3882,150 @@ class IBStoreInsync(IBStore):
             bars.clear()
         return bars
 
+    async def reqHistoricalDataPacedAsync(
+        self,
+        contract: Contract,
+        endDateTime: Union[datetime, date, str, None],
+        durationStr: str,
+        barSizeSetting: str,
+        whatToShow: str,
+        useRTH: bool,
+        formatDate: int = 1,
+        begindate: Optional[datetime] = None,
+        timeout: float = 60,
+    ) -> BarDataList:
+        """
+
+        See ``reqHistoricalDataPaced``.
+
+        :rtype: BarDataList
+
+        """
+        bars = BarDataList()
+        bars.reqId = None
+        bars.contract = contract
+        bars.endDateTime = endDateTime
+        bars.durationStr = durationStr
+        bars.barSizeSetting = barSizeSetting
+        bars.whatToShow = whatToShow
+        bars.useRTH = useRTH
+        bars.formatDate = formatDate
+        bars.keepUpToDate = False
+        bars.chartOptions = []
+
+        args = (barSizeSetting, whatToShow, useRTH, formatDate, timeout)
+        if begindate is None:
+            segments = [(endDateTime, durationStr)]
+            return mergebars(await self._reqsegments(contract, segments, *args), bars)
+
+        begindate = _utc(begindate)
+        enddate = _utc(endDateTime) if endDateTime else datetime.now(timezone.utc)
+        if self.barcache is None:
+            segments = self.histsegments(begindate, enddate, barSizeSetting)
+            return mergebars(await self._reqsegments(contract, segments, *args), bars)
+
+        # only the periods missing in the cache are requested (concurrently).
+        # With formatDate=1 TWS may send naive times of its own time zone,
+        # which cannot be placed against the (UTC) period: ask for UTC
+        cache = self.barcache
+        args = (barSizeSetting, whatToShow, useRTH, 2, timeout)
+        key = (
+            "ib",
+            contract.conId or contract.symbol,
+            contract.secType,
+            contract.exchange,
+            contract.currency,
+            barSizeSetting,
+            whatToShow,
+            useRTH,
+        )
+        begin, end = _epoch(begindate), _epoch(enddate)
+        periods = cache.missing(key, begin, end)
+        answers = await asyncio.gather(
+            *(
+                self._reqsegments(
+                    contract,
+                    self.histsegments(_utcts(b), _utcts(e), barSizeSetting),
+                    *args,
+                )
+                for b, e in periods
+            )
+        )
+        for (b, e), answer in zip(periods, answers):
+            cache.update(key, b, e, _barcolumns(mergebars(answer, [])))
+
+        bars.extend(_cachedbars(cache.read(key, begin, end)))
+        if formatDate == 1:
+            tz = ZoneInfo(self.TimezoneTWS) if self.TimezoneTWS else None
+            for bar in bars:
+                if isinstance(bar.date, datetime):
+                    bar.date = bar.date.astimezone(tz).replace(tzinfo=None)
+        return bars
+
+    async def _reqsegments(
+        self,
+        contract,
+        segments,
+        barSizeSetting,
+        whatToShow,
+        useRTH,
+        formatDate,
+        timeout,
+    ):
+        """
+
+        Runs the requests of ``segments`` concurrently and returns the answers.
+
+        """
+        return await asyncio.gather(
+            *(
+                self._reqHistoricalDataPaced(
+                    contract,
+                    end,
+                    duration,
+                    barSizeSetting,
+                    whatToShow,
+                    useRTH,
+                    formatDate,
+                    timeout,
+                )
+                for end, duration in segments
+            )
+        )
+
+    async def _reqHistoricalDataPaced(
+        self,
+        contract,
+        end,
+        duration,
+        barSizeSetting,
+        whatToShow,
+        useRTH,
+        formatDate,
+        timeout,
+    ):
+        """
+
+        A single request, sent when ``histpacer`` allows it.
+
+        """
+        ckey = (contract.conId or contract.symbol, contract.exchange, whatToShow)
+        key = ckey + (util.formatIBDatetime(end), duration, barSizeSetting, useRTH)
+        await self.histpacer.acquire(key, ckey)
+        try:
+            return await self.reqHistoricalDataAsync(
+                contract,
+                end,
+                duration,
+                barSizeSetting,
+                whatToShow,
+                useRTH,
+                formatDate,
+                timeout=timeout,
+            )
+        finally:
+            self.histpacer.release()
+
     def reqHistoricalScheduleAsync(
         self,
         contract: Contract,
@@ -11,6 +11,8 @@ from typing import Deque, List, Optional
 
 from eventkit import Event
 
+from backtrader.utils.latency import latency
+
 from .connection import Connection
 from .contract import Contract
 from .decoder import Decoder
@@ -384,19 +386,43 @@ class Client:
         self._data += data
         self._numBytesRecv += len(data)
 
-        while True:
-            if len(self._data) <= 4:
-                break
+        # The messages are framed by offsets in the buffer, which is cut once
+        # at the end. Once the API is ready the messages of the high rate
+        # streams go to ``decoder.fasthandlers`` split as bytes, without
+        # decoding them to ``str`` fields.
+        buf = self._data
+        size = len(buf)
+        pos = 0
+        fast = None if debug else self.decoder.fasthandlers
+        lat = latency if latency.enabled else None
+        while size - pos > 4 and self._data is buf:  # else reset meanwhile
             # 4 byte prefix tells the message length
-            msgEnd = 4 + struct.unpack(">I", self._data[:4])[0]
-            if len(self._data) < msgEnd:
+            start = pos + 4
+            msgEnd = start + struct.unpack_from(">I", buf, pos)[0]
+            if size < msgEnd:
                 # insufficient data for now
                 break
-            msg = self._data[4:msgEnd].decode(errors="backslashreplace")
-            self._data = self._data[msgEnd:]
+            pos = msgEnd
+            self._numMsgRecv += 1
+
+            if fast and self._apiReady:
+                fields = buf[start:msgEnd].split(b"\0")
+                handler = fast.get(fields[0])
+                if handler is not None:
+                    fields.pop()  # pop off last empty element
+                    try:
+                        handler(fields)
+                    except Exception:
+                        self.decoder.logger.exception(
+                            f"Error handling fields: {fields}"
+                        )
+                    if lat is not None:
+                        lat.stamp("decode")
+                    continue
+
+            msg = buf[start:msgEnd].decode(errors="backslashreplace")
             fields = msg.split("\0")
             fields.pop()  # pop off last empty element
-            self._numMsgRecv += 1
 
             if debug:
                 self._logger.debug("<<< %s", ",".join(fields))
@@ -431,6 +457,11 @@ class Client:
 
                 # decode and handle the message
                 self.decoder.interpret(fields)
+                if lat is not None:
+                    lat.stamp("decode")
+
+        if self._data is buf:
+            self._data = buf[pos:]
 
         if self._tcpDataProcessed:
             self._tcpDataProcessed()
@@ -739,6 +770,8 @@ class Client:
                 fields += [order.midOffsetAtWhole, order.midOffsetAtHalf]
 
         self.send(*fields)
+        if latency.enabled:
+            latency.stamp("send")
 
     def cancelOrder(self, orderId, manualCancelOrderTime=""):
         """
@@ -5,6 +5,8 @@ import asyncio
 from eventkit import Event
 from ib_insync.util import getLoop
 
+from backtrader.utils.latency import latency
+
 
 class Connection(asyncio.Protocol):
     """Event-driven socket connection.
@@ -16,6 +18,9 @@ class Connection(asyncio.Protocol):
           Is emitted on socket disconnect, with an error message in case
           of error, or an empty string in case of a normal disconnect.
 
+    The received data is also written to ``recorder`` (a
+    ``backtrader.stores.capture.CaptureWriter``) when set, to be replayed
+    offline with ``ReplayServer``.
 
     """
 
@@ -23,6 +28,7 @@ class Connection(asyncio.Protocol):
         """ """
         self.hasData = Event("hasData")
         self.disconnected = Event("disconnected")
+        self.recorder = None
         self.reset()
 
     def reset(self):
@@ -83,4 +89,8 @@ class Connection(asyncio.Protocol):
         :param data:
 
         """
+        if latency.enabled:
+            latency.receive()
+        if self.recorder is not None:
+            self.recorder.write(data)
         self.hasData.emit(data)
@@ -36,9 +36,40 @@ from .util import UNSET_DOUBLE, ZoneInfo, parseIBDatetime
 from .wrapper import Wrapper
 
 
+def _tostr(field):
+    """Fields are ``str`` (general path) or ``bytes`` (fast path)."""
+    return field if field.__class__ is str else field.decode(errors="backslashreplace")
+
+
+def _toint(field):
+    """ """
+    return int(field or 0)
+
+
+def _tofloat(field):
+    """ """
+    return float(field or 0)
+
+
+def _tobool(field):
+    """ """
+    return bool(int(field or 0))
+
+
+# field converters by type, resolved once per message type
+_CONVERTERS = {str: _tostr, int: _toint, float: _tofloat, bool: _tobool}
+
+# dataclass -> [(name, converter, default)] for ``Decoder.parse``
+_PARSERS: dict = {}
+
+
 class Decoder:
     """Decode IB messages and invoke corresponding wrapper methods."""
 
+    # tickPrice, tickSize, updateMktDepth, updateMktDepthL2, historicalData,
+    # realtimeBar, tickByTick
+    FASTIDS = (1, 2, 12, 13, 17, 50, 99)
+
     def __init__(self, wrapper: Wrapper, serverVersion: int):
         """
 
@@ -162,6 +193,14 @@ class Decoder:
             107: self.wrap("userInfo", [int, str], skip=1),
         }
 
+        # Handlers of the high rate streams which also take the fields as
+        # ``bytes`` (the message split without decoding it). The client sends
+        # these messages here without building the ``str`` fields.
+        self.fasthandlers = {
+            str(msgId).encode(): self.handlers[msgId]
+            for msgId in self.FASTIDS
+        }
+
     def wrap(self, methodName, types, skip=2):
         """Create a message handler that invokes a wrapper method
         with the in-order message fields as parameters, skipping over
@@ -173,32 +212,23 @@ class Decoder:
 
         """
 
+        method = getattr(self.wrapper, methodName, None)
+        converters = [_CONVERTERS[typ] for typ in types]
+
         def handler(fields):
             """
 
             :param fields:
 
             """
-            method = getattr(self.wrapper, methodName, None)
             if method:
                 try:
-                    args = [
-                        (
-                            field
-                            if typ is str
-                            else (
-                                int(field or 0)
-                                if typ is int
-                                else (
-                                    float(field or 0)
-                                    if typ is float
-                                    else bool(int(field or 0))
-                                )
-                            )
-                        )
-                        for (typ, field) in zip(types, fields[skip:])
-                    ]
-                    method(*args)
+                    method(
+                        *[
+                            convert(field)
+                            for (convert, field) in zip(converters, fields[skip:])
+                        ]
+                    )
                 except Exception:
                     self.logger.exception(f"Error for {methodName}:")
 
@@ -223,17 +253,18 @@ class Decoder:
         :param obj:
 
         """
-        for field in dataclasses.fields(obj):
-            typ = type(field.default)
-            if typ is str:
-                continue
-            v = getattr(obj, field.name)
-            if typ is int:
-                setattr(obj, field.name, int(v) if v else field.default)
-            elif typ is float:
-                setattr(obj, field.name, float(v) if v else field.default)
-            elif typ is bool:
-                setattr(obj, field.name, bool(int(v)) if v else field.default)
+        cls = obj.__class__
+        parsers = _PARSERS.get(cls)
+        if parsers is None:
+            parsers = _PARSERS[cls] = [
+                (field.name, _CONVERTERS[type(field.default)], field.default)
+                for field in dataclasses.fields(obj)
+                if type(field.default) in (int, float, bool)
+            ]
+
+        for name, convert, default in parsers:
+            v = getattr(obj, name)
+            setattr(obj, name, convert(v) if v else default)
 
     def priceSizeTick(self, fields):
         """
@@ -538,7 +569,7 @@ class Decoder:
 
         for _ in range(int(numBars)):
             bar = BarData(
-                date=get(),
+                date=_tostr(get()),
                 open=float(get()),
                 high=float(get()),
                 low=float(get()),
@@ -549,7 +580,9 @@ class Decoder:
             )
             self.wrapper.historicalData(int(reqId), bar)
 
-        self.wrapper.historicalDataEnd(int(reqId), startDateStr, endDateStr)
+        self.wrapper.historicalDataEnd(
+            int(reqId), _tostr(startDateStr), _tostr(endDateStr)
+        )
 
     def historicalDataUpdate(self, fields):
         """
@@ -1033,8 +1066,8 @@ class Decoder:
                 float(price),
                 float(size),
                 attrib,
-                exchange,
-                specialConditions,
+                _tostr(exchange),
+                _tostr(specialConditions),
             )
 
         elif tickType == 3:
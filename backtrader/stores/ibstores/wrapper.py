@@ -1109,28 +1109,6 @@ class Wrapper:
             bars.append(bar)
             self.ib.barUpdateEvent.emit(bars, True)
             bars.updateEvent.emit(bars, True)
-        print(
-            "RealTimeBar. bars:",
-            id(bars),
-            " -TickerId:",
-            reqId,
-            " - Time: ",
-            (time),
-            ", Open: ",
-            (open_),
-            ", High: ",
-            (high),
-            ", Low: ",
-            (low),
-            ", Close: ",
-            (close),
-            ", Volume: ",
-            (volume),
-            ", Count: ",
-            (count),
-            ", WAP: ",
-            (wap),
-        )
 
     def historicalData(self, reqId: int, bar: BarData):
         """
@@ -27,14 +27,18 @@ from __future__ import (
 
 import collections
 import json
+import math
+import socket
 import threading
 import time as _time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 import backtrader as bt
 import oandapy
 import requests  # oandapy depdendency
 from backtrader.metabase import MetaParams
+from backtrader.stores.barcache import BarCache
 from backtrader.utils.py3 import queue, with_metaclass
 
 # Extend the exceptions to support extra cases
@@ -84,9 +88,54 @@ class OandaNetworkError(oandapy.OandaError):
         super(self.__class__, self).__init__(er)
 
 
+class OandaInstrumentError(oandapy.OandaError):
+    """ """
+
+    def __init__(self, content=""):
+        """
+
+        :param content:  (Default value = "")
+
+        """
+        er = dict(code=595, message="Unknown Instrument", description=content)
+        super(self.__class__, self).__init__(er)
+
+
 class API(oandapy.API):
     """ """
 
+    def __init__(
+        self,
+        environment="practice",
+        access_token=None,
+        headers=None,
+        poolsize=10,
+        url=None,
+    ):
+        """Keeps up to ``poolsize`` keep-alive connections to the server, so that
+        concurrent requests do not pay for a new connection (and TLS handshake)
+        each
+
+        :param environment:  (Default value = "practice")
+        :param access_token:  (Default value = None)
+        :param headers:  (Default value = None)
+        :param poolsize:  (Default value = 10)
+        :param url: base url overriding the one of ``environment``  (Default
+            value = None)
+
+        """
+        super(API, self).__init__(
+            environment=environment, access_token=access_token, headers=headers
+        )
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=poolsize
+        )
+        self.client.mount("https://", adapter)
+        self.client.mount("http://", adapter)
+
+        if url is not None:
+            self.api_url = url
+
     def request(self, endpoint, method="GET", params=None):
         """
 
@@ -130,11 +179,13 @@ class API(oandapy.API):
 class Streamer(oandapy.Streamer):
     """ """
 
-    def __init__(self, q, headers=None, *args, **kwargs):
+    def __init__(self, q, headers=None, url=None, *args, **kwargs):
         """
 
         :param q:
         :param headers:  (Default value = None)
+        :param url: base url overriding the one of ``environment``  (Default
+            value = None)
         :param *args:
         :param **kwargs:
 
@@ -145,7 +196,29 @@ class Streamer(oandapy.Streamer):
         if headers:
             self.client.headers.update(headers)
 
+        if url is not None:
+            self.api_url = url
+
         self.q = q
+        self._response = None
+        # Connected from the start (and not in run) to let a disconnect issued
+        # before run starts take effect
+        self.connected = True
+
+    def disconnect(self):
+        """Stops the stream, also if blocked waiting for data"""
+        self.connected = False
+        response = self._response
+        if response is None:
+            return
+
+        # closing the response waits for a blocked reader: end the socket instead
+        sock = getattr(getattr(response.raw, "connection", None), "sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except (OSError, ValueError):
+                pass
 
     def run(self, endpoint, params=None):
         """
@@ -156,8 +229,6 @@ class Streamer(oandapy.Streamer):
         """
         # Override to better manage exceptions.
         # Kept as much as possible close to the original
-        self.connected = True
-
         params = params or {}
 
         ignore_heartbeat = None
@@ -174,7 +245,13 @@ class Streamer(oandapy.Streamer):
             try:
                 response = self.client.get(url, **request_args)
             except requests.RequestException:
-                self.q.put(OandaRequestError().error_response)
+                if self.connected:
+                    self.q.put(OandaRequestError().error_response)
+                break
+
+            self._response = response
+            if not self.connected:  # disconnected while connecting
+                response.close()
                 break
 
             if response.status_code != 200:
@@ -193,7 +270,8 @@ class Streamer(oandapy.Streamer):
                             self.on_success(data)
 
             except BaseException:  # socket.error has been seen
-                self.q.put(OandaStreamError().error_response)
+                if self.connected:  # else closed by disconnect
+                    self.q.put(OandaStreamError().error_response)
                 break
 
     def on_success(self, data):
@@ -217,6 +295,146 @@ class Streamer(oandapy.Streamer):
         self.q.put(OandaStreamError(data).error_response)
 
 
+class PriceStreams(object):
+    """A single rates stream for the instruments of all live datas, routing each
+    tick to the queues of its instrument (one per data).
+
+    The queues are bounded: if a data does not keep up, the oldest ticks are
+    dropped. Errors of the stream are delivered to all queues. An instrument is
+    checked before it joins the stream: if unknown, the error goes only to the
+    queue of its data. Adding an instrument restarts the stream once no other
+    instrument has been added for ``wait`` seconds, which gathers the datas
+    starting together in a single connection
+
+    :param store: the ``OandaStore``
+    :param qsize: maximum number of ticks in each queue (0: unbounded)
+    :param wait: seconds to gather added instruments before (re)connecting
+
+    """
+
+    def __init__(self, store, qsize=0, wait=0.0):
+        """ """
+        self.store = store
+        self.qsize = qsize
+        self.wait = wait
+
+        self._queues = collections.defaultdict(list)  # instrument -> queues
+        self._cond = threading.Condition()
+        self._version = 0  # changes when an instrument is added
+        self._due = 0.0  # time at which the stream can be (re)connected
+        self._stopped = False
+        self._streamer = None
+        self._thread = None
+
+    def add(self, dataname, tmout=None, q=None):
+        """Returns the queue of the ticks of ``dataname``, which are streamed
+        after ``tmout`` seconds
+
+        :param dataname:
+        :param tmout:  (Default value = None)
+        :param q: queue returned by an earlier call, kept when reconnecting
+            (Default value = None: a new one)
+
+        """
+        with self._cond:
+            known = dataname in self._queues
+
+        if not known and self.store.get_instrument(dataname) is None:
+            q = queue.Queue(maxsize=self.qsize)
+            q.put(OandaInstrumentError(dataname).error_response)
+            return q  # kept out of the stream, which would fail for all
+
+        with self._cond:
+            queues = self._queues[dataname]
+            if q is None or q not in queues:
+                q = queue.Queue(maxsize=self.qsize)
+                queues.append(q)
+            self._version += 1
+            self._due = max(self._due, _time.time() + max(tmout or 0.0, self.wait))
+            self._stopped = False
+            if self._streamer is not None:
+                self._streamer.disconnect()  # restarted with the new instruments
+
+            if self._thread is None:
+                self._thread = t = threading.Thread(target=self._t_stream)
+                t.daemon = True
+                t.start()
+
+            self._cond.notify()
+
+        return q
+
+    def stop(self):
+        """Stops the stream"""
+        with self._cond:
+            self._stopped = True
+            if self._streamer is not None:
+                self._streamer.disconnect()
+            self._cond.notify()
+
+    def put(self, msg):
+        """Called by the streamer with ticks and errors
+
+        :param msg:
+
+        """
+        if "instrument" not in msg:  # error: for all
+            for queues in list(self._queues.values()):
+                for q in list(queues):
+                    self._put(q, msg)
+            return
+
+        for q in list(self._queues.get(msg["instrument"], ())):
+            self._put(q, msg)
+
+    @staticmethod
+    def _put(q, msg):
+        """Puts ``msg`` in ``q`` dropping the oldest messages if full
+
+        :param q:
+        :param msg:
+
+        """
+        while True:
+            try:
+                q.put_nowait(msg)
+                return
+            except queue.Full:
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _t_stream(self):
+        """ """
+        version = None
+        while True:
+            with self._cond:
+                # wait for new instruments and then for the gathering delay
+                while not self._stopped:
+                    if self._version == version:
+                        self._cond.wait()
+                        continue
+
+                    delay = self._due - _time.time()
+                    if delay <= 0.0:
+                        break
+                    self._cond.wait(delay)
+
+                if self._stopped:
+                    self._thread = None
+                    return
+
+                version = self._version
+                instruments = ",".join(sorted(self._queues))
+                self._streamer = streamer = self.store._streamer(self)
+
+            streamer.rates(self.store.p.account, instruments=instruments)
+
+            with self._cond:
+                self._streamer = None
+
+
 class MetaSingleton(MetaParams):
     """Metaclass to make a metaclassed class a singleton"""
 
@@ -255,8 +473,42 @@ class OandaStore(with_metaclass(MetaSingleton, object)):
         ("account", ""),
         ("practice", False),
         ("account_tmout", 10.0),  # account balance refresh timeout
+        ("barcache", None),  # on-disk bar cache: True, a directory or a BarCache
+        ("poolsize", 16),  # keep-alive connections and concurrent candle requests
+        ("qsize", 10000),  # ticks kept per live data (0: unbounded)
+        ("streamwait", 0.5),  # seconds to gather live datas in the price stream
+        ("url", None),  # base url of the rest api (None: that of the environment)
+        ("streamurl", None),  # base url of the streaming api (None: idem)
     )
 
+    _MAXCANDLES = 5000  # candles per request (server limit)
+
+    # seconds of each granularity
+    _GRANSECS = {
+        "S5": 5,
+        "S10": 10,
+        "S15": 15,
+        "S30": 30,
+        "M1": 60,
+        "M2": 120,
+        "M3": 180,
+        "M4": 240,
+        "M5": 300,
+        "M10": 600,
+        "M15": 900,
+        "M30": 1800,
+        "H1": 3600,
+        "H2": 7200,
+        "H3": 10800,
+        "H4": 14400,
+        "H6": 21600,
+        "H8": 28800,
+        "H12": 43200,
+        "D": 86400,
+        "W": 604800,
+        "M": 2678400,
+    }
+
     _DTEPOCH = datetime(1970, 1, 1)
     _ENVPRACTICE = "practice"
     _ENVLIVE = "live"
@@ -286,6 +538,7 @@ class OandaStore(with_metaclass(MetaSingleton, object)):
         super(OandaStore, self).__init__()
 
         self.notifs = collections.deque()  # store notifications for cerebro
+        self.barcache = BarCache.create(self.p.barcache)
 
         self._env = None  # reference to cerebro for general notifications
         self.broker = None  # broker instance
@@ -300,7 +553,12 @@ class OandaStore(with_metaclass(MetaSingleton, object)):
             environment=self._oenv,
             access_token=self.p.token,
             headers={"X-Accept-Datetime-Format": "UNIX"},
+            poolsize=self.p.poolsize,
+            url=self.p.url,
         )
+        # candle pages of all datas share the connections of the api
+        self._pool = ThreadPoolExecutor(max_workers=self.p.poolsize)
+        self._prices = PriceStreams(self, self.p.qsize, self.p.streamwait)
 
         self._cash = 0.0
         self._value = 0.0
@@ -334,6 +592,7 @@ class OandaStore(with_metaclass(MetaSingleton, object)):
     def stop(self):
         """ """
         # signal end of thread
+        self._prices.stop()
         if self.broker is not None:
             self.q_ordercreate.put(None)
             self.q_orderclose.put(None)
@@ -457,15 +716,23 @@ class OandaStore(with_metaclass(MetaSingleton, object)):
         if tmout is not None:
             _time.sleep(tmout)
 
-        streamer = Streamer(
+        streamer = self._streamer(q)
+        streamer.events(ignore_heartbeat=False)
+
+    def _streamer(self, q):
+        """Returns a ``Streamer`` delivering to ``q``
+
+        :param q:
+
+        """
+        return Streamer(
             q,
             environment=self._oenv,
             access_token=self.p.token,
             headers={"X-Accept-Datetime-Format": "UNIX"},
+            url=self.p.streamurl,
         )
 
-        streamer.events(ignore_heartbeat=False)
-
     def candles(
         self,
         dataname,
@@ -533,57 +800,146 @@ class OandaStore(with_metaclass(MetaSingleton, object)):
         if dtend is not None:
             dtkwargs["end"] = int((dtend - self._DTEPOCH).total_seconds())
 
+        def fetch(start, end):
+            """Candles of a missing period of the bar cache"""
+            candles = self._history(dataname, granularity, candleFormat, start, end)
+            return self._candlecolumns(candles)
+
         try:
-            response = self.oapi.get_history(
-                instrument=dataname,
-                granularity=granularity,
-                candleFormat=candleFormat,
-                **dtkwargs,
-            )
+            if self.barcache is not None and dtbegin is not None:
+                key = ("oanda", self._oenv, dataname, granularity, candleFormat)
+                columns = self.barcache.get(
+                    key, dtkwargs["start"], dtkwargs.get("end"), fetch
+                )
+                candles = self._cachedcandles(columns)
+            elif dtbegin is not None:
+                candles = self._history(
+                    dataname, granularity, candleFormat, **dtkwargs
+                )
+            else:
+                candles = self._candles(
+                    dataname, granularity, candleFormat, **dtkwargs
+                )
 
         except oandapy.OandaError as e:
             q.put(e.error_response)
             q.put(None)
             return
 
-        for candle in response.get("candles", []):
+        for candle in candles:
             q.put(candle)
 
         q.put({})  # end of transmission
 
-    def streaming_prices(self, dataname, tmout=None):
-        """
+    def _candles(self, dataname, granularity, candleFormat, **kwargs):
+        """Candles of a single request
 
         :param dataname:
-        :param tmout:  (Default value = None)
+        :param granularity:
+        :param candleFormat:
+        :param **kwargs:
 
         """
-        q = queue.Queue()
-        kwargs = {"q": q, "dataname": dataname, "tmout": tmout}
-        t = threading.Thread(target=self._t_streaming_prices, kwargs=kwargs)
-        t.daemon = True
-        t.start()
-        return q
+        response = self.oapi.get_history(
+            instrument=dataname,
+            granularity=granularity,
+            candleFormat=candleFormat,
+            **kwargs,
+        )
+        if "code" in response:
+            raise oandapy.OandaError(response)
 
-    def _t_streaming_prices(self, dataname, q, tmout):
-        """
+        return response.get("candles", [])
+
+    def _history(self, dataname, granularity, candleFormat, start, end=None):
+        """Candles from ``start`` to ``end`` (timestamps, ``None``: now), requested
+        concurrently in pages of at most ``_MAXCANDLES`` candles
+
+        The pages of all datas share the pool of ``poolsize`` threads (and
+        keep-alive connections)
 
         :param dataname:
-        :param q:
-        :param tmout:
+        :param granularity:
+        :param candleFormat:
+        :param start:
+        :param end:  (Default value = None)
 
         """
-        if tmout is not None:
-            _time.sleep(tmout)
+        start = int(start)
+        end = int(end) if end is not None else int(math.ceil(_time.time()))
+        step = (self._MAXCANDLES - 1) * self._GRANSECS[granularity]
+
+        futures = list()
+        for pstart in range(start, max(start + 1, end), step):
+            pend = min(pstart + step, end)
+            futures.append(
+                self._pool.submit(
+                    self._candles,
+                    dataname,
+                    granularity,
+                    candleFormat,
+                    start=pstart,
+                    end=pend,
+                )
+            )
 
-        streamer = Streamer(
-            q,
-            environment=self._oenv,
-            access_token=self.p.token,
-            headers={"X-Accept-Datetime-Format": "UNIX"},
-        )
+        candles = list()
+        last = None
+        for future in futures:
+            for candle in future.result():
+                t = int(candle["time"])
+                if last is None or t > last:  # pages share the limits
+                    candles.append(candle)
+                    last = t
+
+        return candles
+
+    @staticmethod
+    def _candlecolumns(candles):
+        """Columns for the bar cache of the candles of ``get_history``
+
+        :param candles:
+
+        """
+        columns = collections.defaultdict(list)
+        for candle in candles:
+            columns["datetime"].append(int(candle["time"]) / 10**6)
+            columns["complete"].append(float(candle.get("complete", True)))
+            for name, value in candle.items():
+                if name not in ("time", "complete"):
+                    columns[name].append(float(value))
+        return columns
+
+    @staticmethod
+    def _cachedcandles(columns):
+        """Candles (as given by ``get_history``) from the columns of the bar
+        cache
+
+        :param columns:
+
+        """
+        names = [n for n in columns if n not in ("datetime", "complete")]
+        candles = list()
+        for i, ts in enumerate(columns["datetime"]):
+            candle = dict((name, columns[name][i]) for name in names)
+            candle["time"] = str(int(round(ts * 10**6)))
+            candle["complete"] = bool(columns["complete"][i])
+            if "volume" in candle:
+                candle["volume"] = int(candle["volume"])
+            candles.append(candle)
+        return candles
+
+    def streaming_prices(self, dataname, tmout=None, q=None):
+        """Returns the (bounded) queue of the ticks of ``dataname``, all
+        instruments sharing a single stream
 
-        streamer.rates(self.p.account, instruments=dataname)
+        :param dataname:
+        :param tmout:  (Default value = None)
+        :param q: queue of an earlier call to keep on a reconnection (Default
+            value = None)
+
+        """
+        return self._prices.add(dataname, tmout=tmout, q=q)
 
     def get_cash(self):
         """ """
@@ -33,6 +33,7 @@ import operator
 
 import backtrader as bt
 
+from .equitycurve import EquityCurve
 from .lineiterator import LineIterator, StrategyBase
 from .lineroot import LineSingle
 from .lineseries import LineSeriesStub
@@ -126,6 +127,7 @@ class MetaStrategy(StrategyBase.__class__):
         _obj.writers = list()
 
         _obj._slave_analyzers = list()
+        _obj._equitycurve = None
 
         _obj._tradehistoryon = False
 
@@ -302,6 +304,18 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
         """
         return self._slave_analyzers.append[idx]
 
+    def _getequitycurve(self):
+        """Returns the ``EquityCurve`` recorded by the strategy, creating it if
+        needed. Analyzers willing to work on the recorded values must request
+        it before the first bar is delivered (i.e.: during ``start``)
+
+
+        """
+        if self._equitycurve is None:
+            self._equitycurve = EquityCurve()
+
+        return self._equitycurve
+
     def _addanalyzer(self, ancls, *anargs, **ankwargs):
         """
 
@@ -313,7 +327,10 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
         anname = ankwargs.pop("_name", "") or ancls.__name__.lower()
         nsuffix = next(self._alnames[anname])
         anname += str(nsuffix or "")  # 0 (first instance) gets no suffix
+        optmetrics = ankwargs.pop("_optmetrics", None)
         analyzer = ancls(*anargs, **ankwargs)
+        if optmetrics is not None:
+            analyzer.optmetrics = tuple(optmetrics)
         self.analyzers.append(analyzer, anname)
 
     def _addobserver(self, multi, obscls, *obsargs, **obskwargs):
@@ -743,6 +760,9 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
             analyzer._notify_cashvalue(cash, value)
             analyzer._notify_fund(cash, value, fundvalue, fundshares)
 
+        if self._equitycurve is not None:
+            self._equitycurve.append(self.lines.datetime[0], cash, value, fundvalue)
+
     def add_timer(
         self,
         when,
@@ -1601,6 +1621,80 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
 
         return self.order_target_value(data=data, target=target, **kwargs)
 
+    def rebalance(self, weights, lotsize=1, **kwargs):
+        """Place the orders needed to rebalance several positions to final
+        values expressed as ``weights`` of the current portfolio ``value``
+
+        ``weights`` is expressed in decimal (``0.05`` -> ``5%``) and can be:
+
+          - A mapping of ``data`` (or data name) to weight. Datas not in the
+            mapping are left untouched
+
+          - A sequence of weights, matched in order against ``self.datas``
+
+        Unlike calling ``order_target_percent`` for each data, the portfolio
+        value is fetched only once and all target sizes are calculated in a
+        single pass against that snapshot using the ``CommissionInfo`` of each
+        data. A negative weight targets a short position
+
+        ``lotsize`` (default: ``1``) is the minimum tradable unit. It can be an
+        integer applied to all datas or a mapping of ``data`` (or data name) to
+        integer. Target sizes are rounded towards zero to a multiple of it
+
+        All *sell* orders are issued before any *buy* order. With
+        ``checksubmit`` active the broker checks the submitted orders in that
+        sequence, so the cash released by the sells is available to the buys
+
+        It returns a list with the generated orders (sells first). Datas which
+        are already on target generate no order
+
+        :param weights:
+        :param lotsize:  (Default value = 1)
+        :param **kwargs:
+
+        """
+        if isinstance(weights, collections.abc.Mapping):
+            targets = [
+                (self.getdatabyname(d) if isinstance(d, string_types) else d, w)
+                for d, w in iteritems(weights)
+            ]
+        else:
+            targets = list(zip(self.datas, weights))
+
+        bydata = isinstance(lotsize, collections.abc.Mapping)
+        if bydata:
+            lots = dict(
+                (self.getdatabyname(d) if isinstance(d, string_types) else d, lot)
+                for d, lot in iteritems(lotsize)
+            )
+
+        broker = self.broker
+        value = broker.getvalue()  # single snapshot for all targets
+
+        sells, buys = list(), list()
+        for data, weight in targets:
+            price = data.close[0]
+            tvalue = weight * value
+            comminfo = broker.getcommissioninfo(data)
+            tsize = comminfo.getsize(price, abs(tvalue))
+
+            lot = lots.get(data, 1) if bydata else lotsize
+            if lot > 1:
+                tsize -= tsize % lot
+
+            if tvalue < 0:
+                tsize = -tsize
+
+            delta = tsize - broker.getposition(data).size
+            if delta < 0:
+                sells.append((data, -delta))
+            elif delta > 0:
+                buys.append((data, delta))
+
+        orders = [self.sell(data=d, size=s, **kwargs) for d, s in sells]
+        orders.extend(self.buy(data=d, size=s, **kwargs) for d, s in buys)
+        return orders
+
     def getposition(self, data=None, broker=None):
         """Returns the current position for a given data in a given broker.
 
@@ -0,0 +1,275 @@
+# Copyright (c) 2025 backtrader contributors
+"""
+Latência "tick-to-order" ao vivo: marcas de tempo em cada etapa (hop), do recebimento
+no socket até o envio da ordem, agregadas em histogramas por etapa.
+Todas as funções e docstrings devem ser line-wrap ≤ 90 caracteres.
+"""
+
+import json
+import logging
+import threading
+import time
+
+# Etapas na ordem do caminho de um tick (a origem é o recebimento no socket):
+#   decode     mensagem decodificada e tratada (``handler``/``decoder.interpret``)
+#   enqueue    mensagem na fila ao vivo (``qlive``) do data feed
+#   load       barra entregue por ``_load`` do data feed
+#   next_enter entrada em ``Strategy.next``
+#   next_exit  saída de ``Strategy.next``
+#   submit     ordem recebida pelo broker (``submit``)
+#   send       ordem enviada pelo socket (``placeOrder``)
+HOPS = ("decode", "enqueue", "load", "next_enter", "next_exit", "submit", "send")
+
+_SUBBITS = 7  # 128 sub-buckets por potência de 2: erro relativo < 1%
+_SUBCOUNT = 1 << _SUBBITS
+_HALF = _SUBCOUNT >> 1
+
+
+class Histogram(object):
+    """
+    Histograma de valores inteiros (nanossegundos) no estilo HDR: buckets lineares
+    até ``2**7`` e, acima, 64 sub-buckets por potência de 2, o que mantém o erro
+    relativo abaixo de 1% com memória constante em qualquer escala.
+    """
+
+    def __init__(self):
+        self.counts = dict()  # índice do bucket -> contagem
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def index(value):
+        """
+        Retorna o índice do bucket de ``value``.
+        """
+        if value < _SUBCOUNT:
+            return value
+        shift = value.bit_length() - _SUBBITS
+        return _SUBCOUNT + (shift - 1) * _HALF + (value >> shift) - _HALF
+
+    @staticmethod
+    def lowest(index):
+        """
+        Retorna o menor valor do bucket ``index``.
+        """
+        if index < _SUBCOUNT:
+            return index
+        shift, sub = divmod(index - _SUBCOUNT, _HALF)
+        return (sub + _HALF) << (shift + 1)
+
+    def record(self, value):
+        """
+        Registra ``value`` (inteiro não negativo).
+        """
+        value = max(0, value)
+        idx = self.index(value)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """
+        Acrescenta as contagens de ``other``.
+        """
+        for idx, n in other.counts.items():
+            self.counts[idx] = self.counts.get(idx, 0) + n
+        self.count += other.count
+        self.total += other.total
+        for attr, pick in (("min", min), ("max", max)):
+            values = [getattr(h, attr) for h in (self, other)]
+            values = [v for v in values if v is not None]
+            setattr(self, attr, pick(values) if values else None)
+
+    def percentile(self, pct):
+        """
+        Retorna o valor no percentil ``pct`` (0-100): o menor valor do bucket, limitado
+        ao mínimo e ao máximo registrados. ``None`` se vazio.
+        """
+        if not self.count:
+            return None
+
+        rank = max(1, int(round(pct / 100.0 * self.count)))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= rank:
+                return min(self.max, max(self.min, self.lowest(idx)))
+        return self.max
+
+    def summary(self):
+        """
+        Retorna ``dict`` com contagem, mínimo, média, percentis e máximo (ns).
+        """
+        return dict(
+            count=self.count,
+            min=self.min,
+            mean=self.total / self.count if self.count else None,
+            p50=self.percentile(50),
+            p90=self.percentile(90),
+            p99=self.percentile(99),
+            p999=self.percentile(99.9),
+            max=self.max,
+        )
+
+
+class Latency(object):
+    """
+    Registro das marcas de tempo por etapa, desligado por padrão. Os pontos de
+    instrumentação testam apenas ``enabled`` quando desligado.
+
+    A origem (recebimento no socket) é mantida por thread e acompanha a mensagem na
+    fila ao vivo do data feed. Cada etapa registra dois histogramas: o tempo desde a
+    origem (``total``) e desde a etapa anterior da mesma origem (``hop``).
+
+    Uso::
+
+      from backtrader.utils.latency import latency
+      latency.enable(interval=60)  # resumo no log a cada 60 segundos
+      ...
+      latency.dump("latency.json")
+    """
+
+    clock = staticmethod(time.perf_counter)
+
+    def __init__(self):
+        self.enabled = False
+        self.logger = logging.getLogger("backtrader.latency")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._timer = None
+        self.reset()
+
+    def reset(self):
+        """
+        Descarta os histogramas.
+        """
+        with self._lock:
+            self.totals = dict((hop, Histogram()) for hop in HOPS)
+            self.hops = dict((hop, Histogram()) for hop in HOPS)
+
+    def enable(self, interval=None):
+        """
+        Liga o registro e, com ``interval`` (segundos), o resumo periódico no log.
+        """
+        self.enabled = True
+        self._stoptimer()
+        if interval:
+            self._timer = threading.Event()
+            t = threading.Thread(target=self._logsummary, args=(self._timer, interval))
+            t.daemon = True
+            t.start()
+
+    def disable(self):
+        """
+        Desliga o registro (os histogramas são mantidos).
+        """
+        self.enabled = False
+        self._stoptimer()
+
+    def _stoptimer(self):
+        """
+        Para o resumo periódico.
+        """
+        if self._timer is not None:
+            self._timer.set()
+            self._timer = None
+
+    def _logsummary(self, stop, interval):
+        """
+        Escreve o resumo no log a cada ``interval`` segundos (thread).
+        """
+        while not stop.wait(interval):
+            self.logger.info(self.report())
+
+    def receive(self):
+        """
+        Marca a origem: dados recebidos agora no socket (thread atual).
+        """
+        self._local.origin = self.clock()
+        self._local.last = None
+
+    def origin(self):
+        """
+        Retorna a origem da thread atual (``None`` se não há).
+        """
+        return getattr(self._local, "origin", None)
+
+    def setorigin(self, origin, last=None):
+        """
+        Define a origem da thread atual (ex: a da mensagem retirada da fila ao vivo) e
+        o instante da última etapa (``None``: a origem). ``None`` descarta a origem.
+        """
+        self._local.origin = origin
+        self._local.last = last
+
+    def stamp(self, hop):
+        """
+        Registra a etapa ``hop`` para a origem da thread atual (nada se não há).
+        """
+        local = self._local
+        origin = getattr(local, "origin", None)
+        if origin is None:
+            return
+
+        now = self.clock()
+        last = local.last if local.last is not None else origin
+        local.last = now
+        with self._lock:
+            self.totals[hop].record(int((now - origin) * 1e9))
+            self.hops[hop].record(int((now - last) * 1e9))
+
+    def snapshot(self):
+        """
+        Retorna ``{etapa: {"total": resumo, "hop": resumo}}`` (ns) das etapas com
+        registros, na ordem do caminho.
+        """
+        with self._lock:
+            return dict(
+                (hop, dict(total=t.summary(), hop=self.hops[hop].summary()))
+                for hop, t in ((hop, self.totals[hop]) for hop in HOPS)
+                if t.count
+            )
+
+    def tojson(self, **kwargs):
+        """
+        Retorna ``snapshot`` em JSON (``kwargs`` para ``json.dumps``).
+        """
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def dump(self, path):
+        """
+        Escreve ``snapshot`` em JSON no arquivo ``path``.
+        """
+        with open(path, "w") as f:
+            f.write(self.tojson(indent=2))
+
+    def report(self):
+        """
+        Retorna um resumo em texto, uma linha por etapa (microssegundos).
+        """
+        lines = ["latency (us)    count      p50      p99    p99.9      max  hop p50"]
+        for hop, stats in self.snapshot().items():
+            total, step = stats["total"], stats["hop"]
+            lines.append(
+                "%-12s %8d %8.1f %8.1f %8.1f %8.1f %8.1f"
+                % (
+                    hop,
+                    total["count"],
+                    total["p50"] / 1e3,
+                    total["p99"] / 1e3,
+                    total["p999"] / 1e3,
+                    total["max"] / 1e3,
+                    step["p50"] / 1e3,
+                )
+            )
+        return "\n".join(lines)
+
+
+# Instância única usada pelos pontos de instrumentação
+latency = Latency()
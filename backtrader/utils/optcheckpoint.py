@@ -0,0 +1,190 @@
+# Copyright (c) 2025 backtrader contributors
+"""
+Checkpoint em disco (SQLite) das combinações já executadas de uma otimização.
+Docstrings e comentários devem ser line-wrap ≤ 90 caracteres.
+"""
+
+import datetime
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+
+
+# parâmetros de Cerebro que só mudam a distribuição do trabalho, não os resultados
+_SCHEDPARAMS = frozenset(
+    ("maxcpus", "optdatas", "optchunksize", "optunordered", "optmaxtasks", "optfork")
+)
+
+
+def _ident(value):
+    """
+    Representação estável (sem endereços de memória) de um valor de configuração:
+    classes pelo nome completo, objetos com ``params`` (ex: ``CommInfo``, fillers)
+    pela classe e pelos parâmetros e os demais objetos pelo nome da classe.
+    """
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return repr(value)
+    if isinstance(value, type):
+        return "%s.%s" % (value.__module__, value.__qualname__)
+    if isinstance(value, (list, tuple)):
+        return "(%s)" % ", ".join(_ident(v) for v in value)
+    if isinstance(value, dict):
+        items = sorted((_ident(k), _ident(v)) for k, v in value.items())
+        return "{%s}" % ", ".join("%s: %s" % item for item in items)
+    if isinstance(value, (datetime.date, datetime.time, datetime.timedelta)):
+        return repr(value)
+    if getattr(value, "p", None) is not None:
+        return "%s(%s)" % (_ident(type(value)), _paramsident(value.p))
+    return _ident(type(value))
+
+
+def _paramsident(params, skip=()):
+    """
+    Identidade de um objeto de parâmetros (``MetaParams`` ou ``make_params``),
+    sem os nomes em ``skip``.
+    """
+    if hasattr(params, "_getkwargs"):
+        items = params._getkwargs().items()
+    else:
+        items = ((k, getattr(params, k)) for k in dir(params) if not k.startswith("_"))
+    return ", ".join(
+        "%s=%s" % (k, _ident(v)) for k, v in sorted(items) if k not in skip
+    )
+
+
+def _runident(cerebro):
+    """
+    Identidade da configuração da execução que afeta os resultados: parâmetros de
+    Cerebro, broker (com comissões, slippage e filler) e as classes e argumentos de
+    sizers, analyzers, observers e indicators adicionados.
+    """
+    broker = cerebro._broker
+    return "\n".join(
+        (
+            _paramsident(cerebro.p, skip=_SCHEDPARAMS),
+            _ident(broker),
+            _ident(getattr(broker, "comminfo", None)),
+            _ident(cerebro.sizers),
+            _ident(cerebro.analyzers),
+            _ident(cerebro.observers),
+            _ident(cerebro.indicators),
+        )
+    )
+
+
+def _classident(cls):
+    """
+    Identidade de uma classe de estratégia: nome completo e código fonte (se
+    disponível), para que uma estratégia alterada não reaproveite resultados.
+    """
+    try:
+        source = inspect.getsource(cls)
+    except (OSError, TypeError):
+        source = ""
+    return "%s.%s\n%s" % (cls.__module__, cls.__name__, source)
+
+
+def _dataident(data):
+    """
+    Identidade de um data feed: classe, parâmetros e a origem dos dados. Para
+    arquivos entram o caminho, o tamanho e a data de modificação; para um
+    ``pandas.DataFrame`` um hash do conteúdo.
+    """
+    kwargs = data.p._getkwargs()
+    dataname = kwargs.pop("dataname", None)
+    if isinstance(dataname, str) and os.path.isfile(dataname):
+        st = os.stat(dataname)
+        source = "%s:%d:%d" % (os.path.abspath(dataname), st.st_size, st.st_mtime_ns)
+    elif hasattr(dataname, "index") and hasattr(dataname, "columns"):
+        import pandas
+
+        hashes = pandas.util.hash_pandas_object(dataname, index=True)
+        source = "%s:%d" % (list(dataname.columns), int(hashes.sum()))
+    else:
+        source = repr(dataname)
+
+    return "%s|%s|%r" % (type(data).__name__, source, sorted(kwargs.items()))
+
+
+class OptCheckpoint(object):
+    """
+    Guarda o resultado de cada combinação executada em uma otimização, com uma
+    chave calculada a partir da classe da estratégia, da identidade dos dados, dos
+    parâmetros, da configuração de Cerebro e do broker (comissões, sizers,
+    analyzers...) e das colunas dos registros. Ao repetir a mesma otimização as
+    combinações já presentes no arquivo não são executadas novamente.
+
+    :param filename: arquivo SQLite do checkpoint (criado se não existir)
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._conn = None
+        self._basekey = ""
+        self._classes = dict()
+
+    def start(self, cerebro, columns):
+        """
+        Abre o arquivo e calcula a parte fixa das chaves (dados, configuração e
+        colunas).
+        :param cerebro: Instância de Cerebro
+        :param columns: colunas dos registros de cada posição de estratégia
+        """
+        self._conn = sqlite3.connect(self.filename)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS done (key TEXT PRIMARY KEY, result BLOB)"
+        )
+        self._conn.commit()
+
+        datas = "\n".join(_dataident(data) for data in cerebro.datas)
+        self._basekey = "%s\n%s\n%r" % (datas, _runident(cerebro), columns)
+        self._classes = dict()
+
+    def key(self, iterstrat):
+        """
+        Retorna a chave de uma combinação (tuple de ``(classe, args, kwargs)``).
+        """
+        sha = hashlib.sha1(self._basekey.encode("utf-8"))
+        for cls, args, kwargs in iterstrat:
+            ident = self._classes.get(cls)
+            if ident is None:
+                ident = self._classes[cls] = _classident(cls)
+
+            sha.update(ident.encode("utf-8"))
+            sha.update(repr((args, sorted(kwargs.items()))).encode("utf-8"))
+
+        return sha.hexdigest()
+
+    def get(self, key):
+        """
+        Retorna o resultado guardado para ``key`` ou ``None``.
+        """
+        row = self._conn.execute(
+            "SELECT result FROM done WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else pickle.loads(row[0])
+
+    def put(self, key, result):
+        """
+        Guarda o resultado de uma combinação. Cada resultado é confirmado em disco
+        imediatamente para sobreviver a uma interrupção do processo.
+        """
+        blob = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO done VALUES (?, ?)", (key, sqlite3.Binary(blob))
+        )
+        self._conn.commit()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM done").fetchone()[0]
+
+    def stop(self):
+        """
+        Fecha o arquivo do checkpoint.
+        """
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,79 @@
+# Copyright (c) 2025 backtrader contributors
+"""
+Progresso e tempo estimado (ETA) de uma otimização, como callback de ``optcbs``.
+Docstrings e comentários devem ser line-wrap ≤ 90 caracteres.
+"""
+
+import sys
+import time
+
+
+class OptProgress(object):
+    """
+    Callback de otimização (``cerebro.optcallback``) que conta as combinações
+    concluídas e estima o tempo restante pela taxa média de conclusão.
+
+    A cada ``every`` combinações chama ``cb(done, total, elapsed, eta)``, com
+    ``total`` e ``eta`` ``None`` se o número de combinações não é conhecido
+    (combinações não materializadas pelo runner). Sem ``cb`` escreve uma linha de
+    progresso em ``sys.stderr``.
+
+    Os resultados retomados de um checkpoint contam em ``done`` mas não na taxa:
+    chegam de uma vez, antes de qualquer execução. A contagem recomeça a cada
+    otimização (``start``, chamado pelo runner).
+
+    :param cerebro: Instância de Cerebro (fornece ``_opttotal``)
+    :param cb: callable de progresso
+    :param every: intervalo, em combinações, entre chamadas
+    """
+
+    def __init__(self, cerebro, cb=None, every=1):
+        self.cerebro = cerebro
+        self.cb = cb if cb is not None else self._write
+        self.every = max(1, every)
+        self.start()
+
+    def start(self):
+        """
+        Zera a contagem (início de uma otimização).
+        """
+        self.done = 0
+        self._tstart = None
+
+    def __call__(self, runstrat):
+        now = time.time()
+        self.done += 1
+        # resultados retomados do checkpoint são entregues primeiro
+        executed = self.done - getattr(self.cerebro, "_optresumed", 0)
+        if executed == 1:
+            self._tstart = now
+
+        total = getattr(self.cerebro, "_opttotal", None)
+        if self.done % self.every and self.done != total:
+            return
+
+        # a taxa é medida a partir do primeiro resultado executado (o tempo até
+        # ele inclui o início dos processos do pool, que não se repete)
+        elapsed = now - self._tstart if self._tstart is not None else 0.0
+        eta = None  # desconhecido enquanto só há resultados retomados
+        if total is not None and self.done >= total:
+            eta = 0.0
+        elif total is not None and executed > 0:
+            eta = elapsed / max(1, executed - 1) * (total - self.done)
+        self.cb(self.done, total, elapsed, eta)
+
+    @staticmethod
+    def _write(done, total, elapsed, eta):
+        """
+        Callback padrão: escreve o progresso em ``sys.stderr``.
+        """
+        if total is None:
+            line = "%d done, %.1fs elapsed" % (done, elapsed)
+        elif eta is None:
+            line = "%d/%d done, %.1fs elapsed" % (done, total, elapsed)
+        else:
+            line = "%d/%d done, %.1fs elapsed, ETA %.1fs" % (done, total, elapsed, eta)
+        sys.stderr.write("\r" + line)
+        if done == total:
+            sys.stderr.write("\n")
+        sys.stderr.flush()
@@ -0,0 +1,220 @@
+# Copyright (c) 2025 backtrader contributors
+"""
+Tabela colunar para os resultados de otimização, com spill para SQLite em disco.
+Docstrings e comentários devem ser line-wrap ≤ 90 caracteres.
+"""
+
+import os
+import sqlite3
+import tempfile
+import weakref
+
+
+def _sqlvalue(value):
+    """
+    Converte um valor para um tipo aceito pelo SQLite (outros viram ``str``).
+    """
+    if value is None or isinstance(value, (int, float, str, bytes)):
+        return value
+    return str(value)
+
+
+def _removetmp(conn, filename):
+    """
+    Fecha a conexão e remove o arquivo temporário (``close`` ou coleta/saída do
+    processo sem ``close``).
+    """
+    conn.close()
+    if os.path.exists(filename):
+        os.remove(filename)
+
+
+class OptSink(object):
+    """
+    Recebe os registros compactos (``optcompact``) de cada combinação executada e
+    guarda os valores por coluna. Passando de ``maxrows`` linhas em memória, as
+    linhas são gravadas em uma tabela SQLite e a memória é liberada, de modo que o
+    uso de memória do processo principal não cresce com o tamanho da otimização.
+
+    Há uma tabela por posição de estratégia em ``cerebro.strats`` (índice ``idx``),
+    já que cada classe de estratégia tem seus próprios parâmetros.
+
+    :param filename: arquivo SQLite (``None``: arquivo temporário, removido no
+        ``close``, na coleta do objeto ou na saída do processo). Tabelas de
+        resultados já existentes no arquivo são descartadas em ``start``
+    :param maxrows: linhas mantidas em memória antes do spill para o disco
+    """
+
+    def __init__(self, filename=None, maxrows=10000):
+        self.filename = filename
+        self.maxrows = maxrows
+        self._columns = list()  # nomes das colunas por idx
+        self._data = list()  # por idx: uma lista de valores por coluna
+        self._ondisk = list()  # por idx: linhas já gravadas em disco
+        self._inmem = 0  # total de linhas em memória (todas as tabelas)
+        self._conn = None
+        self._tmpname = None
+        self._finalizer = None
+
+    def start(self, columns):
+        """
+        Prepara as tabelas. Chamado pelo runner antes de receber resultados.
+        :param columns: lista com os nomes das colunas de cada idx
+        """
+        self._columns = [list(c) for c in columns]
+        self._data = [[list() for _ in c] for c in self._columns]
+        self._ondisk = [0] * len(self._columns)
+        self._inmem = 0
+        # descarta os resultados de execuções anteriores
+        if self._conn is not None:
+            self._createtables()
+        elif self.filename is not None:
+            self._connect()
+
+    def append(self, idx, record):
+        """
+        Adiciona o registro de uma estratégia à tabela ``idx``.
+        :param idx: posição da estratégia em ``cerebro.strats``
+        :param record: tuple com os valores, na ordem das colunas
+        """
+        for column, value in zip(self._data[idx], record):
+            column.append(value)
+
+        self._inmem += 1
+        if self._inmem >= self.maxrows:
+            self.flush()
+
+    def columns(self, idx=0):
+        """
+        Retorna os nomes das colunas da tabela ``idx``.
+        """
+        return list(self._columns[idx])
+
+    def __len__(self):
+        return self.rowcount()
+
+    def rowcount(self, idx=0):
+        """
+        Retorna o número de linhas (memória e disco) da tabela ``idx``.
+        """
+        data = self._data[idx]
+        return self._ondisk[idx] + (len(data[0]) if data else 0)
+
+    def _table(self, idx):
+        return '"results%d"' % idx
+
+    def _connect(self):
+        if self._conn is None:
+            filename = self.filename
+            if filename is None:
+                fd, filename = tempfile.mkstemp(suffix=".sqlite")
+                os.close(fd)
+                self._tmpname = filename
+
+            self._conn = sqlite3.connect(filename)
+            if self._tmpname is not None:
+                self._finalizer = weakref.finalize(
+                    self, _removetmp, self._conn, self._tmpname
+                )
+            self._createtables()
+
+        return self._conn
+
+    def _createtables(self):
+        """
+        Recria as tabelas vazias, descartando as tabelas ``results*`` existentes
+        (de uma execução anterior ou de outro arquivo com o mesmo nome).
+        """
+        conn = self._conn
+        cursor = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name LIKE 'results%'"
+        )
+        for (name,) in cursor.fetchall():
+            conn.execute('DROP TABLE "%s"' % name)
+
+        for idx, columns in enumerate(self._columns):
+            cols = ", ".join('"%s"' % c for c in columns)
+            conn.execute("CREATE TABLE %s (%s)" % (self._table(idx), cols))
+        conn.commit()
+
+    def flush(self):
+        """
+        Grava em disco as linhas mantidas em memória.
+        """
+        if not self._inmem:
+            return
+
+        conn = self._connect()
+        for idx, data in enumerate(self._data):
+            if not data or not data[0]:
+                continue
+
+            marks = ", ".join("?" * len(data))
+            rows = (tuple(map(_sqlvalue, row)) for row in zip(*data))
+            conn.executemany(
+                "INSERT INTO %s VALUES (%s)" % (self._table(idx), marks), rows
+            )
+            self._ondisk[idx] += len(data[0])
+            for column in data:
+                del column[:]
+
+        conn.commit()
+        self._inmem = 0
+
+    def rows(self, idx=0):
+        """
+        Itera sobre todas as linhas da tabela ``idx``: primeiro as gravadas em
+        disco e depois as que ainda estão em memória.
+        """
+        if self._ondisk[idx]:
+            cursor = self._conn.execute("SELECT * FROM %s" % self._table(idx))
+            for row in cursor:
+                yield row
+
+        for row in zip(*self._data[idx]):
+            yield row
+
+    def query(self, sql, params=()):
+        """
+        Executa uma consulta SQL sobre as tabelas ``results0``, ``results1``...
+        (todas as linhas são gravadas em disco antes) e retorna a lista de linhas.
+        """
+        self.flush()
+        return self._connect().execute(sql, params).fetchall()
+
+    def todataframe(self, idx=0):
+        """
+        Retorna a tabela ``idx`` como um ``pandas.DataFrame``.
+        """
+        import pandas
+
+        return pandas.DataFrame(list(self.rows(idx)), columns=self.columns(idx))
+
+    def top(self, n, column, idx=0, ascending=False):
+        """
+        Retorna um ``pandas.DataFrame`` com as ``n`` melhores linhas da tabela
+        ``idx`` ordenadas por ``column``. A ordenação é feita pelo SQLite e só as
+        ``n`` linhas são carregadas.
+        """
+        import pandas
+
+        sql = 'SELECT * FROM %s ORDER BY "%s" %s LIMIT ?' % (
+            self._table(idx),
+            column,
+            "ASC" if ascending else "DESC",
+        )
+        rows = self.query(sql, (n,))
+        return pandas.DataFrame(rows, columns=self.columns(idx))
+
+    def close(self):
+        """
+        Fecha o arquivo SQLite (removido se for temporário).
+        """
+        if self._finalizer is not None:
+            self._finalizer()  # fecha e remove o temporário, uma única vez
+            self._finalizer = None
+            self._tmpname = None
+        elif self._conn is not None:
+            self._conn.close()
+
+        self._conn = None
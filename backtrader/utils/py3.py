@@ -31,6 +31,8 @@ import sys
 PY2 = sys.version_info.major == 2
 
 if PY2:
+    import Queue as queue
+
     try:
         import _winreg as winreg
     except ImportError:
@@ -105,6 +107,8 @@ if PY2:
         return d.items()
 
 else:
+    import queue
+
     try:
         import winreg
     except ImportError:
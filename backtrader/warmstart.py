@@ -0,0 +1,312 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import array
+import itertools
+import math
+import os
+import pickle
+import tempfile
+import time
+
+from .linebuffer import NAN
+from .lineiterator import LineIterator
+from .metabase import MetaParams
+from .utils.py3 import with_metaclass
+
+__all__ = ["WarmStart"]
+
+_VERSION = 1
+
+
+def _ident(value):
+    """Stable description of a param value (no memory addresses) for the
+    identity of a snapshot
+
+    :param value:
+
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, type):
+        return "%s.%s" % (value.__module__, value.__name__)
+    if isinstance(value, (tuple, list)):
+        return tuple(_ident(v) for v in value)
+    return type(value).__name__
+
+
+def _dataident(data):
+    """Identity of a data feed: class, dataname, name, timeframe and compression
+
+    :param data:
+
+    """
+    return (
+        type(data).__name__,
+        _ident(data.p.dataname),
+        data._name,
+        data._timeframe,
+        data._compression,
+    )
+
+
+def _walk(obj, path="0"):
+    """Yields ``(path, obj)`` for ``obj`` and (depth first) the indicators, line
+    operations and observers it owns
+
+    :param obj:
+    :param path:  (Default value = "0")
+
+    """
+    yield path, obj
+    for ltype in (LineIterator.IndType, LineIterator.ObsType):
+        for i, child in enumerate(obj._lineiterators[ltype]):
+            childpath = "%s/%d.%d" % (path, ltype, i)
+            if isinstance(child, LineIterator):
+                for item in _walk(child, childpath):
+                    yield item
+            else:
+                yield childpath, child  # line operation, delay ...
+
+
+def _signature(strat):
+    """Identity of the tree of a strategy: path, class, params and number of
+    lines of each object
+
+    :param strat:
+
+    """
+    signature = list()
+    for path, obj in _walk(strat):
+        params = ()
+        if hasattr(obj, "p"):
+            params = tuple((k, _ident(v)) for k, v in obj.p._getitems())
+        signature.append((path, type(obj).__name__, params, len(list(obj.lines))))
+    return signature
+
+
+def _gettail(line, size):
+    """Returns the last ``size`` values of ``line`` (up to the current index)
+
+    :param line:
+    :param size:
+
+    """
+    n = min(size, len(line), line.idx + 1)
+    return array.array(str("d"), line.get(size=n) if n > 0 else ())
+
+
+def _settail(line, length, tail):
+    """Moves the empty ``line`` to ``length`` with ``tail`` as its last values.
+    Older values are ``NaN``
+
+    :param line:
+    :param length:
+    :param tail:
+
+    """
+    pad = length - len(tail)
+    if line.mode == line.QBuffer:
+        # forward value by value to let the buffer keep only the last ones
+        skip = max(0, pad - line.maxlen - line.extrasize)
+        for value in itertools.chain(itertools.repeat(NAN, pad - skip), tail):
+            line.forward(value)
+        line.lencount += skip
+    else:
+        line.array.extend(array.array(str("d"), [NAN]) * pad)
+        line.array.extend(tail)
+        line.idx += length
+        line.lencount += length
+
+
+class WarmStart(with_metaclass(MetaParams, object)):
+    """Snapshot of the lines of the datas and of the strategies (with their
+    indicators, line operations and observers) to resume a run where the last
+    one stopped instead of consuming the history again
+
+    The last ``size`` values of each line and its length are saved (pickled)
+    when the run stops and every ``interval`` seconds. Objects may list in
+    ``warmattrs`` attributes which hold state outside of the lines (ex: the
+    intermediate values of ``LaguerreRSI``), which are saved too.
+
+    When the run starts, the snapshot is restored if the datas (class,
+    dataname, name, timeframe, compression) and the tree of each strategy
+    (classes, params and lines of all objects) are the same. The datas then
+    discard bars not later than the last restored one, and live feeds, which
+    backfill from their last bar, only request the gap since the snapshot.
+
+    Only restored with datas which are not preloaded (ex: live datas). Filters
+    (resample, replay), analyzers and the broker start anew
+
+    Params:
+
+      - ``filename`` (default: ``None``): file of the snapshot
+
+      - ``interval`` (default: ``None``): seconds between snapshots during the
+        run. ``None`` only saves when the run stops
+
+      - ``size`` (default: ``None``): values kept per line. ``None`` uses the
+        largest minimum period of the strategies, enough for the indicators.
+        Larger values are needed if the strategy looks further back itself
+
+    """
+
+    params = (
+        ("filename", None),
+        ("interval", None),
+        ("size", None),
+    )
+
+    def __init__(self):
+        """ """
+        self.restored = False  # the last start restored a snapshot
+        self._cerebro = None
+        self._runstrats = None
+        self._last = 0.0
+
+    def start(self, cerebro, runstrats):
+        """Restores the snapshot (if any and valid) into the just started datas
+        and strategies
+
+        :param cerebro:
+        :param runstrats:
+
+        """
+        self._cerebro = cerebro
+        self._runstrats = runstrats
+        self._last = time.time()
+        self.restored = False
+
+        if getattr(cerebro, "_dopreload", False):
+            return  # the lines already hold the datas
+
+        snapshot = self.load()
+        if snapshot is None or not self._matches(snapshot):
+            return
+
+        for data, (_, length, tails, _) in zip(cerebro.datas, snapshot["datas"]):
+            for line, tail in zip(data.lines, tails):
+                _settail(line, length, tail)
+
+            if length:  # deliver only bars later than the restored ones
+                nextdt = math.nextafter(data.datetime[0], math.inf)
+                data.fromdate = max(data.fromdate, nextdt)
+
+        for strat, (_, states) in zip(runstrats, snapshot["strats"]):
+            for (_, obj), (length, tails, attrs) in zip(_walk(strat), states):
+                for line, tail in zip(obj.lines, tails):
+                    _settail(line, length, tail)
+                for name, value in attrs.items():
+                    setattr(obj, name, value)
+
+            strat._dlens = [len(data) for data in strat.datas]
+
+        self.restored = True
+
+    def next(self):
+        """Saves a snapshot if ``interval`` seconds have passed since the last"""
+        interval = self.p.interval
+        if interval is not None and time.time() - self._last >= interval:
+            self.save()
+
+    def stop(self):
+        """Saves the final snapshot"""
+        if self._cerebro is not None:
+            self.save()
+        self._cerebro = self._runstrats = None
+
+    def snapshot(self):
+        """Returns the snapshot of the running datas and strategies"""
+        size = self.p.size
+        if size is None:
+            size = max([s._minperiod for s in self._runstrats] or [1])
+
+        datas = list()
+        for data in self._cerebro.datas:
+            tails = [_gettail(line, size) for line in data.lines]
+            datas.append((_dataident(data), len(data), tails, ()))
+
+        strats = list()
+        for strat in self._runstrats:
+            states = list()
+            for _, obj in _walk(strat):
+                tails = [_gettail(line, size) for line in obj.lines]
+                names = getattr(obj, "warmattrs", ())
+                attrs = dict((n, getattr(obj, n)) for n in names if hasattr(obj, n))
+                states.append((len(obj), tails, attrs))
+            strats.append((_signature(strat), states))
+
+        return dict(version=_VERSION, time=time.time(), datas=datas, strats=strats)
+
+    def save(self):
+        """Writes the snapshot to ``filename`` (replacing it at once)"""
+        snapshot = self.snapshot()
+        dirname = os.path.dirname(os.path.abspath(self.p.filename))
+        fd, tmpname = tempfile.mkstemp(dir=dirname, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(snapshot, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpname, self.p.filename)
+        except BaseException:
+            os.remove(tmpname)
+            raise
+
+        self._last = time.time()
+
+    def load(self):
+        """Returns the snapshot in ``filename`` (``None`` if missing or not
+        readable)"""
+        try:
+            with open(self.p.filename, "rb") as f:
+                snapshot = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+            return None
+
+        if not isinstance(snapshot, dict) or snapshot.get("version") != _VERSION:
+            return None
+        return snapshot
+
+    def _matches(self, snapshot):
+        """Checks the snapshot against the identity of the datas and of the trees
+        of the strategies, and that nothing has been loaded yet
+
+        :param snapshot:
+
+        """
+        cerebro = self._cerebro
+        if getattr(cerebro.p, "lookahead", 0):
+            return False  # the buffers have been extended beyond the index
+
+        datas = cerebro.datas
+        if any(len(data) for data in datas):
+            return False
+
+        idents = [(_dataident(d), len(list(d.lines))) for d in datas]
+        if idents != [(ident, len(tails)) for ident, _, tails, _ in snapshot["datas"]]:
+            return False
+
+        signatures = [_signature(strat) for strat in self._runstrats]
+        return signatures == [signature for signature, _ in snapshot["strats"]]
@@ -6,11 +6,14 @@ from __future__ import (
     unicode_literals,
 )
 
+import bisect
 import datetime
 import random
+from array import array
 from collections import deque
 
 import backtrader as bt
+import pandas as pd
 from backtrader.feed import DataBase
 
 from .qmtstore import QMTStore
@@ -90,9 +93,13 @@ class QMTFeed(DataBase, metaclass=MetaQMTFeed):
         self._compression = 1
         self.store = kwargs["store"]
         # self.cerebro = kwargs['cerebro']
-        self._data = deque()  # data queue for price data
+        self._data = deque()  # queue of chunks of price data (line -> values)
         self._seq = None
 
+        self._aliases = set(self.lines.getlinealiases())
+        self._rows = list()  # (line, values) of the chunk being loaded
+        self._pos = self._count = 0  # next row and rows of the chunk
+
     # def __len__(self):
     #     return len(self._data)
 
@@ -131,28 +138,93 @@ class QMTFeed(DataBase, metaclass=MetaQMTFeed):
         dtime = datetime.datetime.fromtimestamp(value // 1000)
         return bt.date2num(dtime)
 
-    def _load_current(self, current):
+    def _linename(self, key):
+        """Name of the line of the xtdata field ``key`` (``None`` if none)
+
+        :param key:
+
         """
+        if key == "time":
+            return "datetime"
+        if key == "lastPrice" and self.p.timeframe == bt.TimeFrame.Ticks:
+            return "close"
+        if key in self._aliases:
+            return key
+        return None
 
-        :param current:
+    def _framecolumns(self, res):
+        """Chunk (line name -> array of values) of a DataFrame of xtdata, copied
+        column by column
+
+        :param res:
+
+        """
+        columns = dict()
+        for key in res.columns:
+            name = self._linename(key)
+            if name is None or name == "datetime":
+                continue
+            if not pd.api.types.is_numeric_dtype(res[key]):
+                continue  # not loaded into the lines
+            values = array("d")
+            values.frombytes(res[key].to_numpy(dtype="float64").tobytes())
+            columns[name] = values
+
+        columns["datetime"] = array("d", map(self._get_datetime, res["time"].tolist()))
+        return columns
+
+    def _recordcolumns(self, records):
+        """Chunk (line name -> array of values) of the records of a live callback.
+        List values (5 levels of prices and volumes) are expanded into
+        ``name1`` ... ``name5`` as in the history
+
+        :param records:
 
         """
-        for key in current.keys():
-            try:
-                value = current[key]
-                if key == "time":
-                    self.lines.datetime[0] = self._get_datetime(value)
-
-                elif key == "lastPrice" and self.p.timeframe == bt.TimeFrame.Ticks:
-                    self.lines.close[0] = value
-                    print(value)
+        count = len(records)
+        columns = dict()
+        for i, record in enumerate(records):
+            for key, value in record.items():
+                if isinstance(value, (list, tuple)):
+                    fields = [("%s%d" % (key, j + 1), v) for j, v in enumerate(value)]
                 else:
-                    attr = getattr(self.lines, key)
-                    attr[0] = value
-            except Exception as e:
-                print(e)
-        # print(current, 'current')
-        self.put_notification(int(random.randint(100000, 999999)))
+                    fields = [(key, value)]
+
+                for key, value in fields:
+                    name = self._linename(key)
+                    if name is None:
+                        continue
+                    if name == "datetime":
+                        value = self._get_datetime(value)
+
+                    values = columns.get(name)
+                    if values is None:
+                        values = columns[name] = array("d", [float("NaN")]) * count
+                    try:
+                        values[i] = value
+                    except TypeError:
+                        pass  # not a number
+
+        return columns
+
+    def _setchunk(self, columns):
+        """Makes ``columns`` the chunk being loaded
+
+        :param columns:
+
+        """
+        self._rows = [(getattr(self.lines, name), v) for name, v in columns.items()]
+        self._count = len(columns.get("datetime", ()))
+        self._pos = 0
+
+    def _setrow(self, i):
+        """Sets the lines from the row ``i`` of the chunk being loaded
+
+        :param i:
+
+        """
+        for line, values in self._rows:
+            line[0] = values[i]
 
     def _load(self, replace=False):
         """
@@ -160,17 +232,51 @@ class QMTFeed(DataBase, metaclass=MetaQMTFeed):
         :param replace:  (Default value = False)
 
         """
-        if len(self._data) > 0:
-            current = self._data.popleft()
+        while self._pos >= self._count:
+            if not self._data:
+                return None
+            self._setchunk(self._data.popleft())
 
-            self._load_current(current)
+        self._setrow(self._pos)
+        self._pos += 1
+        self.put_notification(int(random.randint(100000, 999999)))
+        return True
 
-            return True
-        return None
+    def preload(self):
+        """Copies the history columns into the line buffers at once instead of
+        loading bar by bar. Filters, ``tzinput`` and bounded buffers (exactbars)
+        use the standard preload
+
+
+        """
+        if (
+            self.p.live
+            or len(self._data) != 1
+            or self._filters
+            or self._tzinput
+            or self.lines.datetime.useislice
+        ):
+            return super(QMTFeed, self).preload()
+
+        columns = self._data.popleft()
+        dts = columns["datetime"]
+        # fromdate/todate as checked by load (the history is in time order)
+        lo = bisect.bisect_left(dts, self.fromdate)
+        hi = max(lo, bisect.bisect_right(dts, self.todate))
+        for name in self._aliases:
+            values = columns.get(name)
+            if values is None:
+                values = array("d", [float("NaN")]) * (hi - lo)
+            else:
+                values = values[lo:hi]
+            getattr(self.lines, name).array.extend(values)
+
+        self._last()
+        self.home()
 
     def haslivedata(self):
         """ """
-        return self.p.live and self._data
+        return self.p.live and (self._data or self._pos < self._count)
 
     def islive(self):
         """ """
@@ -183,7 +289,7 @@ class QMTFeed(DataBase, metaclass=MetaQMTFeed):
         :param period:  (Default value = "1d")
 
         """
-        if dt is None:
+        if not dt:  # None or "" (default of the feed): not set
             return ""
         else:
             if period == "1d":
@@ -192,13 +298,14 @@ class QMTFeed(DataBase, metaclass=MetaQMTFeed):
                 formatted_string = dt.strftime("%Y%m%d%H%M%S")
             return formatted_string
 
-    def _append_data(self, item):
-        """
+    def _append_data(self, columns):
+        """Queues a chunk (line name -> values) for ``_load``
 
-        :param item:
+        :param columns:
 
         """
-        self._data.append(item)
+        if len(columns.get("datetime", ())):
+            self._data.append(columns)
 
     def _history_data(self, period):
         """
@@ -216,11 +323,7 @@ class QMTFeed(DataBase, metaclass=MetaQMTFeed):
             start_time=start_time,
             end_time=end_time,
         )
-        result = res.to_dict("records")
-        for item in result:
-            # if item.get('close') != 0 and item.get('lastPrice') != 0:
-            #     self._data.append(item)
-            self._data.append(item)
+        self._append_data(self._framecolumns(res))
 
     def _live_data(self, period):
         """
@@ -232,31 +335,31 @@ class QMTFeed(DataBase, metaclass=MetaQMTFeed):
         start_time = self._format_datetime(self.p.fromdate, period)
 
         def on_data(datas):
-            """
+            """Queues the records of each callback as a single chunk
 
             :param datas:
 
             """
             for stock_code in datas:
-                print(stock_code, datas[stock_code])
-                # 遍历该股票的所有数据条目
-                for current in datas[stock_code]:  # 添加内部循环处理每个数据字典
-                    if self._get_datetime(current["time"]) == self.lines.datetime[0]:
-                        self._load_current(current)
-                    else:
-                        self._data.append(current)
-
-            # print("Received data columns:", res.columns)  # 查看列名
-            # print("Full data:", res)  # 查看完整数据结构
-            # current = res
-            # data=current['time'][0]
-            #
-            # current['time']=data
-            # print(current['time'])
-            # if self._get_datetime(data) == self.lines.datetime[0]:
-            #     self._load_current(current)
-            # else:
-            #     self._data.append(current)
+                columns = self._recordcolumns(datas[stock_code])
+                dts = columns.get("datetime", ())
+
+                # records of the current bar update it, the rest are queued
+                current = self.lines.datetime[0] if len(self) else None
+                n = 0
+                while n < len(dts) and dts[n] == current:
+                    n += 1
+                if n:
+                    # only the fields present (not NaN) in those records
+                    rows = [(getattr(self.lines, k), v) for k, v in columns.items()]
+                    for line, values in rows:
+                        for value in reversed(values[:n]):
+                            if value == value:
+                                line[0] = value
+                                break
+                    columns = dict((k, v[n:]) for k, v in columns.items())
+
+                self._append_data(columns)
 
         self._seq = self.store._subscribe_live(
             symbol=self.p.dataname,
@@ -1,7 +1,13 @@
+import itertools
+import pickle
 import random
+import threading
+from datetime import datetime, timedelta, timezone
 
 import pandas as pd
 from backtrader.metabase import MetaParams
+from backtrader.stores.barcache import BarCache
+from backtrader.stores.capture import CaptureWriter, replay
 from xtquant import xtdata, xttrader, xttype
 
 
@@ -77,9 +83,25 @@ class QMTStore(object, metaclass=MetaSingleton):
         """
         return self.__class__.BrokerCls(*args, **kwargs)
 
-    def __init__(self):
-        """ """
+    def __init__(self, barcache=None, record=None, replay=None, speed=1.0):
+        """
 
+        :param barcache: on-disk bar cache of the history: True, a directory or
+            a ``BarCache`` (Default value = None: no cache)
+        :param record: file to record the live quote callbacks (Default value =
+            None)
+        :param replay: file of recorded callbacks to deliver instead of the live
+            quotes of xtdata (Default value = None)
+        :param speed: replay speed, 0 as fast as possible (Default value = 1.0)
+
+        """
+
+        self.barcache = BarCache.create(barcache)
+        self.recorder = CaptureWriter(record) if record else None
+        self.replay = replay
+        self.speed = speed
+        self._replays = dict()  # seq -> stop event of the replay
+        self._replayseq = itertools.count(-1, -1)
         self.mini_qmt_path = "E:\\software\\QMT\\userdata_mini"
         self.code_list = []
         self.last_tick = None
@@ -139,8 +161,9 @@ class QMTStore(object, metaclass=MetaSingleton):
         """
         for col in df.columns:
             if df[col].apply(lambda x: isinstance(x, (list, tuple))).all():
-                # Expand the array column into a new DataFrame
-                expanded_df = df[col].apply(pd.Series)
+                # Expand the array column into a new DataFrame (built at once from
+                # the lists: a Series per row is very slow for tick histories)
+                expanded_df = pd.DataFrame(df[col].tolist(), index=df.index)
                 # Generate new column names
                 expanded_df.columns = [
                     f"{col}{i + 1}" for i in range(expanded_df.shape[1])
@@ -158,6 +181,7 @@ class QMTStore(object, metaclass=MetaSingleton):
         count=-1,
         dividend_type="front",
         download=True,
+        cache=True,
     ):
         """获取历史数据
 
@@ -174,8 +198,14 @@ class QMTStore(object, metaclass=MetaSingleton):
         :param count:  (Default value = -1)
         :param dividend_type:  (Default value = "front")
         :param download:  (Default value = True)
+        :param cache: use the bar cache (if any) (Default value = True)
 
         """
+        if cache and self.barcache is not None and period != "tick" and start_time:
+            return self._cached_history(
+                symbol, period, start_time, end_time, dividend_type, download
+            )
+
         print("下载数据" + symbol)
         if download:
             xtdata.download_history_data(
@@ -198,8 +228,60 @@ class QMTStore(object, metaclass=MetaSingleton):
             res = self._auto_expand_array_columns(res)
         return res
 
-    def _subscribe_live(self, symbol, period, callback, start_time="", end_time=""):
+    # xtdata times are given in China Standard Time
+    _CST = timezone(timedelta(hours=8))
+
+    def _cached_history(
+        self, symbol, period, start_time, end_time, dividend_type, download
+    ):
+        """History through the bar cache: only the periods which are not on
+        disk are fetched from xtdata
+
+        :param symbol:
+        :param period:
+        :param start_time:
+        :param end_time:
+        :param dividend_type:
+        :param download:
+
         """
+        fmt = "%Y%m%d%H%M%S"
+
+        def epoch(text):
+            """Seconds since the epoch of a xtdata time (``None`` if empty)"""
+            if not text:
+                return None
+            dt = datetime.strptime(text, "%Y%m%d" if len(text) == 8 else fmt)
+            return dt.replace(tzinfo=self._CST).timestamp()
+
+        def fetch(begin, end):
+            """Numeric columns of the bars of a missing period"""
+            res = self._fetch_history(
+                symbol,
+                period,
+                start_time=datetime.fromtimestamp(begin, self._CST).strftime(fmt),
+                end_time=datetime.fromtimestamp(end, self._CST).strftime(fmt),
+                dividend_type=dividend_type,
+                download=download,
+                cache=False,
+            )
+            columns = dict(
+                (col, res[col].tolist())
+                for col in res.columns
+                if col != "time" and pd.api.types.is_numeric_dtype(res[col])
+            )
+            columns["datetime"] = (res["time"] / 1000.0).tolist()
+            return columns
+
+        key = ("qmt", symbol, period, dividend_type)
+        columns = self.barcache.get(key, epoch(start_time), epoch(end_time), fetch)
+        res = pd.DataFrame(dict((c, v) for c, v in columns.items() if c != "datetime"))
+        res.insert(0, "time", [int(round(ts * 1000)) for ts in columns["datetime"]])
+        return res
+
+    def _subscribe_live(self, symbol, period, callback, start_time="", end_time=""):
+        """Subscribes to the quotes of xtdata. With ``replay`` the recorded
+        callbacks of ``symbol`` and ``period`` are delivered from a thread instead
 
         :param symbol:
         :param period:
@@ -209,6 +291,27 @@ class QMTStore(object, metaclass=MetaSingleton):
 
         """
 
+        channel = ("%s|%s" % (symbol, period)).encode("utf-8")
+        if self.replay:
+            seq = next(self._replayseq)
+            stop = self._replays[seq] = threading.Event()
+            t = threading.Thread(
+                target=replay,
+                args=(self.replay, lambda p: callback(pickle.loads(p))),
+                kwargs=dict(speed=self.speed, channel=channel, stop=stop),
+            )
+            t.daemon = True
+            t.start()
+            return seq
+
+        if self.recorder is not None:
+            recorder, livecallback = self.recorder, callback
+
+            def callback(datas):
+                """Records the data before delivering it"""
+                recorder.write(pickle.dumps(datas), channel)
+                return livecallback(datas)
+
         seq = xtdata.subscribe_quote(
             stock_code=symbol,
             period=period,
@@ -225,4 +328,11 @@ class QMTStore(object, metaclass=MetaSingleton):
         :param seq:
 
         """
+        stop = self._replays.pop(seq, None)
+        if stop is not None:
+            stop.set()
+            return
+
         xtdata.unsubscribe_quote(seq)
+        if self.recorder is not None:
+            self.recorder.flush()
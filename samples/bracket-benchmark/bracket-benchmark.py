@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+import datetime
+import time
+
+import backtrader as bt
+
+
+class St(bt.Strategy):
+    """Bracket-heavy synthetic workload
+
+    Each bar ``brackets`` bracket orders are issued. The entry is a limit
+    close to the market (which usually executes) and the stop/limit sides are
+    placed far away so that they stay pending, accumulating thousands of
+    linked orders in the broker. Every ``cancelevery`` bars the oldest
+    ``cancel`` brackets are cancelled by cancelling one of the sides, which
+    cascades to the rest of the bracket
+    """
+
+    params = dict(
+        brackets=10,
+        distance=0.5,
+        cancelevery=5,
+        cancel=20,
+    )
+
+    def start(self):
+        """ """
+        self.sides = list()
+        self.norders = 0
+        self.notifs = 0
+
+    def notify_order(self, order):
+        """
+
+        :param order:
+
+        """
+        self.notifs += 1
+
+    def next(self):
+        """ """
+        close = self.data.close[0]
+        d = self.p.distance
+        for i in range(self.p.brackets):
+            os = self.buy_bracket(
+                size=1,
+                price=close * 0.999,
+                stopprice=close * (1.0 - d),
+                limitprice=close * (1.0 + d),
+            )
+            self.sides.append(os[1])
+            self.norders += 3
+
+        if not len(self) % self.p.cancelevery:
+            for o in self.sides[: self.p.cancel]:
+                self.cancel(o)
+
+            self.sides = self.sides[self.p.cancel :]
+
+    def stop(self):
+        """ """
+        print("Orders created: {}".format(self.norders))
+        print("Notifications received: {}".format(self.notifs))
+        print("Orders still open: {}".format(len(self.broker.get_orders_open())))
+
+
+def runstrat(args=None):
+    """
+
+    :param args:  (Default value = None)
+
+    """
+    args = parse_args(args)
+
+    cerebro = bt.Cerebro()
+
+    # Data feed kwargs
+    kwargs = dict()
+
+    # Parse from/to-date
+    dtfmt, tmfmt = "%Y-%m-%d", "T%H:%M:%S"
+    for a, d in ((getattr(args, x), x) for x in ["fromdate", "todate"]):
+        if a:
+            strpfmt = dtfmt + tmfmt * ("T" in a)
+            kwargs[d] = datetime.datetime.strptime(a, strpfmt)
+
+    data0 = bt.feeds.BacktraderCSVData(dataname=args.data0, **kwargs)
+    cerebro.adddata(data0)
+
+    cerebro.broker = bt.brokers.BackBroker(**eval("dict(" + args.broker + ")"))
+    cerebro.addstrategy(St, **eval("dict(" + args.strat + ")"))
+
+    tstart = time.time()
+    cerebro.run(stdstats=False, **eval("dict(" + args.cerebro + ")"))
+    print("Time used: {:.3f} secs".format(time.time() - tstart))
+
+
+def parse_args(pargs=None):
+    """
+
+    :param pargs:  (Default value = None)
+
+    """
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Bracket/OCO broker management benchmark",
+    )
+
+    parser.add_argument(
+        "--data0",
+        default="../../datas/2005-2006-day-001.txt",
+        required=False,
+        help="Data to read in",
+    )
+
+    # Defaults for dates
+    parser.add_argument(
+        "--fromdate",
+        required=False,
+        default="",
+        help="Date[time] in YYYY-MM-DD[THH:MM:SS] format",
+    )
+
+    parser.add_argument(
+        "--todate",
+        required=False,
+        default="",
+        help="Date[time] in YYYY-MM-DD[THH:MM:SS] format",
+    )
+
+    parser.add_argument(
+        "--cerebro",
+        required=False,
+        default="",
+        metavar="kwargs",
+        help="kwargs in key=value format",
+    )
+
+    parser.add_argument(
+        "--broker",
+        required=False,
+        default="cash=1e9",
+        metavar="kwargs",
+        help="kwargs in key=value format",
+    )
+
+    parser.add_argument(
+        "--strat",
+        required=False,
+        default="",
+        metavar="kwargs",
+        help="kwargs in key=value format",
+    )
+
+    return parser.parse_args(pargs)
+
+
+if __name__ == "__main__":
+    runstrat()
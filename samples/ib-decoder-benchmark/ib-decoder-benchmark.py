@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+
+import argparse
+import random
+import struct
+import time
+
+from backtrader.stores.capture import CaptureWriter, readcapture
+from backtrader.stores.ibstores.client import Client
+
+
+class NullWrapper(object):
+    """Accepts (and counts) every call of the decoder"""
+
+    def __init__(self):
+        """ """
+        self.count = 0
+
+    def __getattr__(self, name):
+        """
+
+        :param name:
+
+        """
+        if name.startswith("__") or name.startswith("tcpData"):
+            raise AttributeError(name)
+
+        def method(*args):
+            """ """
+            self.count += 1
+
+        setattr(self, name, method)  # found directly from now on
+        return method
+
+
+def message(*fields):
+    """
+
+    :param *fields:
+
+    """
+    payload = b"".join(str(f).encode() + b"\0" for f in fields)
+    return struct.pack(">I", len(payload)) + payload
+
+
+def synthetic(path, count, seed=0):
+    """Records a capture of ``count`` tick-by-tick, quote and depth messages
+    in socket sized chunks, to benchmark without a recorded session
+
+    :param path:
+    :param count:
+    :param seed:  (Default value = 0)
+
+    """
+    rnd = random.Random(seed)
+    t = 1704103200
+    chunk = list()
+    with CaptureWriter(path) as writer:
+        for i in range(count):
+            price = "%.2f" % (100 + rnd.random())
+            kind = i % 4
+            if kind == 0:
+                msg = message(99, 1, 1, t, price, rnd.randint(1, 500), 0, "ARCA", "")
+            elif kind == 1:
+                msg = message(99, 2, 3, t, price, price, 100, 200, 0)
+            elif kind == 2:
+                msg = message(1, 6, 3, 1, price, rnd.randint(1, 500), 0)
+            else:
+                msg = message(13, 1, 4, i % 10, "NSDQ", 1, i % 2, price, 100, 1)
+
+            chunk.append(msg)
+            if len(chunk) == 20:
+                writer.write(b"".join(chunk))
+                chunk = list()
+
+        if chunk:
+            writer.write(b"".join(chunk))
+
+
+def decode(chunks, fast, serverversion):
+    """Feeds the chunks to a client as the socket would. Returns the time
+    taken and the number of wrapper calls
+
+    :param chunks:
+    :param fast:
+    :param serverversion:
+
+    """
+    wrapper = NullWrapper()
+    client = Client(wrapper)
+    client._serverVersion = client.decoder.serverVersion = serverversion
+    client._apiReady = True  # the capture starts after the handshake
+    if not fast:
+        client.decoder.fasthandlers = {}
+
+    t0 = time.perf_counter()
+    for chunk in chunks:
+        client._onSocketHasData(chunk)
+    return time.perf_counter() - t0, wrapper.count
+
+
+def runbench(args=None):
+    """
+
+    :param args:  (Default value = None)
+
+    """
+    args = parse_args(args)
+    if args.synthetic:
+        synthetic(args.capture, args.synthetic)
+
+    # skip the handshake: a session recorded by the IB store starts with it
+    chunks = [payload for _, _, payload in readcapture(args.capture)]
+    if not args.synthetic:
+        chunks = chunks[args.skip :]
+    size = sum(len(c) for c in chunks)
+
+    for fast in (False, True):
+        best = min(
+            decode(chunks, fast, args.serverversion) for _ in range(args.repeat)
+        )
+        elapsed, calls = best
+        print(
+            "%s path: %d calls, %.1f MB in %.3fs: %.0f calls/s, %.1f MB/s"
+            % (
+                "fast" if fast else "general",
+                calls,
+                size / 1e6,
+                elapsed,
+                calls / elapsed,
+                size / 1e6 / elapsed,
+            )
+        )
+
+
+def parse_args(pargs=None):
+    """
+
+    :param pargs:  (Default value = None)
+
+    """
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description=(
+            "IB decoder benchmark: decodes a capture of the inbound stream "
+            "(IBStoreInsync record parameter) with the general and the fast path"
+        ),
+    )
+
+    parser.add_argument("--capture", required=True, help="Capture file")
+
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        help="Write a synthetic capture of this many messages to --capture first",
+    )
+
+    parser.add_argument(
+        "--skip",
+        type=int,
+        default=1,
+        help="Chunks of a recorded capture to skip (handshake and api start)",
+    )
+
+    parser.add_argument(
+        "--serverversion", type=int, default=176, help="Server version recorded"
+    )
+
+    parser.add_argument("--repeat", type=int, default=3, help="Best of n runs")
+
+    return parser.parse_args(pargs)
+
+
+if __name__ == "__main__":
+    runbench()
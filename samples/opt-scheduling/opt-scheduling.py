@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+import time
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+
+class St(bt.Strategy):
+    """Heterogeneous optimization workload
+
+    The cost of a run grows with ``work`` (busy iterations per bar), so that
+    the combinations of the sweep go from cheap to very expensive, like a
+    sweep over short and long indicator periods or over parameters producing
+    many or no trades
+    """
+
+    params = (
+        ("period", 15),
+        ("work", 0),
+    )
+
+    def __init__(self):
+        """ """
+        sma = btind.SMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+
+    def next(self):
+        """ """
+        x = 0
+        for i in range(self.p.work):
+            x += i
+
+        if not self.position.size:
+            if self.cross > 0.0:
+                self.buy()
+        elif self.cross < 0.0:
+            self.close()
+
+
+# name -> cerebro kwargs, use the cost hint
+SCHEDULES = [
+    ("imap, chunksize 1", dict(optchunksize=1), False),
+    ("imap, guided chunks", dict(optchunksize=0), False),
+    ("imap_unordered, guided chunks", dict(optunordered=True, optchunksize=0), False),
+    (
+        "imap_unordered, guided chunks, cost hint",
+        dict(optunordered=True, optchunksize=0),
+        True,
+    ),
+]
+
+
+def runstrat(args=None):
+    """
+
+    :param args:  (Default value = None)
+
+    """
+    args = parse_args(args)
+
+    works = [int(args.maxwork * (i / args.steps) ** 3) for i in range(args.steps + 1)]
+    periods = range(10, 10 + args.periods)
+    print("Combinations: {}".format(len(works) * len(periods)))
+
+    for name, kwargs, usecost in SCHEDULES:
+        cerebro = bt.Cerebro(maxcpus=args.maxcpus, optcompact=True, **kwargs)
+        cerebro.adddata(bt.feeds.BacktraderCSVData(dataname=args.data0))
+        cerebro.optstrategy(St, period=periods, work=works)
+        if usecost:
+            cerebro.optcost(lambda p: p["work"])
+        if args.progress:
+            cerebro.optprogress(every=max(1, len(works)))
+
+        tstart = time.time()
+        cerebro.run(stdstats=False)
+        print("{}: {:.3f} secs".format(name, time.time() - tstart))
+
+
+def parse_args(pargs=None):
+    """
+
+    :param pargs:  (Default value = None)
+
+    """
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Optimization pool scheduling benchmark",
+    )
+
+    parser.add_argument(
+        "--data0",
+        default="../../datas/2006-day-001.txt",
+        required=False,
+        help="Data to read in",
+    )
+
+    parser.add_argument(
+        "--maxcpus",
+        required=False,
+        type=int,
+        default=0,
+        help="Processes in the pool (0: all CPUs)",
+    )
+
+    parser.add_argument(
+        "--periods",
+        required=False,
+        type=int,
+        default=8,
+        help="Number of SMA periods in the sweep",
+    )
+
+    parser.add_argument(
+        "--steps",
+        required=False,
+        type=int,
+        default=12,
+        help="Number of work levels in the sweep (cost grows cubically)",
+    )
+
+    parser.add_argument(
+        "--maxwork",
+        required=False,
+        type=int,
+        default=20000,
+        help="Busy iterations per bar of the most expensive combination",
+    )
+
+    parser.add_argument(
+        "--progress",
+        required=False,
+        action="store_true",
+        help="Report progress and ETA on stderr",
+    )
+
+    return parser.parse_args(pargs)
+
+
+if __name__ == "__main__":
+    runstrat()
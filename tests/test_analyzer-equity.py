@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import backtrader as bt
+import backtrader.indicators as btind
+import testcommon
+from backtrader.analyzers.drawdown import DrawDown, TimeDrawDown
+from backtrader.analyzers.equity import (
+    CurveDrawDown,
+    CurvePeriodStats,
+    CurveReturns,
+    CurveSharpeRatio,
+    CurveTimeDrawDown,
+    CurveTimeReturn,
+    CurveVWR,
+)
+from backtrader.analyzers.periodstats import PeriodStats
+from backtrader.analyzers.returns import Returns
+from backtrader.analyzers.sharpe import SharpeRatio
+from backtrader.analyzers.timereturn import TimeReturn
+from backtrader.analyzers.vwr import VWR
+
+
+class CrossStrategy(bt.Strategy):
+    """ """
+
+    params = (("period", 15),)
+
+    def __init__(self):
+        """ """
+        sma = btind.SMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+
+    def next(self):
+        """ """
+        if not self.position.size:
+            if self.cross > 0.0:
+                self.buy()
+        elif self.cross < 0.0:
+            self.close()
+
+
+PAIRS = [
+    (DrawDown, CurveDrawDown, dict()),
+    (TimeDrawDown, CurveTimeDrawDown, dict(timeframe=bt.TimeFrame.Weeks)),
+    (TimeReturn, CurveTimeReturn, dict(timeframe=bt.TimeFrame.Months)),
+    (TimeReturn, CurveTimeReturn, dict(timeframe=bt.TimeFrame.NoTimeFrame)),
+    (Returns, CurveReturns, dict(timeframe=bt.TimeFrame.Days)),
+    (SharpeRatio, CurveSharpeRatio, dict(timeframe=bt.TimeFrame.Months)),
+    (VWR, CurveVWR, dict()),
+    (PeriodStats, CurvePeriodStats, dict(timeframe=bt.TimeFrame.Weeks)),
+]
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    for runonce in [True, False]:
+        cerebro = bt.Cerebro(runonce=runonce)
+        cerebro.adddata(testcommon.getdata(0))
+        cerebro.addstrategy(CrossStrategy)
+        for i, (ancls, curvecls, kwargs) in enumerate(PAIRS):
+            cerebro.addanalyzer(ancls, _name="bar%d" % i, **kwargs)
+            cerebro.addanalyzer(curvecls, _name="curve%d" % i, **kwargs)
+
+        strat = cerebro.run()[0]
+        assert len(strat._getequitycurve()) == len(strat)
+
+        for i, (ancls, curvecls, kwargs) in enumerate(PAIRS):
+            expected = getattr(strat.analyzers, "bar%d" % i).get_analysis()
+            analysis = getattr(strat.analyzers, "curve%d" % i).get_analysis()
+            if main:
+                print(curvecls.__name__, dict(analysis))
+            else:
+                assert dict(analysis) == dict(expected)
+
+
+if __name__ == "__main__":
+    test_run(main=True)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import calendar
+import datetime
+import types
+
+import backtrader as bt
+import testcommon
+from backtrader.analyzer import TimeFrameAnalyzerBase
+from backtrader.analyzers.timereturn import TimeReturn
+
+
+def periodkey(timeframe, dt):
+    """Reference key of the period the date belongs to
+
+    :param timeframe:
+    :param dt:
+
+    """
+    if timeframe == bt.TimeFrame.Days:
+        return datetime.datetime(dt.year, dt.month, dt.day)
+    if timeframe == bt.TimeFrame.Weeks:
+        sunday = dt + datetime.timedelta(days=7 - dt.isoweekday())
+        return datetime.datetime(sunday.year, sunday.month, sunday.day)
+    if timeframe == bt.TimeFrame.Months:
+        _, lastday = calendar.monthrange(dt.year, dt.month)
+        return datetime.datetime(dt.year, dt.month, lastday)
+
+    return datetime.date(dt.year, 12, 31)
+
+
+TIMEFRAMES = [
+    bt.TimeFrame.Days,
+    bt.TimeFrame.Weeks,
+    bt.TimeFrame.Months,
+    bt.TimeFrame.Years,
+]
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    cerebro = bt.Cerebro()
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addstrategy(bt.Strategy)
+    for timeframe in TIMEFRAMES:
+        cerebro.addanalyzer(TimeReturn, timeframe=timeframe, _name="tf%d" % timeframe)
+
+    strat = cerebro.run()[0]
+    data = strat.data
+    dates = [data.datetime.date(-i) for i in range(len(data) - 1, -1, -1)]
+
+    for timeframe in TIMEFRAMES:
+        analysis = getattr(strat.analyzers, "tf%d" % timeframe).get_analysis()
+        expected = []
+        for dt in dates:
+            key = periodkey(timeframe, dt)
+            if not expected or expected[-1] != key:
+                expected.append(key)
+
+        if main:
+            print(bt.TimeFrame.getname(timeframe), len(analysis), len(expected))
+        else:
+            assert list(analysis.keys()) == expected
+
+
+# sub-day periods over midnight, also with compressions not dividing the day
+SUBDAY = [
+    (bt.TimeFrame.Minutes, 5, datetime.timedelta(minutes=1)),
+    (bt.TimeFrame.Minutes, 7, datetime.timedelta(minutes=1)),
+    (bt.TimeFrame.Seconds, 7, datetime.timedelta(seconds=1)),
+]
+
+
+def test_subday(main=False):
+    """No bar starting a new period may be under the threshold of the
+    previous one
+
+    :param main:  (Default value = False)
+
+    """
+    for timeframe, compression, step in SUBDAY:
+        analyzer = object.__new__(TimeFrameAnalyzerBase)
+        analyzer.timeframe, analyzer.compression = timeframe, compression
+        analyzer.strategy = types.SimpleNamespace(
+            datetime=types.SimpleNamespace(_tz=None)
+        )
+
+        dt = datetime.datetime(2024, 1, 2, 23, 50)
+        dtcmp = None
+        dtnext = float("-inf")
+        periods = 0
+        for _ in range(1200):
+            cmp, key = analyzer._get_dt_cmpkey(dt)
+            if cmp != dtcmp:
+                assert bt.date2num(dt) >= dtnext, (timeframe, compression, dt)
+                dtcmp, dtnext = cmp, analyzer._get_dt_next(key)
+                periods += 1
+            dt += step
+
+        if main:
+            name = bt.TimeFrame.getname(timeframe, compression)
+            print(name, compression, periods)
+
+
+if __name__ == "__main__":
+    test_run(main=True)
+    test_subday(main=True)
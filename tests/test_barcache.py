@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import os
+import shutil
+import tempfile
+import time
+
+from backtrader.stores.barcache import BarCache
+
+DAY = 86400.0
+T0 = 1000 * DAY  # far in the past: the bars are final
+
+
+class FakeStore(object):
+    """Serves daily bars for any period, counting the requests"""
+
+    def __init__(self, cache):
+        """ """
+        self.cache = cache
+        self.requests = list()
+
+    def fetch(self, begin, end):
+        """
+
+        :param begin:
+        :param end:
+
+        """
+        self.requests.append((begin, end))
+        days = range(int(-(-begin // DAY)), int(end // DAY) + 1)
+        dts = [d * DAY for d in days]
+        return dict(
+            datetime=dts,
+            close=[dt / DAY for dt in dts],
+            volume=[100.0] * len(dts),
+        )
+
+    def history(self, begin, end):
+        """
+
+        :param begin:
+        :param end:
+
+        """
+        return self.cache.get(("fake", "EURUSD", "1 day"), begin, end, self.fetch)
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    path = tempfile.mkdtemp()
+    try:
+        store = FakeStore(BarCache(path))
+
+        bars = store.history(T0, T0 + 99 * DAY)
+        assert len(store.requests) == 1
+        assert len(bars["datetime"]) == 100
+        assert list(bars["close"]) == [1000.0 + i for i in range(100)]
+
+        # served from disk, also by a new cache (another session)
+        store.cache = BarCache(path)
+        again = store.history(T0, T0 + 99 * DAY)
+        inside = store.history(T0 + 10 * DAY, T0 + 20 * DAY)
+        assert len(store.requests) == 1
+        assert again == bars
+        assert list(inside["close"]) == [1010.0 + i for i in range(11)]
+
+        # only the missing tail and head are fetched
+        store.history(T0, T0 + 149 * DAY)
+        assert store.requests[-1] == (T0 + 99 * DAY, T0 + 149 * DAY)
+        bars = store.history(T0 - 50 * DAY, T0 + 149 * DAY)
+        assert store.requests[-1] == (T0 - 50 * DAY, T0)
+        assert len(store.requests) == 3
+        assert list(bars["close"]) == [950.0 + i for i in range(200)]
+
+        # compact: a column of doubles per field and a small header
+        files = os.listdir(path)
+        size = os.path.getsize(os.path.join(path, files[0]))
+        assert len(files) == 1
+        assert size < 200 * 3 * 8 + 512
+
+        # recent bars may still change: the last one is fetched again
+        now = time.time()
+        key = ("fake", "recent")
+        store.cache.update(key, now - 10 * DAY, now, store.fetch(now - 10 * DAY, now))
+        last = float(int(now // DAY) * DAY)
+        assert store.cache.missing(key, now - 10 * DAY, now) == [(last, now)]
+
+        if main:
+            print("requests: %s" % store.requests)
+            print("file size: %d bytes" % size)
+    finally:
+        shutil.rmtree(path)
+
+
+if __name__ == "__main__":
+    test_run(main=True)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import backtrader as bt
+import testcommon
+
+NORDERS = 5
+
+
+class CostlyCommInfo(bt.CommissionInfo):
+    """Operation cost overridden: the batch check must not price it"""
+
+    def getoperationcost(self, size, price):
+        """ """
+        return abs(size) * price * 1000.0
+
+
+class SubmitStrategy(bt.Strategy):
+    """ """
+
+    params = (
+        ("main", False),
+        ("cash", 10000.0),
+        ("accepted", NORDERS),
+        ("comminfo", None),
+    )
+
+    def start(self):
+        """ """
+        self.broker.set_cash(self.p.cash)
+        if self.p.comminfo is not None:
+            self.broker.addcommissioninfo(self.p.comminfo)
+        self.statuses = list()
+
+    def notify_order(self, order):
+        """
+
+        :param order:
+
+        """
+        self.statuses.append((order.ref, order.status))
+
+    def next(self):
+        """ """
+        if len(self) == 10:
+            self.orders = [self.buy(size=1) for i in range(NORDERS)]
+
+    def stop(self):
+        """ """
+        if self.p.main:
+            print(self.statuses)
+            return
+
+        accepted = [r for r, s in self.statuses if s == bt.Order.Accepted]
+        margin = [r for r, s in self.statuses if s == bt.Order.Margin]
+        refs = [o.ref for o in self.orders]
+        assert accepted == refs[: self.p.accepted]
+        assert margin == refs[self.p.accepted :]
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    data = testcommon.getdata(0)
+    # prices around 3600-4000: only 2 units can be paid with 10000
+    testcommon.runtest([data], SubmitStrategy, main=main, accepted=2)
+    # aggregated check accepts the whole batch
+    testcommon.runtest([data], SubmitStrategy, main=main, cash=1e6)
+    # overridden operation cost: sequential check, which rejects every order
+    testcommon.runtest(
+        [data],
+        SubmitStrategy,
+        main=main,
+        cash=1e6,
+        accepted=0,
+        comminfo=CostlyCommInfo(),
+    )
+
+
+if __name__ == "__main__":
+    test_run(main=True)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from backtrader.stores.capture import CaptureWriter, ReplayServer, readcapture, replay
+
+NCHUNKS = 200
+INTERVAL = 0.005  # recorded time between chunks
+SPEED = 10.0
+
+
+def record(path):
+    """Records NCHUNKS chunks on two channels, INTERVAL seconds apart, with
+    fake arrival times. Returns the chunks of the first channel"""
+    chunks = [(b"%d\0" % i) * (i % 7 + 1) for i in range(NCHUNKS)]
+    now = [1000.0]
+    with CaptureWriter(path, clock=lambda: now[0]) as writer:
+        for chunk in chunks:
+            writer.write(chunk, b"ib")
+            writer.write(b"other", b"qmt")
+            now[0] += INTERVAL
+
+    return chunks
+
+
+def receive(address):
+    """Connects to a ReplayServer, sends a handshake and reads until the end.
+    Returns the data and the time taken"""
+    sock = socket.create_connection(address)
+    t0 = time.time()
+    sock.sendall(b"API\0")
+    data = list()
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data.append(chunk)
+    sock.close()
+    return b"".join(data), time.time() - t0
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        chunks = record(path)
+        records = list(readcapture(path, b"ib"))
+        assert [payload for _, _, payload in records] == chunks
+        assert abs(records[1][0] - records[0][0] - INTERVAL) < 1e-9
+        assert len(list(readcapture(path))) == 2 * NCHUNKS
+
+        # callbacks, as fast as possible
+        got = list()
+        assert replay(path, got.append, speed=0, channel=b"ib") == NCHUNKS
+        assert got == chunks
+
+        # stopped replay
+        stop = threading.Event()
+        stop.set()
+        assert replay(path, got.append, speed=SPEED, stop=stop) == 0
+
+        # socket, at the recorded pace scaled by SPEED
+        server = ReplayServer(path, speed=SPEED, channel=b"ib")
+        fastserver = ReplayServer(path, speed=0, channel=b"ib")
+        try:
+            data, elapsed = receive(server.address)
+            fast, _ = receive(fastserver.address)
+        finally:
+            server.close()
+            fastserver.close()
+
+        expected = (NCHUNKS - 1) * INTERVAL / SPEED
+        if main:
+            text = "replayed %d bytes in %.3fs (%.3fs expected)"
+            print(text % (len(data), elapsed, expected))
+
+        assert data == b"".join(chunks)
+        assert fast == data
+        assert expected <= elapsed < expected + 1.0
+
+        # close with a client before its handshake and one which never reads
+        server = ReplayServer(path, speed=SPEED, channel=b"ib")
+        silent = socket.create_connection(server.address)
+        idle = socket.create_connection(server.address)
+        idle.sendall(b"API\0")
+        time.sleep(0.1)
+        closer = threading.Thread(target=server.close)
+        closer.start()
+        closer.join(5.0)
+        silent.close()
+        idle.close()
+        assert not closer.is_alive()
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    test_run(main=True)
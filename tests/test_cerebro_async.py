@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import asyncio
+import collections
+import datetime
+import threading
+import time
+
+import backtrader as bt
+from backtrader.feed import DataBase
+from backtrader.utils.date import date2num
+
+NBARS = 40
+
+
+class AsyncLiveData(DataBase):
+    """Live feed whose bars are pushed by a producer (event loop task or
+    thread), waking up ``run_async`` as they arrive"""
+
+    _asyncwakeup = True
+
+    def start(self):
+        """ """
+        super(AsyncLiveData, self).start()
+        self._q = collections.deque()
+        self._done = False
+        self.stamps = list()  # perf_counter of the arrival of each bar
+
+    def islive(self):
+        """ """
+        return True
+
+    def haslivedata(self):
+        """ """
+        return bool(self._q)
+
+    def push(self, dt, price):
+        """
+
+        :param dt:
+        :param price:
+
+        """
+        self._q.append((dt, price, time.perf_counter()))
+        if self._wakeup is not None:
+            self._wakeup()
+
+    def finish(self):
+        """ """
+        self._done = True
+        if self._wakeup is not None:
+            self._wakeup()
+
+    def _load(self):
+        """ """
+        if not self._q:
+            return False if self._done else None  # None: nothing yet
+
+        dt, price, stamp = self._q.popleft()
+        self.stamps.append(stamp)
+        self.lines.datetime[0] = date2num(dt)
+        for line in (self.lines.open, self.lines.high, self.lines.low):
+            line[0] = price
+        self.lines.close[0] = price
+        self.lines.volume[0] = 1.0
+        return True
+
+
+class LatencyStrategy(bt.Strategy):
+    """ """
+
+    params = (("stopat", None),)
+
+    def __init__(self):
+        """ """
+        self.closes = list()
+        self.latencies = list()
+
+    def next(self):
+        """ """
+        self.closes.append(self.data.close[0])
+        self.latencies.append(time.perf_counter() - self.data.stamps[-1])
+        if len(self.closes) == self.p.stopat:
+            self.env.runstop()
+
+
+def producer(data, start, stop, dt0):
+    """Pushes bars ``start`` to ``stop`` from a thread
+
+    :param data:
+    :param start:
+    :param stop:
+    :param dt0:
+
+    """
+    for i in range(start, stop):
+        time.sleep(0.005)
+        data.push(dt0 + datetime.timedelta(seconds=i), float(i))
+
+
+async def arun(stopat=None):
+    """Runs cerebro with half of the bars pushed from a thread and the other
+    half from a task of the event loop
+
+    :param stopat:  (Default value = None)
+
+    """
+    cerebro = bt.Cerebro(stdstats=False)
+    # a large qcheck: bars must not wait for it
+    data = AsyncLiveData(qcheck=2.0)
+    cerebro.adddata(data)
+    cerebro.addstrategy(LatencyStrategy, stopat=stopat)
+
+    dt0 = datetime.datetime(2025, 1, 2, 9, 30)
+    half = NBARS // 2
+
+    async def feed():
+        """ """
+        while not hasattr(data, "stamps"):  # data not started yet
+            await asyncio.sleep(0.001)
+
+        thread = threading.Thread(target=producer, args=(data, 0, half, dt0))
+        thread.start()
+        while thread.is_alive():
+            await asyncio.sleep(0.005)
+        thread.join()
+        for i in range(half, NBARS):
+            await asyncio.sleep(0.005)
+            data.push(dt0 + datetime.timedelta(seconds=i), float(i))
+        data.finish()
+
+    task = asyncio.ensure_future(feed())
+    results = await cerebro.run_async()
+    await task
+    return results[0]
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    strat = asyncio.run(arun())
+    latencies = sorted(strat.latencies)
+    if main:
+        print("bars: %d" % len(strat.closes))
+        print("p50: %.6fs" % latencies[len(latencies) // 2])
+        print("max: %.6fs" % latencies[-1])
+
+    assert strat.closes == [float(i) for i in range(NBARS)]
+    # woken up by each bar, not after qcheck (2 seconds)
+    assert latencies[-1] < 0.2
+
+    strat = asyncio.run(arun(stopat=5))
+    assert len(strat.closes) == 5
+
+
+if __name__ == "__main__":
+    test_run(main=True)
@@ -83,6 +83,72 @@ def check_futures():
     assert ca == size * (newprice - price) * mult
 
 
+class OverrideCommInfo(bt.CommissionInfo):
+    """Overrides the per-item calculations: the bulk methods must use them"""
+
+    def getcommission(self, size, price):
+        """ """
+        return 1.5
+
+    def getsize(self, price, cash):
+        """ """
+        return int(cash // (price * 2.0))
+
+    def getoperationcost(self, size, price):
+        """ """
+        return abs(size) * price * 2.0
+
+    def getvaluesize(self, size, price):
+        """ """
+        return size * price * 3.0
+
+    def profitandloss(self, size, price, newprice):
+        """ """
+        return size * (newprice - price) * 4.0
+
+    def cashadjust(self, size, price, newprice):
+        """ """
+        return size * (newprice - price) * 5.0
+
+
+def check_bulk():
+    """ """
+    sizes = [100.0, -50.0, 10.0]
+    prices = [10.0, 12.5, 7.0]
+    newprices = [11.0, 12.0, 7.5]
+    cashes = [1000.0, 550.0, 99.0]
+
+    comms = [
+        bt.CommissionInfo(commission=0.5),
+        bt.CommissionInfo(commission=0.5, mult=10.0, margin=10.0),
+        bt.CommissionInfo(commission=0.5, mult=10.0, margin=10.0, automargin=-1),
+        OverrideCommInfo(commission=0.5),
+    ]
+
+    for comm in comms:
+        args = list(zip(sizes, prices))
+        assert comm.getcommissions(sizes, prices) == [
+            comm.getcommission(s, p) for s, p in args
+        ]
+        assert comm.getoperationcosts(sizes, prices) == [
+            comm.getoperationcost(s, p) for s, p in args
+        ]
+        assert comm.getvaluesizes(sizes, prices) == [
+            comm.getvaluesize(s, p) for s, p in args
+        ]
+        assert comm.getsizes(prices, cashes) == [
+            comm.getsize(p, c) for p, c in zip(prices, cashes)
+        ]
+
+        args = list(zip(sizes, prices, newprices))
+        assert comm.profitandlosses(sizes, prices, newprices) == [
+            comm.profitandloss(s, p, n) for s, p, n in args
+        ]
+        assert comm.cashadjusts(sizes, prices, newprices) == [
+            comm.cashadjust(s, p, n) for s, p, n in args
+        ]
+
+
 def test_run(main=False):
     """
 
@@ -91,6 +157,7 @@ def test_run(main=False):
     """
     check_stocks()
     check_futures()
+    check_bulk()
 
 
 if __name__ == "__main__":
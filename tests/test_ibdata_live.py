@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import collections
+import datetime
+import select
+import socket
+import threading
+import time
+
+import testcommon  # noqa: F401
+from backtrader.feeds.ibdata import IBData
+
+NBARS = 50
+INTERVAL = 0.02  # seconds between bars sent by the fake server
+TIMEOUT = 10.0  # extra seconds to receive all bars before failing
+
+RTBar = collections.namedtuple("RTBar", "time open_ high low close volume wap")
+
+
+class FakeEvent(list):
+    """Minimal ``updateEvent``: ``+=`` subscribes and ``emit`` calls"""
+
+    def __iadd__(self, cb):
+        """
+
+        :param cb:
+
+        """
+        self.append(cb)
+        return self
+
+    def emit(self, *args):
+        """
+
+        :param *args:
+
+        """
+        for cb in self:
+            cb(*args)
+
+
+class FakeBarList(list):
+    """Real-time bars subscription"""
+
+    def __init__(self):
+        """ """
+        super(FakeBarList, self).__init__()
+        self.updateEvent = FakeEvent()
+
+
+class FakeIB(object):
+    """Store stand-in. Bars streamed by the fake server (one per line) are
+    read while the event loop runs (``sleep``/``waitOnUpdate``), as with the
+    real store, and delivered through the subscription ``updateEvent``"""
+
+    def __init__(self, **kwargs):
+        """
+
+        :param **kwargs:
+
+        """
+        self.sock = None
+        self.buf = b""
+        self.bars = FakeBarList()
+        self.sent = dict()  # bar number -> sending time
+
+    def connect(self, address):
+        """
+
+        :param address:
+
+        """
+        self.sock = socket.create_connection(address)
+
+    def reqRealTimeBars(self, **kwargs):
+        """
+
+        :param **kwargs:
+
+        """
+        return self.bars
+
+    def sleep(self, secs=0.02):
+        """
+
+        :param secs:  (Default value = 0.02)
+
+        """
+        self._poll(secs)
+
+    def waitOnUpdate(self, timeout=0):
+        """
+
+        :param timeout:  (Default value = 0)
+
+        """
+        return self._poll(timeout)
+
+    def _poll(self, timeout):
+        """
+
+        :param timeout:
+
+        """
+        ready, _, _ = select.select([self.sock], [], [], timeout)
+        if not ready:
+            return False
+
+        self.buf += self.sock.recv(65536)
+        *lines, self.buf = self.buf.split(b"\n")
+        for line in lines:
+            n, sent = line.split()
+            dt = datetime.datetime(2024, 1, 2, 9, 30) + datetime.timedelta(
+                seconds=5 * int(n)
+            )
+            price = 100.0 + int(n)
+            self.sent[int(n)] = float(sent)
+            self.bars.append(RTBar(dt, price, price, price, price, 1.0, 0.0))
+            self.bars.updateEvent.emit(self.bars, True)
+        return True
+
+
+class FakeIBData(IBData):
+    """ """
+
+    _store = FakeIB
+
+
+def fakeserver(listener):
+    """Sends ``NBARS`` bars, each stamped with its sending time
+
+    :param listener:
+
+    """
+    conn, _ = listener.accept()
+    for n in range(NBARS):
+        time.sleep(INTERVAL)
+        conn.sendall(b"%d %.9f\n" % (n, time.perf_counter()))
+    conn.close()
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    server = threading.Thread(target=fakeserver, args=(listener,))
+    server.start()
+
+    data = FakeIBData(dataname="STK-AAPL-USD-SMART", rtbar=True)
+    data.ib.connect(listener.getsockname())
+    data.contract = object()
+    data._state = data._ST_LIVE
+    data._statelivereconn = False
+    data._storedmsg = dict()
+    data._subcription_valid = False
+    data._usertvol = False
+    data._qcheck = 0.5
+    data.reqdata()
+
+    # tick-to-next latency: from the server sending the bar until _load
+    # returns it (the point at which the strategy next is called)
+    received, latencies = list(), list()
+    deadline = time.time() + NBARS * INTERVAL + TIMEOUT
+    while len(received) < NBARS and time.time() < deadline:
+        data.forward()
+        if data._load():
+            n = int(data.lines.close[0] - 100.0)
+            received.append(n)
+            latencies.append(time.perf_counter() - data.ib.sent[n])
+        else:
+            data.backwards()
+
+    server.join()
+    listener.close()
+
+    # every bar delivered once, in order and never before it was sent
+    assert received == list(range(NBARS))
+    assert min(latencies) >= 0.0
+
+    # histogram with power of 2 buckets (in microseconds)
+    histogram = collections.Counter()
+    for lat in latencies:
+        histogram[1 << max(0, int(lat * 1e6)).bit_length()] += 1
+
+    latencies.sort()
+    p50, p99 = latencies[NBARS // 2], latencies[int(NBARS * 0.99)]
+    if main:
+        for bucket in sorted(histogram):
+            print("<= %8d us: %d" % (bucket, histogram[bucket]))
+        print("p50: %.6f s, p99: %.6f s" % (p50, p99))
+
+
+if __name__ == "__main__":
+    test_run(main=True)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import struct
+
+import pytest
+
+pytest.importorskip("eventkit")
+pytest.importorskip("ib_insync")
+
+from backtrader.stores.ibstores.client import Client  # noqa: E402
+
+
+def message(*fields):
+    """A message as sent by TWS: length prefix and 0 terminated fields"""
+    payload = b"".join(str(f).encode() + b"\0" for f in fields)
+    return struct.pack(">I", len(payload)) + payload
+
+
+# two bars of historicalData: date, open, high, low, close, volume, wap, count
+BARS = (
+    ["20240101 10:00:00", "1", "2", "0.5", "1.5", "10", "1.2", 3]
+    + ["1704103200", "1.5", "2.5", "1", "2", "20", "1.7", 5]
+)
+
+
+def messages():
+    """A stream with each of the fast path messages and some others"""
+    stream = [
+        message(1, 6, 7, 1, "1.2345", "300", 0),  # tickPrice
+        message(1, 6, 7, 2, "", "0", 0),  # tickPrice without price
+        message(2, 6, 7, 0, "100"),  # tickSize
+        message(12, 1, 7, 0, 1, 1, "1.5", "200"),  # updateMktDepth
+        message(13, 1, 7, 0, "MM\xe9", 1, 0, "1.25", "10", 1),  # L2
+        message(17, 9, "20240101 10:00:00", "20240102 10:00:00", 2, *BARS),
+        message(50, 3, 11, 1704103200, "1", "2", "0.5", "1.5", "7", "1.2", 4),
+        message(99, 12, 1, 1704103200, "1.5", "100", 3, "NYSE", "T"),  # last
+        message(99, 12, 3, 1704103200, "1.4", "1.6", "10", "20", 2),  # bid ask
+        message(99, 12, 4, 1704103200, "1.5"),  # midpoint
+        message(6, 2, "NetLiquidation", "100000", "USD", "DU123"),  # general
+        message(2, 6, "x", 0, "100"),  # bad field: logged, not raised
+    ]
+    return b"".join(stream)
+
+
+class RecordingWrapper(object):
+    """Records the calls of the decoder"""
+
+    def __init__(self):
+        """ """
+        self.calls = list()
+
+    def __getattr__(self, name):
+        """
+
+        :param name:
+
+        """
+        if name.startswith("__") or name.startswith("tcpData"):
+            raise AttributeError(name)
+
+        def method(*args):
+            """ """
+            args = [vars(a) if hasattr(a, "__dict__") else a for a in args]
+            self.calls.append((name, args))
+
+        return method
+
+
+def decode(data, fast, chunk):
+    """Feeds ``data`` to a client in chunks of ``chunk`` bytes. Returns the
+    calls to the wrapper"""
+    wrapper = RecordingWrapper()
+    client = Client(wrapper)
+    client._serverVersion = client.decoder.serverVersion = 176
+    client._apiReady = True
+    if not fast:
+        client.decoder.fasthandlers = {}
+
+    for i in range(0, len(data), chunk):
+        client._onSocketHasData(data[i : i + chunk])
+
+    assert client._data == b""
+    assert client._numMsgRecv == 12
+    return wrapper.calls
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    data = messages()
+    expected = decode(data, False, len(data))
+    names = [name for name, _ in expected]
+    assert "priceSizeTick" in names and "tickByTickMidPoint" in names
+
+    # same calls and values through the fast path, whatever the chunking
+    for chunk in (len(data), 1, 7, 64):
+        assert decode(data, True, chunk) == expected
+
+    if main:
+        for call in expected:
+            print(call)
+
+
+if __name__ == "__main__":
+    test_run(main=True)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import asyncio
+import collections
+import heapq
+import itertools
+
+from backtrader.stores.ibpacing import HistPacer, mergebars
+
+NCONTRACTS = 100
+NSEGMENTS = 3
+MAXCONCURRENT = 10
+
+
+class VirtualTime(object):
+    """Clock and sleep for the pacer: time only moves forward when all the
+    tasks are waiting, straight to the next wake up"""
+
+    def __init__(self):
+        """ """
+        self.now = 0.0
+        self._sleepers = list()
+        self._count = itertools.count()
+
+    def __call__(self):
+        """ """
+        return self.now
+
+    async def sleep(self, secs):
+        """
+
+        :param secs:
+
+        """
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self.now + secs, next(self._count), future))
+        await future
+
+    async def drive(self, tasks):
+        """Advances the time until all ``tasks`` are done
+
+        :param tasks:
+
+        """
+        while not all(task.done() for task in tasks):
+            for _ in range(20):  # let the woken up tasks run
+                await asyncio.sleep(0)
+            if self._sleepers:
+                self.now, _, future = heapq.heappop(self._sleepers)
+                future.set_result(None)
+
+
+Bar = collections.namedtuple("Bar", "date")
+
+
+async def backfill():
+    """Runs the requests of NCONTRACTS contracts with NSEGMENTS periods each,
+    recording the sending time of each request"""
+    vt = VirtualTime()
+    pacer = HistPacer(maxconcurrent=MAXCONCURRENT, clock=vt, sleep=vt.sleep)
+    sent = list()  # (time, key, ckey)
+    active = [0, 0]  # current, max
+
+    async def request(contract, segment):
+        """ """
+        ckey = (contract, "SMART", "TRADES")
+        key = ckey + (segment,)
+        await pacer.acquire(key, ckey)
+        try:
+            sent.append((vt.now, key, ckey))
+            active[0] += 1
+            active[1] = max(active)
+            await vt.sleep(0.5)  # answer time
+            active[0] -= 1
+            # each period overlaps the next one by a bar
+            return [Bar(d) for d in range(segment * 10, segment * 10 + 11)]
+        finally:
+            pacer.release()
+
+    async def contract(c):
+        """ """
+        answers = await asyncio.gather(*(request(c, s) for s in range(NSEGMENTS)))
+        return mergebars(answers, list())
+
+    tasks = [asyncio.ensure_future(contract(c)) for c in range(NCONTRACTS)]
+    await vt.drive(tasks)
+    return [task.result() for task in tasks], sent, active[1]
+
+
+async def identical():
+    """Sends the same request twice and returns the sending times"""
+    vt = VirtualTime()
+    pacer = HistPacer(clock=vt, sleep=vt.sleep)
+    times = list()
+
+    async def request():
+        """ """
+        await pacer.acquire("key", "ckey")
+        times.append(vt.now)
+        pacer.release()
+
+    tasks = [asyncio.ensure_future(request()) for _ in range(2)]
+    await vt.drive(tasks)
+    return times
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    results, sent, maxactive = asyncio.run(backfill())
+    times = [t for t, _, _ in sent]
+    if main:
+        print("requests: %d" % len(sent))
+        print("virtual time: %.1fs" % times[-1])
+        print("max concurrent: %d" % maxactive)
+
+    assert len(sent) == NCONTRACTS * NSEGMENTS
+    assert maxactive <= MAXCONCURRENT
+
+    # merged in order, the repeated bars at the joins skipped
+    expected = list(range(NSEGMENTS * 10 + 1))
+    for bars in results:
+        assert [bar.date for bar in bars] == expected
+
+    # never more than 60 requests in any 10 minutes
+    for i, t in enumerate(times):
+        j = i
+        while j < len(times) and times[j] < t + 600.0:
+            j += 1
+        assert j - i <= 60
+
+    # never more than 5 requests for a contract in 2 seconds
+    bycontract = collections.defaultdict(list)
+    for t, _, ckey in sent:
+        bycontract[ckey].append(t)
+    for ts in bycontract.values():
+        for i in range(len(ts) - 5):
+            assert ts[i + 5] - ts[i] >= 2.0
+
+    # the pacing limit is reached, not a slower schedule
+    assert times[-1] <= (len(sent) - 30) * 20.0
+
+    first, second = asyncio.run(identical())
+    assert second - first >= 15.0
+
+
+if __name__ == "__main__":
+    test_run(main=True)
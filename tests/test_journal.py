@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import os
+import tempfile
+
+import backtrader as bt
+import testcommon
+from backtrader.journal import JournalFill, JournalRecord, readjournal
+
+
+class JournalStrategy(bt.Strategy):
+    """ """
+
+    def start(self):
+        """ """
+        self.notified = list()
+
+    def notify_order(self, order):
+        """
+
+        :param order:
+
+        """
+        self.notified.append((order.ref, order.status))
+
+    def next(self):
+        """ """
+        if len(self) % 10 == 0:
+            if self.position:
+                self.close()
+            else:
+                self.buy()
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    fd, fname = tempfile.mkstemp(suffix=".btj")
+    os.close(fd)
+    os.remove(fname)
+    try:
+        cerebro = bt.Cerebro()
+        cerebro.adddata(testcommon.getdata(0))
+        cerebro.addstrategy(JournalStrategy)
+        cerebro.addjournal(fname, flushsecs=0.01, batch=4)
+        strat = cerebro.run()[0]
+
+        records = list(readjournal(fname))
+        states = [r for r in records if isinstance(r, JournalRecord)]
+        fills = [r for r in records if isinstance(r, JournalFill)]
+
+        if main:
+            print(len(states), len(fills))
+
+        assert [(r.ref, r.status) for r in states] == strat.notified
+        completed = [r for r in states if r.status == bt.Order.Completed]
+        assert len(fills) == len(completed)
+        assert all(f.size for f in fills)
+    finally:
+        if os.path.exists(fname):
+            os.remove(fname)
+
+
+if __name__ == "__main__":
+    test_run(main=True)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import json
+import random
+import threading
+
+from backtrader.utils.latency import HOPS, Histogram, Latency
+
+
+class Clock(object):
+    """Manual clock for the stamps"""
+
+    def __init__(self):
+        """ """
+        self.now = 100.0
+
+    def __call__(self):
+        """ """
+        return self.now
+
+
+def histogram():
+    """Percentiles within 1% of the exact ones"""
+    rnd = random.Random(1)
+    values = sorted(int(rnd.lognormvariate(11, 1.5)) for _ in range(20000))
+    hist = Histogram()
+    for v in values:
+        hist.record(v)
+
+    assert hist.count == len(values)
+    assert (hist.min, hist.max) == (values[0], values[-1])
+    for pct in (50, 90, 99, 99.9):
+        exact = values[int(round(pct / 100.0 * len(values))) - 1]
+        assert abs(hist.percentile(pct) - exact) <= exact * 0.01 + 1
+
+    # a few hundred buckets whatever the range of the values
+    assert len(hist.counts) < 2000
+
+    other = Histogram()
+    other.record(1)
+    hist.merge(other)
+    assert hist.count == len(values) + 1 and hist.min == 1
+
+
+def stamps():
+    """Totals and hops of the stamps of a message across two threads"""
+    clock = Clock()
+    lat = Latency()
+    lat.clock = clock
+
+    lat.stamp("decode")  # no origin: ignored
+    for i in range(100):
+        lat.receive()
+        clock.now += 10e-6
+        lat.stamp("decode")
+        clock.now += 20e-6
+        lat.stamp("enqueue")
+        origin, enqueued = lat.origin(), clock.now
+
+        # another thread delivers the bar with the origin of the message
+        def load():
+            clock.now += 5e-6
+            lat.setorigin(origin, enqueued)
+            lat.stamp("load")
+            assert threading.current_thread() is not threading.main_thread()
+
+        t = threading.Thread(target=load)
+        t.start()
+        t.join()
+
+    snapshot = json.loads(lat.tojson())
+    assert list(snapshot) == ["decode", "enqueue", "load"]
+    assert snapshot["decode"]["total"]["count"] == 100
+    assert abs(snapshot["enqueue"]["total"]["p50"] - 30000) <= 300
+    assert abs(snapshot["enqueue"]["hop"]["p50"] - 20000) <= 200
+    assert abs(snapshot["load"]["total"]["p50"] - 35000) <= 350
+    assert abs(snapshot["load"]["hop"]["p50"] - 5000) <= 50
+    assert len(lat.report().splitlines()) == 4
+
+    lat.reset()
+    assert not lat.snapshot()
+    assert set(lat.totals) == set(HOPS)
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    histogram()
+    stamps()
+
+
+if __name__ == "__main__":
+    test_run(main=True)
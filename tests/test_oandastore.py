@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+pytest.importorskip("oandapy")
+pytest.importorskip("requests")
+
+from backtrader.stores.oandastore import OandaStore  # noqa: E402
+
+T0 = 1500000000  # start of the history (seconds)
+INSTRUMENTS = ["EUR_USD", "GBP_USD", "USD_JPY", "AUD_USD"]
+TICKS = 20  # ticks streamed per instrument
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Stand-in for the rest (candles) and streaming (prices) api"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        """ """
+        super(Handler, self).setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        """ """
+
+    def do_GET(self):
+        """ """
+        url = urlparse(self.path)
+        query = dict((k, v[0]) for k, v in parse_qs(url.query).items())
+        if url.path == "/v1/candles":
+            self.candles(query)
+        elif url.path == "/v1/instruments":
+            self.instruments(query)
+        elif url.path == "/v1/prices":
+            self.prices(query)
+        else:
+            self.send_error(404)
+
+    def candles(self, query):
+        """One minute candles from start to end, both included"""
+        start, end = int(query["start"]), int(query["end"])
+        with self.server.lock:
+            self.server.pages.append((query["instrument"], start, end))
+
+        candles = [
+            dict(time=str(t * 10**6), closeMid=t / 60.0, volume=1, complete=True)
+            for t in range(start, end + 1, 60)
+        ]
+        body = json.dumps(dict(candles=candles)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def instruments(self, query):
+        """Details of the instrument (error 400 if not in INSTRUMENTS)"""
+        if query["instruments"] in INSTRUMENTS:
+            status = 200
+            content = dict(instruments=[dict(instrument=query["instruments"])])
+        else:
+            status = 400
+            content = dict(code=46, message="Invalid instruments", moreInfo="")
+
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def prices(self, query):
+        """Streams the ticks of the instruments and waits for the end"""
+        instruments = query["instruments"].split(",")
+        self.server.streams.append(instruments)
+        self.send_response(200)
+        self.send_header("Transfer-Encoding", "chunked")  # as the real server
+        self.end_headers()
+        for i in range(TICKS):
+            for instrument in instruments:
+                tick = dict(instrument=instrument, time=str(i), bid=i, ask=i)
+                self.chunk(json.dumps(dict(tick=tick)).encode() + b"\n")
+        self.chunk(b'{"heartbeat": {"time": "0"}}\n')
+        self.server.done.wait(10.0)
+        self.close_connection = True
+
+    def chunk(self, data):
+        """Writes ``data`` as a chunk"""
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+
+def standin():
+    """Starts the stand-in server in a thread"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.pages = list()
+    server.streams = list()
+    server.done = threading.Event()
+    t = threading.Thread(target=server.serve_forever)
+    t.daemon = True
+    t.start()
+    return server
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    server = standin()
+    url = "http://127.0.0.1:%d" % server.server_address[1]
+    OandaStore._singleton = None
+    store = OandaStore(url=url, streamurl=url, poolsize=4, qsize=5, streamwait=0.2)
+    try:
+        # 3 pages per instrument, the 4 instruments at once on 4 connections
+        end = T0 + 2 * store._MAXCANDLES * 60 + 599
+        results = dict()
+
+        def history(instrument):
+            results[instrument] = store._history(instrument, "M1", "midpoint", T0, end)
+
+        threads = [threading.Thread(target=history, args=(i,)) for i in INSTRUMENTS]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for instrument in INSTRUMENTS:
+            times = [int(c["time"]) // 10**6 for c in results[instrument]]
+            assert times == list(range(T0, end + 1, 60))
+
+        assert len(server.pages) == 3 * len(INSTRUMENTS)
+        assert server.connections <= 4
+
+        # a single stream for all instruments, ticks routed to bounded queues:
+        # also to a 2nd data on the same instrument. An unknown instrument gets
+        # its error alone and stays out of the stream
+        queues = [(i, store.streaming_prices(i)) for i in INSTRUMENTS]
+        queues.append((INSTRUMENTS[0], store.streaming_prices(INSTRUMENTS[0])))
+        unknown = store.streaming_prices("XXX_YYY")
+        deadline = time.time() + 10.0
+        while time.time() < deadline:
+            if all(q.queue and q.queue[-1].get("bid") == TICKS - 1 for _, q in queues):
+                break
+            time.sleep(0.01)
+
+        assert server.streams == [sorted(INSTRUMENTS)]
+        for instrument, q in queues:
+            ticks = [q.get_nowait() for _ in range(q.qsize())]
+            assert [t["instrument"] for t in ticks] == [instrument] * 5
+            assert [t["bid"] for t in ticks] == list(range(TICKS - 5, TICKS))
+
+        assert [msg["code"] for msg in unknown.queue] == [595]
+
+        if main:
+            print("pages: %d connections: %d" % (len(server.pages), server.connections))
+            print("streams: %s" % server.streams)
+    finally:
+        store.stop()
+        OandaStore._singleton = None
+        server.done.set()
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    test_run(main=True)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import os
+import tempfile
+
+import backtrader as bt
+import backtrader.indicators as btind
+import testcommon
+from backtrader.analyzers.drawdown import DrawDown
+
+
+class OptStrategy(bt.Strategy):
+    """ """
+
+    params = (("period", 15),)
+
+    instances = 0  # counts the combinations actually run
+
+    def __init__(self):
+        """ """
+        OptStrategy.instances += 1
+        sma = btind.SMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+
+    def next(self):
+        """ """
+        if not self.position.size:
+            if self.cross > 0.0:
+                self.buy()
+        elif self.cross < 0.0:
+            self.close()
+
+
+def runsweep(fname, periods, cash=None):
+    """
+
+    :param fname:
+    :param periods:
+    :param cash:  (Default value = None)
+
+    """
+    cerebro = bt.Cerebro(maxcpus=1)
+    cerebro.adddata(testcommon.getdata(0))
+    if cash is not None:
+        cerebro.broker.set_cash(cash)
+    cerebro.optstrategy(OptStrategy, period=periods)
+    cerebro.addanalyzer(DrawDown)
+    cerebro.addoptcheckpoint(fname)
+    return cerebro.run()
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    fd, fname = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    os.remove(fname)
+    try:
+        OptStrategy.instances = 0
+        first = runsweep(fname, [10, 15])
+        assert OptStrategy.instances == 2
+
+        # interrupted sweep restarted with one more combination
+        OptStrategy.instances = 0
+        second = runsweep(fname, [10, 15, 20])
+        assert OptStrategy.instances == 1
+
+        if main:
+            print(first)
+            print(second)
+
+        assert second[:2] == first  # resumed results are delivered first
+        assert second[2][0][0] == 20
+
+        # another broker configuration does not reuse the results
+        OptStrategy.instances = 0
+        runsweep(fname, [10, 15, 20], cash=50000.0)
+        assert OptStrategy.instances == 3
+    finally:
+        for suffix in ["", "-wal", "-shm"]:
+            if os.path.exists(fname + suffix):
+                os.remove(fname + suffix)
+
+
+if __name__ == "__main__":
+    test_run(main=True)
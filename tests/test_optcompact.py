@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import backtrader as bt
+import backtrader.indicators as btind
+import testcommon
+from backtrader.analyzers.drawdown import DrawDown
+from backtrader.analyzers.sqn import SQN
+
+
+class OptStrategy(bt.Strategy):
+    """ """
+
+    params = (("period", 15),)
+
+    def __init__(self):
+        """ """
+        sma = btind.SMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+
+    def next(self):
+        """ """
+        if not self.position.size:
+            if self.cross > 0.0:
+                self.buy()
+        elif self.cross < 0.0:
+            self.close()
+
+
+PERIODS = [10, 15, 20]
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    cerebro = bt.Cerebro(maxcpus=1, optcompact=True)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.optstrategy(OptStrategy, period=PERIODS)
+    cerebro.addanalyzer(DrawDown)
+    cerebro.addanalyzer(SQN, _name="quality", _optmetrics=["sqn"])
+    results = cerebro.run()
+
+    columns = cerebro.optcolumns(OptStrategy)
+    if main:
+        print(columns)
+        for result in results:
+            print(result)
+    else:
+        assert columns == [
+            "period",
+            "drawdown.max.drawdown",
+            "drawdown.max.moneydown",
+            "drawdown.max.len",
+            "quality.sqn",
+        ]
+        assert len(results) == len(PERIODS)
+        for result, period in zip(results, PERIODS):
+            assert len(result) == 1  # one strategy per run
+            record = result[0]
+            assert isinstance(record, tuple)
+            assert len(record) == len(columns)
+            assert record[0] == period
+            assert all(isinstance(x, (int, float)) for x in record[1:])
+
+
+if __name__ == "__main__":
+    test_run(main=True)
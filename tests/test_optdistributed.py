@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import multiprocessing
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+
+import backtrader as bt
+import backtrader.indicators as btind
+import testcommon
+from backtrader.analyzers.drawdown import DrawDown
+
+AUTHKEY = b"backtrader-test"
+
+
+class OptStrategy(bt.Strategy):
+    """ """
+
+    params = (("period", 15),)
+
+    def __init__(self):
+        """ """
+        sma = btind.SMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+
+    def next(self):
+        """ """
+        if not self.position.size:
+            if self.cross > 0.0:
+                self.buy()
+        elif self.cross < 0.0:
+            self.close()
+
+
+def getcerebro():
+    """ """
+    cerebro = bt.Cerebro(maxcpus=1, optcompact=True)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addanalyzer(DrawDown)
+    return cerebro
+
+
+def worker(address):
+    """
+
+    :param address:
+
+    """
+    getcerebro().optworker(address, authkey=AUTHKEY)
+
+
+def lostworker(address):
+    """Takes a chunk and disappears without answering
+
+    :param address:
+
+    """
+    conn = Client(address, authkey=AUTHKEY)
+    conn.recv()  # welcome
+    conn.recv()  # chunk
+    conn.close()
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    periods = range(5, 25)
+
+    cerebro = getcerebro()
+    cerebro.optstrategy(OptStrategy, period=periods)
+    expected = sorted(r[0] for r in cerebro.run())
+
+    cerebro = getcerebro()
+    cerebro.optstrategy(OptStrategy, period=periods)
+    coordinator = cerebro.addoptcoordinator(
+        ("127.0.0.1", 0), authkey=AUTHKEY, chunksize=3
+    )
+    # a client with a wrong authkey is refused, the workers still connect
+    try:
+        Client(coordinator.address, authkey=b"wrong")
+    except AuthenticationError:
+        pass
+    else:
+        assert False, "client with a wrong authkey accepted"
+
+    procs = [multiprocessing.Process(target=lostworker, args=(coordinator.address,))]
+    procs += [
+        multiprocessing.Process(target=worker, args=(coordinator.address,))
+        for _ in range(3)
+    ]
+    for p in procs:
+        p.start()
+
+    try:
+        results = sorted(r[0] for r in cerebro.run())
+    finally:
+        coordinator.close()
+        for p in procs:
+            p.join()
+
+    if main:
+        print(results[:3])
+
+    # every combination once, even the ones of the lost chunk
+    assert results == expected
+    assert [r[0] for r in results] == list(periods)
+
+    # no TCP without authentication: generated key, worker without key refused
+    coordinator = getcerebro().addoptcoordinator(("127.0.0.1", 0))
+    try:
+        assert len(coordinator.authkey) == 32
+        try:
+            getcerebro().optworker(coordinator.address, wait=0.0)
+        except ValueError:
+            pass
+        else:
+            assert False, "worker without authkey accepted"
+    finally:
+        coordinator.close()
+
+
+if __name__ == "__main__":
+    test_run(main=True)
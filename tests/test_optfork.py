@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import backtrader as bt
+import backtrader.indicators as btind
+import testcommon
+from backtrader.analyzers.drawdown import DrawDown
+from backtrader.engine import runner
+
+
+class OptStrategy(bt.Strategy):
+    """ """
+
+    params = (("period", 15),)
+
+    def __init__(self):
+        """ """
+        sma = btind.SMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+
+    def next(self):
+        """ """
+        if not self.position.size:
+            if self.cross > 0.0:
+                self.buy()
+        elif self.cross < 0.0:
+            self.close()
+
+
+class NoPickleCerebro(bt.Cerebro):
+    """Fails if it is pickled to be sent to a worker"""
+
+    def __getstate__(self):
+        """ """
+        raise AssertionError("cerebro pickled with optfork")
+
+
+def runopt(cerebrocls, **kwargs):
+    """
+
+    :param cerebrocls:
+    :param **kwargs:
+
+    """
+    cerebro = cerebrocls(optcompact=True, **kwargs)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addanalyzer(DrawDown)
+    cerebro.optstrategy(OptStrategy, period=range(5, 30))
+    return [r[0] for r in cerebro.run()]
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    expected = runopt(bt.Cerebro, maxcpus=1)
+    results = runopt(NoPickleCerebro, maxcpus=2, optfork=True)
+    if main:
+        print(results[:3])
+
+    assert results == expected
+    assert runner._optforkstate is None
+
+    results = runopt(NoPickleCerebro, maxcpus=2, optfork=True, optunordered=True)
+    assert sorted(results) == expected
+
+
+if __name__ == "__main__":
+    test_run(main=True)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import backtrader as bt
+import backtrader.indicators as btind
+import testcommon
+from backtrader.analyzers.drawdown import DrawDown
+
+
+class OptStrategy(bt.Strategy):
+    """ """
+
+    params = (("period", 15),)
+
+    def __init__(self):
+        """ """
+        sma = btind.SMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+
+    def next(self):
+        """ """
+        if not self.position.size:
+            if self.cross > 0.0:
+                self.buy()
+        elif self.cross < 0.0:
+            self.close()
+
+
+SPACE = dict(period=range(5, 41))
+
+
+def finalvalue(strategy):
+    """
+
+    :param strategy:
+
+    """
+    return strategy.broker.getvalue()
+
+
+def alwaysprune(strategy):
+    """
+
+    :param strategy:
+
+    """
+    return True
+
+
+def getcerebro():
+    """ """
+    cerebro = bt.Cerebro(maxcpus=1)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addanalyzer(DrawDown)
+    return cerebro
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    for method, ntrials in [("random", 6), ("halving", 9), ("tpe", 8)]:
+        cerebro = getcerebro()
+        trials = cerebro.optimize(
+            OptStrategy,
+            SPACE,
+            method=method,
+            metric=finalvalue,
+            ntrials=ntrials,
+            nstartup=4,
+            seed=7,
+        )
+        if main:
+            print(method, trials[:3])
+
+        assert len(trials) == ntrials
+        assert len(set(t.params["period"] for t in trials)) == ntrials
+        assert trials[0].budget == 1.0
+        full = [t for t in trials if t.budget == 1.0]
+        assert full[0].score == max(t.score for t in full)
+
+    # minimization of an analyzer value
+    trials = getcerebro().optimize(
+        OptStrategy,
+        SPACE,
+        metric="drawdown.max.drawdown",
+        maximize=False,
+        ntrials=5,
+        seed=1,
+    )
+    assert trials[0].score == min(t.score for t in trials)
+
+    # every run is aborted at the first check
+    trials = getcerebro().optimize(
+        OptStrategy,
+        SPACE,
+        metric=finalvalue,
+        ntrials=4,
+        prune=alwaysprune,
+        pruneevery=50,
+        seed=1,
+    )
+    assert all(t.pruned and t.score is None for t in trials)
+
+    # eta below 2 never shrinks the rungs
+    cerebro = getcerebro()
+    try:
+        cerebro.optimize(OptStrategy, SPACE, method="halving", metric=finalvalue, eta=1)
+    except ValueError:
+        pass
+    else:
+        assert False, "eta=1 accepted"
+
+    # the optimization state does not leak into a later run
+    cerebro = getcerebro()
+    cerebro.optimize(OptStrategy, SPACE, metric=finalvalue, ntrials=2, seed=1)
+    assert not cerebro._dooptimize
+    assert not hasattr(cerebro, "_trialspec")
+    cerebro.addstrategy(OptStrategy)
+    strat = cerebro.run()[0]
+    assert isinstance(strat, OptStrategy)
+
+
+if __name__ == "__main__":
+    test_run(main=True)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import backtrader as bt
+import backtrader.indicators as btind
+import testcommon
+from backtrader.analyzers.drawdown import DrawDown
+from backtrader.engine.runner import _optbatches
+
+
+class OptStrategy(bt.Strategy):
+    """ """
+
+    params = (("period", 15),)
+
+    def __init__(self):
+        """ """
+        sma = btind.SMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+
+    def next(self):
+        """ """
+        if not self.position.size:
+            if self.cross > 0.0:
+                self.buy()
+        elif self.cross < 0.0:
+            self.close()
+
+
+PERIODS = range(5, 45)
+
+
+def runopt(**kwargs):
+    """
+
+    :param **kwargs:
+
+    """
+    cost = kwargs.pop("cost", None)
+    cerebro = bt.Cerebro(optcompact=True, **kwargs)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addanalyzer(DrawDown)
+    cerebro.optstrategy(OptStrategy, period=PERIODS)
+    if cost is not None:
+        cerebro.optcost(cost)
+
+    progress = list()
+    cerebro.optprogress(lambda *args: progress.append(args), every=10)
+    return [r[0] for r in cerebro.run()], progress
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    # guided batches: large first, small last, every item once
+    items = list(range(100))
+    batches = _optbatches(items, 4, 0)
+    assert [len(b) for b in batches][:3] == [12, 11, 9]
+    assert len(batches[-1]) == 1
+    assert sum(batches, []) == items
+    assert [len(b) for b in _optbatches(items, 4, 30)] == [30, 30, 30, 10]
+
+    expected, progress = runopt(maxcpus=1)
+    assert [p[:2] for p in progress] == [(10, None), (20, None), (30, None), (40, None)]
+
+    # cost ordering with ordered delivery keeps the order of the combinations
+    results, progress = runopt(maxcpus=2, optchunksize=0, cost=lambda p: p["period"])
+    assert results == expected
+    assert [p[:2] for p in progress] == [(10, 40), (20, 40), (30, 40), (40, 40)]
+    assert progress[-1][3] == 0.0
+
+    results, _ = runopt(
+        maxcpus=2,
+        optunordered=True,
+        optchunksize=3,
+        optmaxtasks=2,
+        cost=lambda p: p["period"],
+    )
+    if main:
+        print([r[0] for r in results])
+    assert sorted(results) == expected
+
+
+def test_progress(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    cerebro = bt.Cerebro()
+    progress = list()
+    optprogress = cerebro.optprogress(lambda *args: progress.append(args))
+    for run in range(2):  # counting starts again with each optimization
+        optprogress.start()
+        cerebro._opttotal, cerebro._optresumed = 4, 2
+        del progress[:]
+        for i in range(4):
+            optprogress(None)
+
+        assert [p[0] for p in progress] == [1, 2, 3, 4]
+        # resumed results: no rate (and no ETA) until a combination has run
+        assert [p[3] for p in progress[:2]] == [None, None]
+        assert progress[2][2] == 0.0
+        assert progress[-1][3] == 0.0
+
+
+if __name__ == "__main__":
+    test_run(main=True)
+    test_progress(main=True)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import gc
+import os
+import tempfile
+
+import backtrader as bt
+import backtrader.indicators as btind
+import testcommon
+from backtrader.analyzers.drawdown import DrawDown
+from backtrader.utils.optsink import OptSink
+
+
+class OptStrategy(bt.Strategy):
+    """ """
+
+    params = (("period", 15),)
+
+    def __init__(self):
+        """ """
+        sma = btind.SMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+
+    def next(self):
+        """ """
+        if not self.position.size:
+            if self.cross > 0.0:
+                self.buy()
+        elif self.cross < 0.0:
+            self.close()
+
+
+PERIODS = [10, 12, 15, 18, 20]
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    cerebro = bt.Cerebro(maxcpus=1)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.optstrategy(OptStrategy, period=PERIODS)
+    cerebro.addanalyzer(DrawDown)
+    sink = cerebro.addoptsink(maxrows=2)  # force spilling to disk
+    try:
+        results = cerebro.run()
+        assert results is sink
+
+        rows = list(sink.rows())
+        if main:
+            print(sink.columns())
+            for row in rows:
+                print(row)
+
+        assert len(sink) == len(PERIODS)
+        assert [row[0] for row in rows] == PERIODS
+        assert sink.columns() == cerebro.optcolumns(OptStrategy)
+
+        sql = 'SELECT period FROM results0 ORDER BY "drawdown.max.drawdown" LIMIT 1'
+        best = sink.query(sql)[0][0]
+        assert best == min(rows, key=lambda row: row[1])[0]
+    finally:
+        sink.close()
+
+
+def test_spill(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    sink = OptSink(maxrows=3)
+    sink.start([["a", "b"]])
+    try:
+        for i in range(10):
+            sink.append(0, (i, i * 0.5))
+
+        assert len(sink) == 10
+        assert sink._inmem == 1  # 9 rows already on disk
+        assert list(sink.rows()) == [(i, i * 0.5) for i in range(10)]
+    finally:
+        sink.close()
+
+
+def test_reuse(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    fd, fname = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    try:
+        # a file with the results of a previous run (other columns)
+        sink = OptSink(filename=fname, maxrows=2)
+        sink.start([["a", "b", "c"]])
+        for i in range(5):
+            sink.append(0, (i, i, i))
+        sink.close()
+
+        sink = OptSink(filename=fname, maxrows=2)
+        for run in range(2):  # and the same sink started again
+            sink.start([["a", "b"]])
+            for i in range(3):
+                sink.append(0, (i, -i))
+
+            expected = [(i, -i) for i in range(3)]
+            assert len(sink) == 3
+            assert list(sink.rows()) == expected
+            assert sink.query("SELECT * FROM results0") == expected
+        sink.close()
+    finally:
+        os.remove(fname)
+
+    # the temporary file is removed even without close
+    sink = OptSink(maxrows=1)
+    sink.start([["a"]])
+    sink.append(0, (1,))
+    tmpname = sink._tmpname
+    assert os.path.exists(tmpname)
+    del sink
+    gc.collect()
+    assert not os.path.exists(tmpname)
+
+
+if __name__ == "__main__":
+    test_run(main=True)
+    test_spill(main=True)
+    test_reuse(main=True)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+import datetime
+import itertools
+import sys
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+import backtrader as bt  # noqa: E402
+
+CODE = "600000.SH"
+T0 = datetime.datetime(2024, 1, 2, 9, 30)
+N = 300  # ticks of the history
+
+
+def ticks(start, count):
+    """Level 2 tick records (3 seconds apart) as given by xtdata"""
+    t0 = int(T0.timestamp() * 1000)
+    records = list()
+    for i in range(start, start + count):
+        price = 10.0 + i / 100.0
+        records.append(
+            dict(
+                time=t0 + 3000 * i,
+                lastPrice=price,
+                open=10.0,
+                high=price,
+                low=10.0,
+                lastClose=9.9,
+                amount=1000.0 * i,
+                volume=10 * i,
+                pvolume=1000 * i,
+                stockStatus=0,
+                transactionNum=i,
+                askPrice=[price + k / 100.0 for k in range(1, 6)],
+                bidPrice=[price - k / 100.0 for k in range(1, 6)],
+                askVol=[100 * k for k in range(1, 6)],
+                bidVol=[200 * k for k in range(1, 6)],
+            )
+        )
+    return records
+
+
+def expected(i):
+    """Line values of the tick ``i``: datetime, close, askPrice5, bidVol5"""
+    dt = bt.date2num(T0 + datetime.timedelta(seconds=3 * i))
+    price = 10.0 + i / 100.0
+    return (dt, price, price + 5 / 100.0, 1000.0, float(i))
+
+
+class XtData(object):
+    """Stand-in for ``xtquant.xtdata``: tick history and quote subscriptions"""
+
+    def __init__(self):
+        """ """
+        self.requests = list()
+        self.callbacks = dict()
+        self._seq = itertools.count(1)
+
+    def download_history_data(self, **kwargs):
+        """ """
+
+    def get_market_data_ex(self, stock_list, period, **kwargs):
+        """ """
+        self.requests.append((tuple(stock_list), period))
+        return dict((code, pd.DataFrame(ticks(0, N))) for code in stock_list)
+
+    def subscribe_quote(self, stock_code, period, callback=None, **kwargs):
+        """ """
+        seq = next(self._seq)
+        self.callbacks[seq] = callback
+        return seq
+
+    def unsubscribe_quote(self, seq):
+        """ """
+        self.callbacks.pop(seq, None)
+
+    def push(self, code, records):
+        """Delivers ``records`` to the subscribers as a callback of xtdata"""
+        for callback in list(self.callbacks.values()):
+            callback({code: records})
+
+
+def qmtstore():
+    """A new ``QMTStore`` using the stand-in of xtdata (and of the xtquant
+    package if it cannot be imported)"""
+    try:
+        from xtquant import xtdata, xttrader, xttype  # noqa: F401
+    except ImportError:
+        xtquant = types.ModuleType("xtquant")
+        for name in ("xtdata", "xttrader", "xttype"):
+            setattr(xtquant, name, types.ModuleType("xtquant." + name))
+        sys.modules["xtquant"] = xtquant
+
+    from qmtbt import qmtfeed, qmtstore  # noqa: F401 (registers the feed)
+
+    qmtstore.xtdata = XtData()
+    qmtstore.QMTStore._singleton = None
+    return qmtstore.QMTStore()
+
+
+class Record(bt.Strategy):
+    """Records the lines of each tick"""
+
+    def __init__(self):
+        """ """
+        self.rows = list()
+
+    def next(self):
+        """ """
+        d = self.data
+        row = (d.datetime[0], d.close[0], d.askPrice5[0], d.bidVol5[0])
+        self.rows.append(row + (d.transactionNum[0],))
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    store = qmtstore()
+
+    # the history is copied at once (preload) or bar by bar, with equal lines
+    rows = list()
+    for preload in (True, False):
+        cerebro = bt.Cerebro(preload=preload, runonce=False, stdstats=False)
+        cerebro.adddata(store.getdata(dataname=CODE, timeframe=bt.TimeFrame.Ticks))
+        cerebro.addstrategy(Record)
+        rows.append(cerebro.run()[0].rows)
+
+    assert rows[0] == rows[1]
+    assert rows[0] == [expected(i) for i in range(N)]
+
+    # live callbacks are queued as chunks, the current bar is updated in place
+    xtdata = sys.modules["qmtbt.qmtstore"].xtdata
+    data = store.getdata(dataname=CODE, timeframe=bt.TimeFrame.Ticks, live=True)
+    bt.Cerebro().adddata(data)
+    data._start()
+
+    xtdata.push(CODE, ticks(0, 3))
+    xtdata.push(CODE, ticks(3, 2))
+    assert len(data._data) == 2
+
+    loaded = list()
+    while data.load():
+        loaded.append((data.datetime[0], data.close[0], data.askPrice5[0]))
+    assert loaded == [expected(i)[:3] for i in range(5)]
+    assert not data.haslivedata()
+
+    update = ticks(4, 2)
+    update[0]["lastPrice"] = 20.0
+    xtdata.push(CODE, update)
+    assert data.close[0] == 20.0
+    assert data.load() and data.close[0] == expected(5)[1]
+
+    # the fields missing in a record of the current bar are kept
+    update = ticks(5, 2)
+    update[0] = dict(time=update[0]["time"], lastPrice=21.0)
+    xtdata.push(CODE, update)
+    assert data.close[0] == 21.0
+    assert data.askPrice5[0] == expected(5)[2]
+
+    data.stop()
+    assert not xtdata.callbacks
+
+    if main:
+        print("history ticks: %d, live ticks: %d" % (len(rows[0]), len(loaded) + 1))
+
+
+if __name__ == "__main__":
+    test_run(main=True)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import backtrader as bt
+import testcommon
+
+WEIGHTS = [0.5, 0.3]
+SWAPPED = [0.2, 0.6]
+LOTSIZE = 10
+
+
+class RebalanceStrategy(bt.Strategy):
+    """ """
+
+    params = (("main", False),)
+
+    def start(self):
+        """ """
+        self.rebalances = 0
+        self.orderseqs = list()
+        self.sizes = list()
+
+    def next(self):
+        """ """
+        if len(self) == 20:
+            self.orderseqs.append(self.rebalance(WEIGHTS, lotsize=LOTSIZE))
+        elif len(self) == 21:
+            self.sizes.append([self.getposition(d).size for d in self.datas])
+        elif len(self) == 40:
+            weights = dict(zip(self.datas, SWAPPED))
+            self.orderseqs.append(self.rebalance(weights, lotsize=LOTSIZE))
+        elif len(self) == 41:
+            self.sizes.append([self.getposition(d).size for d in self.datas])
+
+    def stop(self):
+        """ """
+        if self.p.main:
+            print(self.sizes)
+            return
+
+        assert len(self.sizes) == 2
+        for sizes in self.sizes:
+            for size in sizes:
+                assert size > 0
+                assert not size % LOTSIZE
+
+        # 1st rebalance only buys, the 2nd must issue the sell first
+        first, second = self.orderseqs
+        assert all(o.isbuy() for o in first)
+        assert second[0].issell() and second[-1].isbuy()
+        assert self.sizes[1][0] < self.sizes[0][0]
+        assert self.sizes[1][1] > self.sizes[0][1]
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    datas = [testcommon.getdata(i) for i in range(2)]
+    testcommon.runtest(datas, RebalanceStrategy, main=main)
+
+
+if __name__ == "__main__":
+    test_run(main=True)
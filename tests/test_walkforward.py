@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import backtrader as bt
+import backtrader.indicators as btind
+import testcommon
+
+
+class WFStrategy(bt.Strategy):
+    """ """
+
+    params = (("period", 15),)
+
+    def __init__(self):
+        """ """
+        sma = btind.SMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+
+    def next(self):
+        """ """
+        if not self.position.size:
+            if self.cross > 0.0:
+                self.buy()
+        elif self.cross < 0.0:
+            self.close()
+
+
+def finalvalue(strategy):
+    """
+
+    :param strategy:
+
+    """
+    return strategy.broker.getvalue()
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    for maxcpus in (1, 2):
+        cerebro = bt.Cerebro(maxcpus=maxcpus)
+        cerebro.adddata(testcommon.getdata(0))
+        result = cerebro.walkforward(
+            WFStrategy,
+            dict(period=[5, 10, 20]),
+            train=100,
+            test=50,
+            metric=finalvalue,
+            warmup=20,
+        )
+        if main:
+            for window in result.windows:
+                print(window.train, window.test, window.params, window.score)
+            print(result.value[-1])
+
+        # 255 bars: windows start at 0, 50, 100 and 150 (the last one is shorter)
+        assert len(result.windows) == 4
+        assert [len(w.value) for w in result.windows] == [50, 50, 50, 5]
+        assert len(result.value) == 155
+        assert all(w.params["period"] in (5, 10, 20) for w in result.windows)
+        assert list(result.datetime) == sorted(result.datetime)
+        assert not cerebro._dooptimize  # a later run is not an optimization
+
+        # stitching scales each window but keeps its returns
+        first = result.windows[0]
+        ratio = first.value[-1] / first.value[0]
+        assert abs(result.value[49] / result.value[0] - ratio) < 1e-9
+
+        if maxcpus == 1:
+            sequential = result
+        else:
+            assert list(result.value) == list(sequential.value)
+
+
+if __name__ == "__main__":
+    test_run(main=True)
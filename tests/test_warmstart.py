@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2024 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import datetime
+import os
+import tempfile
+
+import backtrader as bt
+import testcommon
+
+SNAPDATE = datetime.datetime(2006, 6, 30)
+
+
+class WarmStrategy(bt.Strategy):
+    """ """
+
+    params = (("period", 15),)
+
+    def __init__(self):
+        """ """
+        self.sma = bt.indicators.SMA(period=self.p.period)
+        self.ema = bt.indicators.EMA(period=self.p.period)
+        self.lrsi = bt.indicators.LaguerreRSI()
+        self.psar = bt.indicators.ParabolicSAR()
+        self.diff = self.data.close - self.data.close(-1)
+        self.values = list()
+
+    def next(self):
+        """ """
+        self.values.append(
+            (
+                len(self),
+                self.data.datetime[0],
+                self.sma[0],
+                self.ema[0],
+                self.lrsi[0],
+                self.psar[0],
+                self.diff[0],
+            )
+        )
+
+
+def runwarm(fname, todate=testcommon.TODATE, **kwargs):
+    """
+
+    :param fname:
+    :param todate:  (Default value = testcommon.TODATE)
+    :param **kwargs:
+
+    """
+    cerebro = bt.Cerebro(preload=False, runonce=False)
+    cerebro.adddata(testcommon.getdata(0, todate=todate))
+    cerebro.addstrategy(WarmStrategy, **kwargs)
+    warmstart = None
+    if fname is not None:
+        warmstart = cerebro.addwarmstart(fname)
+    strat = cerebro.run()[0]
+    return strat, warmstart
+
+
+def test_run(main=False):
+    """
+
+    :param main:  (Default value = False)
+
+    """
+    fd, fname = tempfile.mkstemp(suffix=".btw")
+    os.close(fd)
+    os.remove(fname)
+    try:
+        full, _ = runwarm(None)
+
+        first, warmstart = runwarm(fname, todate=SNAPDATE)
+        assert not warmstart.restored
+        assert os.path.exists(fname)
+
+        # resumes after the last bar of the snapshot with the same values
+        resumed, warmstart = runwarm(fname)
+        assert warmstart.restored
+        assert resumed.values
+        assert resumed.values[0][0] == first.values[-1][0] + 1
+        assert resumed.values == full.values[len(first.values) :]
+
+        if main:
+            print(len(full.values), len(first.values), len(resumed.values))
+
+        # another strategy tree does not restore and starts from the beginning
+        other, warmstart = runwarm(fname, period=20)
+        assert not warmstart.restored
+        assert other.values[0][0] == 20
+        assert other.values[0][1] < first.values[-1][1]
+    finally:
+        if os.path.exists(fname):
+            os.remove(fname)
+
+
+if __name__ == "__main__":
+    test_run(main=True)